@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Benchmark of the bit-packed matrix storage.
+
+	Compares the byte per cell storage of the `Grid` engine with the bit-packed one,
+	each backed by NumPy and by a bytearray, on creation, random set and clear of
+	single cells, a full rebuild of the statistics (total, row and column sums) and
+	random draws. The draws of the byte storages are skipped, their index pool would
+	cost 8 bytes per cell. Memory is the peak traced during the creation.
+
+	Usage: `$ python -m benchmarks.bits [<size> ...]`
+
+"""
+
+from random import randrange, seed
+from sys import argv
+from time import perf_counter
+
+from benchmarks.grid import peak
+from core import stringSize
+from core.grid import NUMPY, Grid
+
+SIZES = tuple[int]((10000, ))
+""" Default square sizes of the benchmarked matrices, 10^8 cells
+"""
+
+OPERATIONS : int = 10**5
+""" Number of random cells set then cleared, and of random draws
+"""
+
+def setClear(grid: Grid, points: list[tuple[int, int]]) -> float:
+	__start = perf_counter()
+
+	for value in (1, 0):
+		for x, y in points:
+			grid.set(x, y, value)
+
+	return(perf_counter()-__start)
+
+def draws(grid: Grid, n: int) -> float:
+	__start = perf_counter()
+
+	for _ in range(0, n):
+		grid.randomPoint(0)
+
+	return(perf_counter()-__start)
+
+def bench(size: int) -> list[str]:
+	__engines = dict({
+		"bytearray": lambda:Grid(size, size, False, "dense"),
+		"bits": lambda:Grid(size, size, False, "bits")
+	})
+
+	if(NUMPY):
+		__engines["numpy"]		= lambda:Grid(size, size, True, "dense")
+		__engines["bits+numpy"]	= lambda:Grid(size, size, True, "bits")
+
+	seed(0)
+	__points	= [ (randrange(0, size), randrange(0, size)) for _ in range(0, OPERATIONS) ]
+	__rows		= list[str]([])
+
+	for name, create in __engines.items():
+		__start		= perf_counter()
+		__grid		= create()
+		__created	= perf_counter()-__start
+		__setClear	= setClear(__grid, __points)
+
+		for x, y in __points:
+			__grid.set(x, y, 1)
+
+		__start = perf_counter()
+		__grid.recount()
+		__stats = perf_counter()-__start
+		__draws = f"{OPERATIONS/draws(__grid, OPERATIONS):>12.0f}" if(__grid.backend == "bits") else f"{'-':>12}"
+
+		__rows.append("".join([
+			f" {size}x{size}{' '*(12-len(f'{size}x{size}'))}{name}{' '*(11-len(name))}",
+			f"{__created:>10.4f}s",
+			f"{2*OPERATIONS/__setClear:>12.0f}",
+			f"{__stats:>10.4f}s",
+			__draws,
+			f"{stringSize(peak(create)):>14}"
+		]))
+
+		del __grid
+
+	return(__rows)
+
+if(__name__ == "__main__"):
+	__sizes = [ int(s) for s in argv[1:len(argv)] ] or SIZES
+
+	print(f" Size{' '*8}Engine{' '*5}{'Create':>11}{'Set/clear/s':>12}{'Stats':>11}{'Draws/s':>12}{'Memory':>14}")
+	for size in __sizes:
+		print("\n".join(bench(size)))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Benchmark of the random fill and drain of a matrix.
+
+	Compares the legacy rejection sampling of the `Matrix` tool, drawing random
+	coordinates until an empty (or filled) cell is hit, with the index pool of the
+	`Grid` engine drawing exactly once per point. Both run a full fill from empty to
+	full then a full drain on the same storage.
+
+	Usage: `$ python -m benchmarks.fill [<size> ...]`
+
+"""
+
+from random import randrange, seed
+from sys import argv
+from time import perf_counter
+
+from core.grid import Grid
+
+SIZES = tuple[int]((1000, ))
+""" Default square sizes of the benchmarked matrices
+"""
+
+def rejection(grid: Grid) -> int:
+	__draws = int(0)
+
+	for value in (1, 0):
+		while(grid.total() != (0, len(grid))[value]):
+			while(True):
+				x, y = randrange(0, grid.x), randrange(0, grid.y)
+				__draws += 1
+
+				if(grid.get(x, y) != value):
+					grid.set(x, y, value)
+					break
+
+	return(__draws)
+
+def pool(grid: Grid) -> int:
+	__draws = int(0)
+
+	for value in (1, 0):
+		while(grid.total() != (0, len(grid))[value]):
+			x, y = grid.randomPoint(1-value)
+			grid.set(x, y, value)
+			__draws += 1
+
+	return(__draws)
+
+if(__name__ == "__main__"):
+	__sizes = [ int(s) for s in argv[1:len(argv)] ] or SIZES
+
+	print(f" Size{' '*8}Sampling{' '*3}{'Draws':>12}{'Fill+Drain':>12}{'Points/s':>14}")
+	for size in __sizes:
+		for name, fn in (("rejection", rejection), ("pool", pool)):
+			seed(0)
+			__grid	= Grid(size, size)
+			__start	= perf_counter()
+			__draws	= fn(__grid)
+			__time	= perf_counter()-__start
+
+			print(f" {size}x{size}{' '*(12-len(f'{size}x{size}'))}{name}{' '*(11-len(name))}{__draws:>12}{__time:>11.2f}s{2*len(__grid)/__time:>14.0f}")
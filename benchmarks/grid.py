@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Benchmark of the matrix storage engines.
+
+	Compares the legacy list of lists storage of the `Matrix` tool with the `Grid`
+	engine backed by NumPy and by a bytearray, on creation, fill count, row sums and
+	fill ratio. Times are the best of 3 runs, memory is the peak traced during the
+	creation.
+
+	Usage: `$ python -m benchmarks.grid [<size> ...]`
+
+"""
+
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from core import stringSize
+from core.grid import NUMPY, Grid
+
+SIZES = tuple[int]((1000, 5000))
+""" Default square sizes of the benchmarked matrices
+"""
+
+class Legacy:
+
+	""" Reference implementation of the list of lists storage """
+
+	def __init__(self, x: int, y: int):
+		self.cells = list[list[int]]([])
+
+		for i in range(0, y):
+			self.cells.append([])
+
+			for j in range(0, x):
+				self.cells[i].append(0)
+
+	def rowSums(self) -> list[int]:
+		return([ sum(row) for row in self.cells ])
+
+	def total(self) -> int:
+		return(sum([ value for x in self.cells for value in x ]))
+
+	def fill(self) -> float:
+		return(self.total()/(len(self.cells)*len(self.cells[0])))
+
+def measure(fn, repeat: int = 3) -> float:
+	__times = list[float]([])
+
+	for _ in range(0, repeat):
+		__start = perf_counter()
+		fn()
+		__times.append(perf_counter()-__start)
+
+	return(min(__times))
+
+def peak(fn) -> int:
+	start()
+	__result = fn()
+	__peak = get_traced_memory()[1]
+	stop()
+	del __result
+
+	return(__peak)
+
+def bench(size: int) -> list[str]:
+	__engines = dict({
+		"list": lambda:Legacy(size, size),
+		"bytearray": lambda:Grid(size, size, False)
+	})
+
+	if(NUMPY):
+		__engines["numpy"] = lambda:Grid(size, size, True)
+
+	__rows = list[str]([])
+	for name, create in __engines.items():
+		__grid = create()
+		__rows.append("".join([
+			f" {size}x{size}{' '*(12-len(f'{size}x{size}'))}{name}{' '*(11-len(name))}",
+			f"{measure(create, 1 if(name == 'list') else 3):>10.4f}s",
+			f"{measure(__grid.total):>10.4f}s",
+			f"{measure(__grid.rowSums):>10.4f}s",
+			f"{measure(__grid.fill):>10.4f}s",
+			f"{stringSize(peak(create)):>14}"
+		]))
+
+	return(__rows)
+
+if(__name__ == "__main__"):
+	__sizes = [ int(s) for s in argv[1:len(argv)] ] or SIZES
+
+	print(f" Size{' '*8}Engine{' '*5}{'Create':>11}{'Total':>11}{'Rows':>11}{'Fill':>11}{'Memory':>14}")
+	for size in __sizes:
+		print("\n".join(bench(size)))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Benchmark of the matrix product paths.
+
+	Compares the naive product of lists of rows, the cache-blocked product used
+	without NumPy, and the BLAS product of NumPy, on random binary matrices. The
+	pure Python paths are cubic, they are skipped over `PURE_LIMIT`.
+
+	Usage: `$ python -m benchmarks.linalg [<size> ...]`
+
+"""
+
+from random import random, seed
+from sys import argv
+from time import perf_counter
+
+from core.linalg import blockedMultiply, multiply, naiveMultiply, np
+
+SIZES = tuple[int]((64, 128, 256, 512, 1024, 2048, 4096))
+""" Default square sizes of the benchmarked matrices
+"""
+
+PURE_LIMIT : int = 512
+""" Largest size run by the pure Python paths
+"""
+
+def measure(fn, *args) -> str:
+	__start = perf_counter()
+	fn(*args)
+
+	return(f"{perf_counter()-__start:>11.4f}s")
+
+if(__name__ == "__main__"):
+	__sizes = [ int(s) for s in argv[1:len(argv)] ] or SIZES
+
+	print(f" Size{' '*8}{'Naive':>12}{'Blocked':>12}{'BLAS':>12}")
+	for size in __sizes:
+		seed(0)
+		__a = [ [ 1 if(random() < .5) else 0 for _ in range(0, size) ] for _ in range(0, size) ]
+		__b = [ [ 1 if(random() < .5) else 0 for _ in range(0, size) ] for _ in range(0, size) ]
+
+		print("".join([
+			f" {size}x{size}{' '*(12-len(f'{size}x{size}'))}",
+			measure(naiveMultiply, __a, __b) if(size <= PURE_LIMIT//2) else f"{'-':>12}",
+			measure(blockedMultiply, __a, __b) if(size <= PURE_LIMIT) else f"{'-':>12}",
+			measure(multiply, np.array(__a, dtype=np.uint8), np.array(__b, dtype=np.uint8)) if(np is not None) else f"{'-':>12}"
+		]))
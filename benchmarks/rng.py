@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Benchmark of the random generators of the matrix draws.
+
+	Compares the global `random.randrange`, a seeded `random.Random` and the
+	`BatchRandom` generator backed by NumPy and by `getrandbits`, on raw draws in
+	`[0, n)` and on a full fill and drain of a matrix through `Grid.randomPoint`.
+
+	Usage: `$ python -m benchmarks.rng [<size> ...]`
+
+"""
+
+from random import Random, randrange
+from sys import argv
+from time import perf_counter
+from typing import Callable
+
+from core.grid import NUMPY, Grid
+from core.rng import BatchRandom
+
+SIZES = tuple[int]((1000, ))
+""" Default square sizes of the benchmarked matrices
+"""
+
+DRAWS : int = 10**6
+""" Number of raw draws
+"""
+
+def draws(randbelow: Callable, n: int) -> float:
+	__start = perf_counter()
+
+	for _ in range(0, DRAWS):
+		randbelow(n)
+
+	return(DRAWS/(perf_counter()-__start))
+
+def fill(randbelow: Callable, size: int) -> float:
+	__grid	= Grid(size, size)
+	__start	= perf_counter()
+
+	for value in (1, 0):
+		while(__grid.total() != (0, len(__grid))[value]):
+			x, y = __grid.randomPoint(1-value, randbelow)
+			__grid.set(x, y, value)
+
+	return(2*len(__grid)/(perf_counter()-__start))
+
+if(__name__ == "__main__"):
+	__sizes		= [ int(s) for s in argv[1:len(argv)] ] or SIZES
+	__engines	= dict({
+		"randrange": lambda:randrange,
+		"Random": lambda:Random(0).randrange,
+		"getrandbits": lambda:BatchRandom(0, False).randbelow
+	})
+
+	if(NUMPY):
+		__engines["numpy"] = lambda:BatchRandom(0, True).randbelow
+
+	print(f" Size{' '*8}Generator{' '*3}{'Draws/s':>12}{'Points/s':>12}")
+	for size in __sizes:
+		for name, create in __engines.items():
+			print(f" {size}x{size}{' '*(12-len(f'{size}x{size}'))}{name}{' '*(12-len(name))}{draws(create(), size*size):>12.0f}{fill(create(), size):>12.0f}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Scaling benchmark of the tiled updates in shared memory.
+
+	Runs a random fill in bulk, a count of the row and column sums and automaton
+	steps on the same shared cells with 1, 2, 4 and 8 processes, and reports their
+	throughput in millions of cells per second, and the speedup of the steps. The
+	scaling is bounded by the cpus of the machine, and by the memory bandwidth.
+
+	Usage: `$ python -m benchmarks.tiles [<size> ...]`
+
+"""
+
+from os import cpu_count
+from sys import argv
+from time import perf_counter
+
+from core.life import RULE, parseRule, stepTile
+from core.tiles import TilePool
+
+SIZES = tuple[int]((4096, ))
+""" Default square sizes of the benchmarked matrices
+"""
+
+WORKERS = tuple[int]((1, 2, 4, 8))
+""" Numbers of processes compared
+"""
+
+STEPS : int = 10
+""" Number of automaton steps
+"""
+
+def rate(cells: int, fn, *args) -> float:
+	__start = perf_counter()
+	fn(*args)
+
+	return(cells/(perf_counter()-__start)/10**6)
+
+def steps(pool: TilePool, birth: frozenset[int], survive: frozenset[int]) -> None:
+	for _ in range(0, STEPS):
+		pool.map(stepTile, birth, survive, False)
+		pool.swap()
+
+if(__name__ == "__main__"):
+	__sizes				= [ int(s) for s in argv[1:len(argv)] ] or SIZES
+	__birth, __survive	= parseRule(RULE)
+
+	print(f" {cpu_count()} cpus, Mcells/s")
+	print(f" Size{' '*8}Workers{'Fill':>10}{'Stats':>10}{'Step':>10}{'Speedup':>10}")
+	for size in __sizes:
+		__base = None
+
+		for workers in WORKERS:
+			with TilePool(size, size, workers, 2) as pool:
+				pool.counts()
+
+				__fill	= rate(size*size, pool.fill, .3, 0)
+				__stats	= rate(size*size, pool.counts)
+				__step	= rate(STEPS*size*size, steps, pool, __birth, __survive)
+				__base	= __base or __step
+
+			print(f" {size}x{size}{' '*(12-len(f'{size}x{size}'))}{workers:>7}{__fill:>10.1f}{__stats:>10.1f}{__step:>10.1f}{__step/__base:>9.2f}x")
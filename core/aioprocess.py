@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Asynchronous command execution and schedule graphs on asyncio.
+
+	The counterpart of `core.process` on an event loop: the commands are started
+	with `asyncio.create_subprocess_exec`, or `create_subprocess_shell` when they
+	need a shell, and their output is read by tasks of the loop instead of two
+	threads by command, so hundreds of short commands can run together at the
+	cost of a few coroutines each.
+
+	The number of commands running at once through an executor is bounded by its
+	semaphore, shared by all the coroutines of the loop using it. A command is
+	started in its own session: when its coroutine is cancelled, e.g. by Ctrl-C
+	under `asyncio.run`, its whole process group is terminated, then killed if it
+	is still alive after `TERMINATE_GRACE` seconds, before the cancellation goes
+	on. No child outlives its schedule.
+
+	The coroutines don't own the loop, so they can be awaited from any running
+	loop, or run from synchronous code with `asyncio.run`.
+
+	`asyncio.wait_for` raises `asyncio.TimeoutError`, only an alias of the builtin
+	`TimeoutError` since Python 3.11, so the former is caught.
+
+"""
+
+from asyncio import (
+	CancelledError, Semaphore, create_subprocess_exec, create_subprocess_shell,
+	ensure_future, gather, get_running_loop, wait_for
+)
+from asyncio import TimeoutError as WaitTimeout
+from asyncio.subprocess import PIPE
+from collections import deque
+from shlex import split
+from signal import SIGTERM
+from time import perf_counter
+from typing import Awaitable, Callable, TextIO
+
+import sys
+
+from core.process import LINE_LIMIT, OUTPUT_LINES, TERMINATE_GRACE, failed, killpg, needsShell
+
+try:
+	from signal import SIGKILL
+
+except(ImportError):
+	SIGKILL = SIGTERM
+
+async def runGraphAsync(tasks: list[dict], run: Callable[[dict], Awaitable[dict]], workers: int = 1, failFast: bool = False) -> list[dict]:
+	""" Run the commands of a graph as coroutines of the running loop
+
+		The same graph as `core.process.runGraph`: a command waits for all the
+		commands it needs, then for one of the `workers` slots, taken in the
+		topological order. The commands needing a failed one are skipped, and
+		with `failFast` no command is started after the first failure. A cancelled
+		graph waits for all its commands to be terminated before going on.
+
+		Args:
+			tasks (list[dict]): the commands sorted by `planGraph`
+			run (Callable[[dict], Awaitable[dict]]): the coroutine function running a command, returning its result
+			workers (int, optional): the number of commands run together. Defaults to 1.
+			failFast (bool, optional): whether to stop starting commands on the first failure. Defaults to False.
+
+		Returns:
+			list[dict]: the results of the commands, with their "id" and whether they were "skipped", in topological order
+
+	"""
+
+	__loop		= get_running_loop()
+	__slots		= Semaphore(max(1, int(workers)))
+	__succeeded	= dict({ task["id"]: __loop.create_future() for task in tasks })
+	__state		= dict({ "stopped": False })
+
+	async def __run(task: dict) -> dict:
+		__result = None
+
+		try:
+			if(all([ await __succeeded[need] for need in set(task["needs"]) ])):
+				async with __slots:
+					if(not __state["stopped"]):
+						__result				= dict(await run(task), id=task["id"], skipped=False)
+						__state["stopped"]	= __state["stopped"] or bool(failFast and failed(__result))
+
+			return(__result or dict({
+				"command": task["cmd"],
+				"id": task["id"],
+				"shell": False,
+				"code": None,
+				"duration": float(0),
+				"expired": False,
+				"stdout": [],
+				"stderr": [],
+				"skipped": True
+			}))
+
+		finally:
+			if(not __succeeded[task["id"]].done()):
+				__succeeded[task["id"]].set_result(bool(__result and not failed(__result)))
+
+	__runs = [ ensure_future(__run(task)) for task in tasks ]
+
+	try:
+		return(list[dict](await gather(*__runs)))
+
+	except(CancelledError):
+		await gather(*__runs, return_exceptions=True)
+		raise
+
+class AsyncExecutor:
+
+	""" Runner of commands as coroutines, with a shell only when needed.
+
+		Attributes:
+			limit (int): Number of commands run at once through the executor.
+			timeout (float | None): Default timeout in seconds of the commands, None to wait for them.
+			echo (bool): Whether the output lines are written to the terminal as they come.
+			lines (int): Number of last lines kept by stream.
+			encoding (str): Encoding of the output of the commands.
+
+		Private Attributes:
+			__semaphores (dict): The semaphore of the limit, by event loop.
+
+		Methods:
+
+			run(command: str, timeout: float = None, prefix: str = "", sink: Callable = None, cwd: str = None) -> dict:
+				Runs a command until it exits or times out and returns its result, a coroutine.
+
+			write(text: str, output: TextIO = None) -> None:
+				Writes a line to the terminal.
+
+		Example:
+			>>> executor = AsyncExecutor(limit=100, echo=False)
+			>>> async def main():
+			...     return(await gather(*[ executor.run(f"ping -c 1 10.0.0.{i}") for i in range(1, 255) ]))
+			>>> results = asyncio.run(main())
+
+	"""
+
+	def __init__(self, limit: int = 64, timeout: float = None, echo: bool = True, lines: int = OUTPUT_LINES, encoding: str = "utf-8"):
+		self.limit		: int			= max(1, int(limit))
+		self.timeout	: float | None	= None if(timeout is None) else float(timeout)
+		self.echo		: bool			= bool(echo)
+		self.lines		: int			= max(1, int(lines))
+		self.encoding	: str			= str(encoding)
+
+		self.__semaphores = dict({})
+
+	def __semaphore(self) -> Semaphore:
+		""" Private method giving the semaphore of the running loop, a semaphore being bound to a single loop """
+
+		__loop = get_running_loop()
+
+		if(__loop not in self.__semaphores):
+			self.__semaphores = dict({ __loop: Semaphore(self.limit) })
+
+		return(self.__semaphores[__loop])
+
+	async def __read(self, stream, buffer: deque, output: TextIO, prefix: str, sink: Callable[[str, str], None] | None) -> None:
+		""" Private method reading a stream line by line until its end, a failing sink is replaced by the echo """
+
+		while(True):
+			try:
+				__line = await stream.readline()
+
+			except(ValueError):
+				buffer.append(f"[line over {LINE_LIMIT} bytes dropped]")
+				continue
+
+			if(not __line):
+				break
+
+			buffer.append(__line.decode(self.encoding, "replace").rstrip("\r\n"))
+
+			if(sink):
+				try:
+					sink("stdout" if(output is sys.stdout) else "stderr", buffer[-1])
+
+				except(Exception):
+					sink = None
+
+			elif(self.echo):
+				self.write(f"{prefix}{buffer[-1]}", output)
+
+	def __signal(self, process, signal: int) -> None:
+		""" Private method sending a signal to the process group of a command """
+
+		try:
+			killpg(process.pid, signal) if(killpg) else process.kill()
+
+		except(ProcessLookupError):
+			pass
+
+	async def __terminate(self, process) -> None:
+		""" Private method terminating a command, then killing it after the grace delay """
+
+		self.__signal(process, SIGTERM)
+
+		try:
+			await wait_for(process.wait(), TERMINATE_GRACE)
+
+		except(WaitTimeout):
+			self.__signal(process, SIGKILL)
+			await process.wait()
+
+	def write(self, text: str, output: TextIO = None) -> None:
+		__output = output or sys.stdout
+		__output.write(f"{text}\n")
+		__output.flush()
+
+	async def run(self, command: str, timeout: float = None, prefix: str = "", sink: Callable[[str, str], None] = None, cwd: str = None) -> dict:
+		""" Run a command until it exits or times out, once a slot of the limit is free
+
+			Args:
+				command (str): the command line
+				timeout (float, optional): the timeout in seconds. Defaults to the timeout of the executor.
+				prefix (str, optional): the prefix of the echoed lines, e.g. the id of the command. Defaults to "".
+				sink (Callable[[str, str], None], optional): called with the stream name and each line instead of echoing it. Defaults to None.
+				cwd (str, optional): the working directory of the command. Defaults to the one of the tool.
+
+			Returns:
+				dict: the result, like `core.process.Executor.run`
+
+			A timed out command is killed with its process group, a cancelled one is
+			terminated with it before the cancellation is raised again.
+
+		"""
+
+		__timeout	= self.timeout if(timeout is None) else float(timeout)
+		__result	= dict({
+			"command": command,
+			"shell": needsShell(command),
+			"code": None,
+			"duration": float(0),
+			"expired": False,
+			"stdout": deque(maxlen=self.lines),
+			"stderr": deque(maxlen=self.lines)
+		})
+
+		async with self.__semaphore():
+			__start = perf_counter()
+
+			try:
+				if(__result["shell"]):
+					__process = await create_subprocess_shell(command, stdout=PIPE, stderr=PIPE, limit=LINE_LIMIT, start_new_session=bool(killpg), cwd=cwd)
+
+				else:
+					__process = await create_subprocess_exec(*split(command), stdout=PIPE, stderr=PIPE, limit=LINE_LIMIT, start_new_session=bool(killpg), cwd=cwd)
+
+			except(FileNotFoundError, PermissionError) as e:
+				__result["code"] = 127 if(isinstance(e, FileNotFoundError)) else 126
+				__result["stderr"].append(f"{command.split()[0]}: {e.strerror}")
+
+				if(sink):
+					sink("stderr", __result["stderr"][-1])
+
+				elif(self.echo):
+					self.write(f"{prefix}{__result['stderr'][-1]}", sys.stderr)
+
+				__result.update({ "stdout": list(__result["stdout"]), "stderr": list(__result["stderr"]) })
+				return(__result)
+
+			__readers = gather(
+				self.__read(__process.stdout, __result["stdout"], sys.stdout, prefix, sink),
+				self.__read(__process.stderr, __result["stderr"], sys.stderr, prefix, sink)
+			)
+
+			try:
+				__result["code"] = await wait_for(__process.wait(), __timeout)
+
+			except(WaitTimeout):
+				__result["expired"] = True
+				self.__signal(__process, SIGKILL)
+				__result["code"] = await __process.wait()
+
+			except(CancelledError):
+				await self.__terminate(__process)
+				await gather(__readers, return_exceptions=True)
+				raise
+
+			await __readers
+
+		__result.update({
+			"duration": perf_counter()-__start,
+			"stdout": list(__result["stdout"]),
+			"stderr": list(__result["stderr"])
+		})
+
+		return(__result)
@@ -0,0 +1,1179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Storage engine for binary matrices.
+
+	This module provides the grid storage used by the `Matrix` tool. Cells only hold
+	0 or 1, they are stored row-major in a single contiguous buffer instead of a list
+	of lists of boxed integers: a NumPy `uint8` array when NumPy is installed, a
+	`bytearray` otherwise. Counts and row sums are computed by the buffer itself
+	(NumPy reductions or `bytearray.count`) instead of Python generators.
+
+	Each grid also maintains running counters of the set cells (total, per row and
+	per column), updated on every cell change, so the statistics of a grid are read
+	in O(1) instead of being recomputed over the whole buffer.
+
+	Random points are drawn from an index pool partitioning the cells into filled and
+	free cells, so adding or removing a random point is a single O(1) draw followed
+	by an O(1) swap, whatever the fill ratio of the grid. The pool costs 8 bytes by
+	cell, a dense grid of at least `POOL_CELLS` cells draws its points on a Fenwick
+	tree of the counts of its blocks of `TREE_BLOCK` cells instead, in O(log n), for
+	less than a byte by cell.
+
+	Huge grids holding few points are stored sparse, as a hash set of the indices of
+	their set cells. The `Grid` facade switches automatically between the dense and
+	the sparse storage on density thresholds, with a hysteresis so a grid oscillating
+	around a threshold isn't converted back and forth. A grid kept sparse while it
+	fills up, e.g. `--backend sparse`, lists its free cells over `SPARSE_FREE[1]`,
+	so its free cells are still drawn in O(1) instead of by rejection.
+
+	The bit-packed storage holds 8 cells per byte, each row starting on a byte
+	boundary. Its counters are rebuilt with popcounts over whole rows instead of
+	per cell reads, and its random draws walk a Fenwick tree of the row counts
+	rather than an index pool, so a grid of 10^8 cells fits in about 12 Mb.
+
+	Constants:
+	- NUMPY: Indicates whether NumPy is available to back the grids.
+	- BACKENDS: Storage modes of a grid, including "auto", "dense", "sparse", "bits".
+	- SPARSE_CELLS: Number of cells from which the "auto" mode considers the sparse storage.
+	- SPARSE_DENSITY: Fill ratios under which a grid goes sparse, and over which it goes back dense.
+	- DENSE_LIMIT: Maximum number of cells of a dense grid.
+	- BITS_CELLS: Number of cells from which the "auto" mode packs the dense cells into bits.
+	- SPARSE_FREE: Fill ratios under which a sparse grid drops the list of its free cells, and over which it builds it.
+	- POOL_CELLS: Number of cells from which a dense grid draws its points on a tree of block counts instead of an index pool.
+	- TREE_BLOCK: Number of cells of a block of the tree of a dense grid.
+
+	Functions:
+	- sumBlocks: Counts the set cells of a NumPy array by blocks.
+	- countTree: Builds the Fenwick tree of the counts of ranges of cells, rows or blocks.
+	- findCount: Finds the range holding the cell of a rank on a tree of counts.
+	- addCount: Updates the count of a range in a tree of counts.
+
+"""
+
+from array import array
+from random import randrange
+from typing import Callable, Iterator
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+NUMPY : bool = bool(np is not None)
+""" Indicates whether NumPy is available to back the grids
+"""
+
+BACKENDS : tuple[str] = ("auto", "dense", "sparse", "bits")
+""" Storage modes of a grid, including "auto", "dense", "sparse", "bits"
+"""
+
+SPARSE_CELLS : int = 2**24
+""" Number of cells from which the "auto" mode considers the sparse storage
+"""
+
+SPARSE_DENSITY : tuple[float, float] = (.01, .05)
+""" Fill ratios under which a grid goes sparse, and over which it goes back dense
+"""
+
+DENSE_LIMIT : int = 2**34
+""" Maximum number of cells of a dense grid
+"""
+
+BITS_CELLS : int = 2**26
+""" Number of cells from which the "auto" mode packs the dense cells into bits
+"""
+
+SPARSE_FREE : tuple[float, float] = (.25, .5)
+""" Fill ratios under which a sparse grid drops the list of its free cells, and over which it builds it
+"""
+
+POOL_CELLS : int = 2**22
+""" Number of cells from which a dense grid draws its points on a tree of block counts instead of an index pool
+"""
+
+TREE_BLOCK : int = 256
+""" Number of cells of a block of the tree of a dense grid
+"""
+
+BIT_MASKS = tuple[bytes]([ bytes([ (v >> k)&1 for v in range(0, 256) ]) for k in range(0, 8) ])
+POPCOUNT = bytes([ v.bit_count() for v in range(0, 256) ])
+
+def sumBlocks(cells, bx: int, by: int):
+	""" Count the set cells of a `(y, x)` uint8 array by blocks of `bx` x `by` cells
+
+		The whole blocks are summed on a reshaped view, without copy, the last row
+		and column of blocks are summed apart when `bx` or `by` don't divide the
+		dimensions. Much faster than an `add.reduceat`, which casts each cell.
+
+		Returns:
+			numpy.ndarray: the `(ceil(y/by), ceil(x/bx))` block counts
+
+	"""
+
+	y, x	= cells.shape
+	__full	= y-y%by
+	__bands	= np.empty((-(-y//by), x), dtype=np.int64)
+	__bands[0:__full//by] = cells[0:__full].reshape(-1, by, x).sum(axis=1, dtype=np.uint32)
+
+	if(__full < y):
+		__bands[-1] = cells[__full:y].sum(axis=0, dtype=np.int64)
+
+	__full	= x-x%bx
+	__sums	= np.empty((len(__bands), -(-x//bx)), dtype=np.int64)
+	__sums[:, 0:__full//bx] = __bands[:, 0:__full].reshape(len(__bands), -1, bx).sum(axis=2)
+
+	if(__full < x):
+		__sums[:, -1] = __bands[:, __full:x].sum(axis=1)
+
+	return(__sums)
+
+def countTree(counts: list[int]) -> list[int]:
+	""" Build the Fenwick tree of the counts of ranges of cells in O(n), the node `i` covering the `i & -i` ranges up to the range `i-1` """
+
+	__tree = list[int]([0])+list[int](counts)
+
+	for i in range(1, len(__tree)):
+		__parent = i+(i & -i)
+
+		if(__parent < len(__tree)):
+			__tree[__parent] += __tree[i]
+
+	return(__tree)
+
+def findCount(tree: list[int], size: int, rank: int, value: int) -> tuple[int, int]:
+	""" Find the range holding the cell of a rank on a tree of counts, e.g. a row
+
+		The tree is walked down from its largest power of two, a node covering
+		`step` ranges holds `tree[i]` filled cells and `step*size-tree[i]` free ones.
+		A shorter last range only overcounts the free cells of the nodes covering it,
+		which are never passed over.
+
+		Args:
+			tree (list[int]): the tree, see `countTree`
+			size (int): the number of cells of a range
+			rank (int): the rank of the cell among the cells holding the value
+			value (int): the value of the counted cells
+
+		Returns:
+			tuple[int, int]: the range index and the rank of the cell within the range
+
+	"""
+
+	__row	= int(0)
+	__step	= 1 << ((len(tree)-1).bit_length()-1)
+
+	while(__step):
+		__next = __row+__step
+
+		if(__next < len(tree)):
+			__count = tree[__next] if(value) else __step*size-tree[__next]
+
+			if(__count <= rank):
+				__row = __next
+				rank -= __count
+
+		__step >>= 1
+
+	return(__row, rank)
+
+def addCount(tree: list[int], index: int, delta: int) -> None:
+	""" Add a delta to the count of a range in a tree of counts, in O(log n) """
+
+	i = index+1
+
+	while(i < len(tree)):
+		tree[i] += delta
+		i += i & -i
+
+class DenseGrid:
+
+	""" Dense binary grid stored in a contiguous row-major buffer.
+
+		Attributes:
+			x (int): Number of columns.
+			y (int): Number of rows.
+			numpy (bool): Whether the cells are backed by a NumPy array.
+			backend (str): Name of the storage, "numpy" or "bytearray".
+
+		Private Attributes:
+			__cells (numpy.ndarray | bytearray): The cells, a `(y, x)` uint8 array or a `x*y` bytearray.
+			__view (memoryview): Flat byte view of the cells, used for the single cell accesses.
+			__total (int): Running count of the set cells.
+			__rows (list[int]): Running count of the set cells by row.
+			__cols (list[int]): Running count of the set cells by column.
+			__pool (array | None): Permutation of the flat cell indices, filled cells first, built on the first random draw under `POOL_CELLS` cells.
+			__where (array | None): Position of each flat cell index in the pool.
+			__tree (list[int] | None): Fenwick tree of the counts of the blocks of `TREE_BLOCK` cells, built on the first random draw from `POOL_CELLS` cells.
+
+		Methods:
+
+			get(x: int, y: int) -> int:
+				Returns the value of a cell.
+
+			set(x: int, y: int, value: int = 1) -> int:
+				Updates a cell and returns its previous value.
+
+			row(y: int, start: int = 0, end: int = None) -> list[int]:
+				Returns the values of a row, or of a slice of it.
+
+			rowSum(y: int) -> int:
+				Returns the number of set cells of a row.
+
+			colSum(x: int) -> int:
+				Returns the number of set cells of a column.
+
+			rowSums() -> list[int]:
+				Returns the number of set cells of each row.
+
+			colSums() -> list[int]:
+				Returns the number of set cells of each column.
+
+			blockSums(bx: int, by: int) -> list[list[int]]:
+				Returns the number of set cells of each block of bx x by cells, by row of blocks.
+
+			total() -> int:
+				Returns the number of set cells.
+
+			fill() -> float:
+				Returns the ratio of set cells, between 0 and 1.
+
+			recount() -> int:
+				Rebuilds the counters from the cells and returns the total.
+
+			randomPoint(value: int = 0, randbelow: Callable = randrange) -> tuple[int, int]:
+				Returns the coordinates of a random cell holding a value.
+
+			setMany(indices: list[int]) -> int:
+				Sets the cells of flat indices in bulk and returns the total.
+
+			points() -> Iterator[int]:
+				Yields the flat indices of the set cells.
+
+			buffer() -> memoryview:
+				Returns the raw bytes of the storage.
+
+		Example:
+			>>> grid = DenseGrid(3, 2)
+			>>> grid.set(1, 0)
+			0
+			>>> grid.rowSums(), grid.total(), grid.fill()
+			([1, 0], 1, 0.16666666666666666)
+
+	"""
+
+	def __init__(self, x: int, y: int, numpy: bool = NUMPY, cells = None, counters: tuple[list[int], list[int]] = None):
+		""" Create a grid, empty or backed by existing cells
+
+			Args:
+				x (int): number of columns
+				y (int): number of rows
+				numpy (bool, optional): whether to back the cells by NumPy. Defaults to NUMPY.
+				cells (numpy.ndarray | bytearray | mmap, optional): existing cells, e.g. mapped from a file. Defaults to None.
+				counters (tuple[list[int], list[int]], optional): the row and column sums of the cells, recounted if None. Defaults to None.
+
+		"""
+
+		self.x		: int	= int(x)
+		self.y		: int	= int(y)
+		self.numpy	: bool	= bool(numpy and NUMPY)
+		self.backend: str	= "numpy" if(self.numpy) else "bytearray"
+
+		if((self.x < 1) or (self.y < 1)):
+			raise(ValueError(f"Invalid matrix dimensions {self.x}x{self.y}"))
+
+		self.__cells = (np.zeros((self.y, self.x), dtype=np.uint8) if(self.numpy) else bytearray(self.x*self.y)) if(cells is None) else cells
+		self.__view	 = memoryview(self.__cells).cast("B")
+		self.__total = int(0)
+		self.__rows	 = list[int]([0]*self.y)
+		self.__cols	 = list[int]([0]*self.x)
+		self.__pool	 = None
+		self.__where = None
+		self.__tree	 = None
+
+		if(counters is not None):
+			self.__rows, self.__cols = list[int](counters[0]), list[int](counters[1])
+			self.__total = int(sum(self.__rows))
+
+		elif(cells is not None):
+			self.recount()
+
+	def __len__(self) -> int:
+		return(self.x*self.y)
+
+	def __buildPool(self) -> None:
+		""" Private method to build the index pool from the current cells
+
+			The pool holds the filled cell indices in `[0, total)` and the free
+			ones in `[total, cells)`, `__where` is its inverse permutation.
+
+		"""
+
+		__code = "i"
+
+		if(self.__total in (0, len(self))):
+			if(self.numpy):
+				self.__pool = array(__code, [0])*len(self)
+				__view		= np.frombuffer(self.__pool, dtype=__code)
+
+				for i in range(0, len(self), 2**20):
+					__view[i:i+2**20] = np.arange(i, min(i+2**20, len(self)), dtype=__code)
+
+			else:
+				self.__pool = array(__code, range(0, len(self)))
+
+			self.__where = self.__pool[:]
+
+		elif(self.numpy):
+			__flat	= self.__cells.reshape(-1)
+			__pool	= np.concatenate((np.flatnonzero(__flat), np.flatnonzero(__flat == 0))).astype(__code)
+			__where	= np.empty(len(self), dtype=__code)
+			__where[__pool] = np.arange(len(self), dtype=__code)
+
+			self.__pool		= array(__code, __pool.tobytes())
+			self.__where	= array(__code, __where.tobytes())
+
+		else:
+			self.__pool = array(__code, [ i for i, v in enumerate(self.__cells) if(v) ])
+			self.__pool.extend([ i for i, v in enumerate(self.__cells) if(not v) ])
+			self.__where = array(__code, bytes(self.__pool.itemsize*len(self)))
+
+			for i, index in enumerate(self.__pool):
+				self.__where[index] = i
+
+	def __swap(self, index: int, position: int) -> None:
+		""" Private method to move a cell index to a position of the pool
+
+			Args:
+				index (int): the flat index of the cell to move
+				position (int): the target position in the pool
+
+		"""
+
+		__from				= self.__where[index]
+		__other				= self.__pool[position]
+		self.__pool[position]	= index
+		self.__pool[__from]		= __other
+		self.__where[index]		= position
+		self.__where[__other]	= __from
+
+	def __buildTree(self) -> None:
+		""" Private method to build the Fenwick tree of the block counts in O(cells) """
+
+		if(self.numpy):
+			__flat		= self.__cells.reshape(-1)
+			__full		= len(self)-len(self)%TREE_BLOCK
+			__counts	= __flat[0:__full].reshape(-1, TREE_BLOCK).sum(axis=1, dtype=np.int64).tolist()
+
+			if(__full < len(self)):
+				__counts.append(int(__flat[__full:].sum()))
+
+		else:
+			__counts = [ bytes(self.__view[i:i+TREE_BLOCK]).count(1) for i in range(0, len(self), TREE_BLOCK) ]
+
+		self.__tree = countTree(__counts)
+
+	def __drawBlock(self, value: int, randbelow: Callable) -> tuple[int, int]:
+		""" Private method drawing a random cell holding a value on the tree of the block counts """
+
+		if((value and not self.__total) or (not value and (self.__total == len(self)))):
+			raise(IndexError(f"No {'filled' if(value) else 'free'} cell to draw"))
+
+		if(self.__tree is None):
+			self.__buildTree()
+
+		__block, __rank	= findCount(self.__tree, TREE_BLOCK, randbelow(self.__total if(value) else len(self)-self.__total), value)
+		__line			= bytes(self.__view[__block*TREE_BLOCK:(__block+1)*TREE_BLOCK])
+		__x, __width	= int(0), len(__line)
+
+		while(__width > 1):
+			__half	= __width >> 1
+			__count	= __line.count(value, __x, __x+__half)
+
+			if(__rank < __count):
+				__width = __half
+
+			else:
+				__rank	-= __count
+				__x		+= __half
+				__width	-= __half
+
+		__index = __block*TREE_BLOCK+__x
+
+		return(__index%self.x, __index//self.x)
+
+	def get(self, x: int, y: int) -> int:
+		return(self.__view[y*self.x+x])
+
+	def set(self, x: int, y: int, value: int = 1) -> int:
+		__previous	= self.get(x, y)
+		__value		= 1 if(value) else 0
+
+		if(__previous == __value):
+			return(__previous)
+
+		self.__view[y*self.x+x] = __value
+
+		if(self.__pool is not None):
+			self.__swap(y*self.x+x, self.__total if(__value) else self.__total-1)
+
+		__delta = __value-__previous
+		self.__total	+= __delta
+		self.__rows[y]	+= __delta
+		self.__cols[x]	+= __delta
+
+		if(self.__tree is not None):
+			addCount(self.__tree, (y*self.x+x)//TREE_BLOCK, __delta)
+
+		return(__previous)
+
+	def row(self, y: int, start: int = 0, end: int = None) -> list[int]:
+		__end = self.x if(end is None) else min(end, self.x)
+
+		if(self.numpy):
+			return(self.__cells[y, start:__end].tolist())
+
+		return(list[int](self.__cells[y*self.x+start:y*self.x+__end]))
+
+	def rowSum(self, y: int) -> int:
+		return(self.__rows[y])
+
+	def colSum(self, x: int) -> int:
+		return(self.__cols[x])
+
+	def rowSums(self) -> list[int]:
+		return(self.__rows[:])
+
+	def colSums(self) -> list[int]:
+		return(self.__cols[:])
+
+	def blockSums(self, bx: int, by: int) -> list[list[int]]:
+		""" Count the set cells by block, e.g. to downsample the grid to the terminal size
+
+			With NumPy, the rows of each band of blocks are summed, then the columns of
+			each block, see `sumBlocks`. Without NumPy, each row is copied as `bytes`
+			and counted by block, the cells of a loaded grid being an `mmap` without
+			`count`. The last blocks of a row or of a column are smaller when `bx` or
+			`by` don't divide the dimensions.
+
+			Args:
+				bx (int): the number of columns of a block
+				by (int): the number of rows of a block
+
+			Returns:
+				list[list[int]]: the `ceil(y/by)` rows of `ceil(x/bx)` block counts
+
+		"""
+
+		if(self.numpy):
+			return(sumBlocks(self.__cells, bx, by).tolist())
+
+		__sums = [ [0]*(-(-self.x//bx)) for _ in range(0, -(-self.y//by)) ]
+
+		for y in range(0, self.y):
+			__row, __line = __sums[y//by], bytes(self.__cells[y*self.x:(y+1)*self.x])
+
+			for j, x in enumerate(range(0, self.x, bx)):
+				__row[j] += __line.count(1, x, min(x+bx, self.x))
+
+		return(__sums)
+
+	def total(self) -> int:
+		return(self.__total)
+
+	def fill(self) -> float:
+		return(self.__total/len(self))
+
+	def recount(self) -> int:
+		""" Rebuild the counters from the cells with vectorised reductions
+
+			Returns:
+				int: the number of set cells
+
+		"""
+
+		if(self.numpy):
+			self.__rows	= self.__cells.sum(axis=1, dtype=np.int64).tolist()
+			self.__cols	= self.__cells.sum(axis=0, dtype=np.int64).tolist()
+
+		else:
+			self.__rows	= list[int]([ self.__cells[i*self.x:(i+1)*self.x].count(1) for i in range(0, self.y) ])
+			self.__cols	= list[int]([ self.__cells[i::self.x].count(1) for i in range(0, self.x) ])
+
+		self.__total = int(sum(self.__rows))
+		self.__pool	 = None
+		self.__where = None
+		self.__tree	 = None
+
+		return(self.__total)
+
+	def setMany(self, indices: list[int]) -> int:
+		""" Set the cells of a list of flat indices in bulk, then rebuild the counters
+
+			Returns:
+				int: the number of set cells
+
+		"""
+
+		if(self.numpy):
+			self.__cells.reshape(-1)[np.fromiter(indices, dtype=np.int64)] = 1
+
+		else:
+			for index in indices:
+				self.__view[index] = 1
+
+		return(self.recount())
+
+	def points(self) -> Iterator[int]:
+		if(self.numpy):
+			for i in range(0, self.y, 1024):
+				yield from (np.flatnonzero(self.__cells[i:i+1024])+(i*self.x)).tolist()
+
+		else:
+			__index = self.__cells.find(b"\x01")
+
+			while(__index != -1):
+				yield __index
+				__index = self.__cells.find(b"\x01", __index+1)
+
+	def buffer(self) -> memoryview:
+		return(self.__view)
+
+	def randomPoint(self, value: int = 0, randbelow: Callable = randrange) -> tuple[int, int]:
+		""" Draw a random cell holding a value without rejection
+
+			Under `POOL_CELLS` cells, the cell is drawn from the index pool in O(1).
+			Otherwise, a rank is drawn among the cells holding the value, its block is
+			found on the Fenwick tree of the block counts, then the cell by halving the
+			block on byte counts, in O(log n).
+
+			Args:
+				value (int, optional): 0 to draw a free cell, 1 to draw a filled cell. Defaults to 0.
+				randbelow (Callable, optional): random integer generator in `[0, n)`. Defaults to randrange.
+
+			Returns:
+				tuple[int, int]: the x, y coordinates of the drawn cell
+
+			Raise an IndexError if no cell holds the value
+
+		"""
+
+		if(len(self) >= POOL_CELLS):
+			return(self.__drawBlock(value, randbelow))
+
+		if(self.__pool is None):
+			self.__buildPool()
+
+		if(value):
+			if(not self.__total):
+				raise(IndexError("No filled cell to draw"))
+
+			__index = self.__pool[randbelow(self.__total)]
+
+		else:
+			if(self.__total == len(self)):
+				raise(IndexError("No free cell to draw"))
+
+			__index = self.__pool[self.__total+randbelow(len(self)-self.__total)]
+
+		return(__index%self.x, __index//self.x)
+
+class SparseGrid:
+
+	""" Sparse binary grid storing the indices of its set cells in a hash set.
+
+		The memory only depends on the number of set points, not on the dimensions,
+		e.g. a 1M x 1M grid with 10k points fits in a few Mb. Counters by row and by
+		column are dicts holding only the non empty lines.
+
+		Attributes:
+			x (int): Number of columns.
+			y (int): Number of rows.
+			numpy (bool): Always False, kept for compatibility with `DenseGrid`.
+			backend (str): Name of the storage, "sparse".
+
+		Private Attributes:
+			__cells (set[int]): Flat indices of the set cells.
+			__total (int): Running count of the set cells.
+			__rows (dict[int, int]): Running count of the set cells by non empty row.
+			__cols (dict[int, int]): Running count of the set cells by non empty column.
+			__filled (list[int]): The set cells in draw order, for O(1) random draws.
+			__where (dict[int, int]): Position of each set cell in `__filled`.
+			__free (list[int] | None): The free cells in draw order over `SPARSE_FREE[1]` of fill, None otherwise.
+			__spot (dict[int, int]): Position of each free cell in `__free`.
+
+		Methods:
+			Same interface as `DenseGrid`.
+
+	"""
+
+	def __init__(self, x: int, y: int):
+		self.x		: int	= int(x)
+		self.y		: int	= int(y)
+		self.numpy	: bool	= False
+		self.backend: str	= "sparse"
+
+		if((self.x < 1) or (self.y < 1)):
+			raise(ValueError(f"Invalid matrix dimensions {self.x}x{self.y}"))
+
+		self.__cells	= set[int]()
+		self.__rows		= dict[int, int]({})
+		self.__cols		= dict[int, int]({})
+		self.__filled	= list[int]([])
+		self.__where	= dict[int, int]({})
+		self.__free		= None
+		self.__spot		= dict[int, int]({})
+
+	def __len__(self) -> int:
+		return(self.x*self.y)
+
+	def __move(self, cells: list[int], where: dict[int, int], index: int, target: list[int] | None, spots: dict[int, int]) -> None:
+		""" Private method moving a cell from a draw list to another one, in O(1) by swapping it with the last cell """
+
+		__last = cells.pop()
+
+		if(__last != index):
+			cells[where[index]] = __last
+			where[__last] = where[index]
+
+		del where[index]
+
+		if(target is not None):
+			spots[index] = len(target)
+			target.append(index)
+
+	def __count(self, counter: dict[int, int], key: int, delta: int) -> None:
+		__count = counter.get(key, 0)+delta
+
+		if(__count):
+			counter[key] = __count
+
+		else:
+			del counter[key]
+
+	def get(self, x: int, y: int) -> int:
+		return(1 if((y*self.x+x) in self.__cells) else 0)
+
+	def set(self, x: int, y: int, value: int = 1) -> int:
+		__index		= y*self.x+x
+		__previous	= 1 if(__index in self.__cells) else 0
+		__value		= 1 if(value) else 0
+
+		if(__previous == __value):
+			return(__previous)
+
+		if(__value):
+			self.__cells.add(__index)
+
+			if(self.__free is not None):
+				self.__move(self.__free, self.__spot, __index, self.__filled, self.__where)
+
+			else:
+				self.__where[__index] = len(self.__filled)
+				self.__filled.append(__index)
+
+		else:
+			self.__cells.discard(__index)
+			self.__move(self.__filled, self.__where, __index, self.__free, self.__spot)
+
+			if((self.__free is not None) and (len(self.__cells) < SPARSE_FREE[0]*len(self))):
+				self.__free, self.__spot = None, dict[int, int]({})
+
+		self.__count(self.__rows, y, __value-__previous)
+		self.__count(self.__cols, x, __value-__previous)
+
+		return(__previous)
+
+	def row(self, y: int, start: int = 0, end: int = None) -> list[int]:
+		__end = self.x if(end is None) else min(end, self.x)
+		__row = list[int]([0]*(__end-start))
+
+		if(y in self.__rows):
+			for x in range(start, __end):
+				if((y*self.x+x) in self.__cells):
+					__row[x-start] = 1
+
+		return(__row)
+
+	def rowSum(self, y: int) -> int:
+		return(self.__rows.get(y, 0))
+
+	def colSum(self, x: int) -> int:
+		return(self.__cols.get(x, 0))
+
+	def rowSums(self) -> list[int]:
+		return(list[int]([ self.__rows.get(y, 0) for y in range(0, self.y) ]))
+
+	def colSums(self) -> list[int]:
+		return(list[int]([ self.__cols.get(x, 0) for x in range(0, self.x) ]))
+
+	def blockSums(self, bx: int, by: int) -> list[list[int]]:
+		__sums = [ [0]*(-(-self.x//bx)) for _ in range(0, -(-self.y//by)) ]
+
+		for index in self.__filled:
+			__sums[index//self.x//by][index%self.x//bx] += 1
+
+		return(__sums)
+
+	def total(self) -> int:
+		return(len(self.__cells))
+
+	def fill(self) -> float:
+		return(len(self.__cells)/len(self))
+
+	def recount(self) -> int:
+		return(len(self.__cells))
+
+	def randomPoint(self, value: int = 0, randbelow: Callable = randrange) -> tuple[int, int]:
+		""" Draw a random cell holding a value
+
+			Filled cells are drawn from `__filled` in O(1). Free cells are drawn by
+			rejection while the grid is at most half full, in 2 tries on average at worst, then
+			from `__free`, built once in O(cells) when the fill crosses `SPARSE_FREE[1]`.
+
+			Raise an IndexError if no cell holds the value
+
+		"""
+
+		if(value):
+			if(not self.__filled):
+				raise(IndexError("No filled cell to draw"))
+
+			__index = self.__filled[randbelow(len(self.__filled))]
+
+		else:
+			if(len(self.__cells) == len(self)):
+				raise(IndexError("No free cell to draw"))
+
+			if((self.__free is None) and (len(self.__cells) > SPARSE_FREE[1]*len(self))):
+				self.__free = list[int]([ i for i in range(0, len(self)) if(i not in self.__cells) ])
+				self.__spot = dict[int, int]({ index: i for i, index in enumerate(self.__free) })
+
+			if(self.__free is not None):
+				__index = self.__free[randbelow(len(self.__free))]
+
+			else:
+				__index = randbelow(len(self))
+				while(__index in self.__cells):
+					__index = randbelow(len(self))
+
+		return(__index%self.x, __index//self.x)
+
+	def points(self) -> Iterator[int]:
+		yield from self.__filled
+
+	def buffer(self) -> memoryview:
+		""" Return the flat indices of the set cells, sorted, as 64 bits integers """
+
+		return(memoryview(array("q", sorted(self.__filled))).cast("B"))
+
+class BitGrid:
+
+	""" Bit-packed binary grid, 8 cells per byte.
+
+		Each row takes `ceil(x/8)` bytes and starts on a byte boundary, the cell `x`
+		of a row is the bit `x%8` of its byte `x//8`. A row read as a little-endian
+		int holds its cells in order, so row sums are popcounts of whole rows.
+
+		The counters are maintained on each cell change as in `DenseGrid`. Random
+		draws don't need an index pool, which would cost 8 bytes per cell: a row is
+		picked on a Fenwick tree of the row counts in O(log y), then the cell within
+		the row by a bisection on popcounts in O(log x).
+
+		Attributes:
+			x (int): Number of columns.
+			y (int): Number of rows.
+			numpy (bool): Whether the bytes are backed by a NumPy array.
+			backend (str): Name of the storage, "bits".
+
+		Private Attributes:
+			__stride (int): Number of bytes of a row.
+			__cells (numpy.ndarray | bytearray): The packed cells, a `(y, stride)` uint8 array or a `y*stride` bytearray.
+			__view (memoryview): Flat byte view of the cells.
+			__total (int): Running count of the set cells.
+			__rows (list[int]): Running count of the set cells by row.
+			__cols (list[int]): Running count of the set cells by column.
+			__tree (list[int] | None): Fenwick tree of the row counts, built on the first random draw.
+
+		Methods:
+			Same interface as `DenseGrid`.
+
+		Example:
+			>>> grid = BitGrid(10**4, 10**4)
+			>>> grid.set(9999, 0), grid.rowSum(0), grid.total()
+			(0, 1, 1)
+
+	"""
+
+	def __init__(self, x: int, y: int, numpy: bool = NUMPY, cells = None, counters: tuple[list[int], list[int]] = None):
+		self.x		: int	= int(x)
+		self.y		: int	= int(y)
+		self.numpy	: bool	= bool(numpy and NUMPY)
+		self.backend: str	= "bits"
+
+		if((self.x < 1) or (self.y < 1)):
+			raise(ValueError(f"Invalid matrix dimensions {self.x}x{self.y}"))
+
+		self.__stride	= (self.x+7)//8
+		self.__cells	= (np.zeros((self.y, self.__stride), dtype=np.uint8) if(self.numpy) else bytearray(self.y*self.__stride)) if(cells is None) else cells
+		self.__view		= memoryview(self.__cells).cast("B")
+		self.__total	= int(0)
+		self.__rows		= list[int]([0]*self.y)
+		self.__cols		= list[int]([0]*self.x)
+		self.__tree		= None
+
+		if(counters is not None):
+			self.__rows, self.__cols = list[int](counters[0]), list[int](counters[1])
+			self.__total = int(sum(self.__rows))
+
+		elif(cells is not None):
+			self.recount()
+
+	def __len__(self) -> int:
+		return(self.x*self.y)
+
+	def __bits(self, y: int) -> int:
+		""" Private method reading a row as an int, the bit i being the cell i """
+
+		return(int.from_bytes(self.__view[y*self.__stride:(y+1)*self.__stride], "little"))
+
+	def get(self, x: int, y: int) -> int:
+		return((self.__view[y*self.__stride+(x >> 3)] >> (x & 7)) & 1)
+
+	def set(self, x: int, y: int, value: int = 1) -> int:
+		__byte		= y*self.__stride+(x >> 3)
+		__previous	= (self.__view[__byte] >> (x & 7)) & 1
+		__value		= 1 if(value) else 0
+
+		if(__previous == __value):
+			return(__previous)
+
+		self.__view[__byte] ^= 1 << (x & 7)
+
+		__delta = __value-__previous
+		self.__total	+= __delta
+		self.__rows[y]	+= __delta
+		self.__cols[x]	+= __delta
+
+		if(self.__tree is not None):
+			addCount(self.__tree, y, __delta)
+
+		return(__previous)
+
+	def row(self, y: int, start: int = 0, end: int = None) -> list[int]:
+		__end	= self.x if(end is None) else min(end, self.x)
+		__bits	= self.__bits(y) >> start
+
+		return(list[int]([ (__bits >> i) & 1 for i in range(0, __end-start) ]))
+
+	def rowSum(self, y: int) -> int:
+		return(self.__rows[y])
+
+	def colSum(self, x: int) -> int:
+		return(self.__cols[x])
+
+	def rowSums(self) -> list[int]:
+		return(self.__rows[:])
+
+	def colSums(self) -> list[int]:
+		return(self.__cols[:])
+
+	def blockSums(self, bx: int, by: int) -> list[list[int]]:
+		""" Count the set cells by block, see `DenseGrid.blockSums`
+
+			With NumPy, bands of whole blocks are unpacked at a time, about 1024 rows,
+			and reduced as the dense cells. Otherwise, the cells of a block within a
+			row are the popcount of a shifted and masked row int.
+
+		"""
+
+		if(self.numpy):
+			__chunk = by*max(1, 1024//by)
+			__sums	= list[list[int]]([])
+
+			for i in range(0, self.y, __chunk):
+				__cells = np.unpackbits(self.__cells[i:i+__chunk], axis=1, count=self.x, bitorder="little")
+				__sums.extend(sumBlocks(__cells, bx, by).tolist())
+
+			return(__sums)
+
+		__sums = [ [0]*(-(-self.x//bx)) for _ in range(0, -(-self.y//by)) ]
+		__mask = (1 << bx)-1
+
+		for y in range(0, self.y):
+			if(not self.__rows[y]):
+				continue
+
+			__row, __bits = __sums[y//by], self.__bits(y)
+
+			for j in range(0, len(__row)):
+				__row[j] += ((__bits >> (j*bx)) & __mask).bit_count()
+
+		return(__sums)
+
+	def total(self) -> int:
+		return(self.__total)
+
+	def fill(self) -> float:
+		return(self.__total/len(self))
+
+	def recount(self) -> int:
+		""" Rebuild the counters from the packed cells
+
+			Row sums are popcounts of the row bytes. Column sums are taken on the
+			unpacked bits by blocks of rows with NumPy, otherwise on the column of
+			bytes of each bit, translated to 0/1 and counted.
+
+			Returns:
+				int: the number of set cells
+
+		"""
+
+		if(self.numpy):
+			__table		= np.frombuffer(POPCOUNT, dtype=np.uint8)
+			__cols		= np.zeros(self.x, dtype=np.int64)
+			self.__rows	= list[int]([])
+
+			for i in range(0, self.y, 1024):
+				__block		= self.__cells[i:i+1024]
+				__counts	= np.bitwise_count(__block) if(hasattr(np, "bitwise_count")) else __table[__block]
+				self.__rows.extend(__counts.sum(axis=1, dtype=np.int64).tolist())
+				__cols += np.unpackbits(__block, axis=1, count=self.x, bitorder="little").sum(axis=0, dtype=np.int64)
+
+			self.__cols = __cols.tolist()
+
+		else:
+			self.__rows = list[int]([ self.__bits(i).bit_count() for i in range(0, self.y) ])
+			self.__cols = list[int]([0]*self.x)
+
+			for i in range(0, self.__stride):
+				__column = bytes(self.__cells[i::self.__stride])
+
+				for k in range(0, min(8, self.x-8*i)):
+					self.__cols[8*i+k] = __column.translate(BIT_MASKS[k]).count(1)
+
+		self.__total = int(sum(self.__rows))
+		self.__tree	 = None
+
+		return(self.__total)
+
+	def setMany(self, indices: list[int]) -> int:
+		""" Set the cells of a list of flat indices in bulk, then rebuild the counters
+
+			Returns:
+				int: the number of set cells
+
+		"""
+
+		if(self.numpy):
+			__indices = np.fromiter(indices, dtype=np.int64)
+			np.bitwise_or.at(self.__cells, (__indices//self.x, (__indices%self.x) >> 3), (1 << (__indices%self.x & 7)).astype(np.uint8))
+
+		else:
+			for index in indices:
+				__x = index%self.x
+				self.__view[(index//self.x)*self.__stride+(__x >> 3)] |= 1 << (__x & 7)
+
+		return(self.recount())
+
+	def points(self) -> Iterator[int]:
+		for y in range(0, self.y):
+			if(not self.__rows[y]):
+				continue
+
+			__bits = self.__bits(y)
+
+			while(__bits):
+				__low = __bits & -__bits
+				yield y*self.x+__low.bit_length()-1
+				__bits ^= __low
+
+	def buffer(self) -> memoryview:
+		return(self.__view)
+
+	def randomPoint(self, value: int = 0, randbelow: Callable = randrange) -> tuple[int, int]:
+		""" Draw a random cell holding a value without rejection
+
+			A rank is drawn among the cells holding the value, its row is found on
+			the Fenwick tree, then its column by halving the row and comparing the
+			rank with the popcount of the lower half.
+
+			Raise an IndexError if no cell holds the value
+
+		"""
+
+		if(self.__tree is None):
+			self.__tree = countTree(self.__rows)
+
+		if(value and not self.__total):
+			raise(IndexError("No filled cell to draw"))
+
+		if(not value and (self.__total == len(self))):
+			raise(IndexError("No free cell to draw"))
+
+		__y, __rank = findCount(self.__tree, self.x, randbelow(self.__total if(value) else len(self)-self.__total), value)
+		__bits		= self.__bits(__y) if(value) else ~self.__bits(__y) & ((1 << self.x)-1)
+		__x, __width = int(0), self.x
+
+		while(__width > 1):
+			__half	= __width >> 1
+			__count	= ((__bits >> __x) & ((1 << __half)-1)).bit_count()
+
+			if(__rank < __count):
+				__width = __half
+
+			else:
+				__rank	-= __count
+				__x		+= __half
+				__width	-= __half
+
+		return(__x, __y)
+
+class Grid:
+
+	""" Binary grid switching automatically between dense and sparse storage.
+
+		In "auto" mode, a grid of at least `SPARSE_CELLS` cells goes sparse when its
+		fill ratio drops under `SPARSE_DENSITY[0]` and goes back dense when it rises
+		over `SPARSE_DENSITY[1]`. The gap between both thresholds is the hysteresis:
+		a conversion costs O(points) and can only happen again after the fill ratio
+		crossed the whole gap. A grid larger than `DENSE_LIMIT` cells is always sparse.
+		The dense cells of a grid of at least `BITS_CELLS` cells are packed into bits,
+		whose random draws don't need the 8 bytes per cell of the index pool.
+
+		Attributes:
+			x (int): Number of columns.
+			y (int): Number of rows.
+			mode (str): The storage mode, one of `BACKENDS`.
+
+		Private Attributes:
+			__store (DenseGrid | SparseGrid | BitGrid): The current storage.
+			__numpy (bool): Whether the dense storage is backed by NumPy.
+
+		Methods:
+			Same interface as `DenseGrid`, plus:
+
+			backend -> str:
+				Name of the current storage, "numpy", "bytearray", "sparse" or "bits".
+
+		Example:
+			>>> grid = Grid(10**6, 10**6)
+			>>> grid.backend
+			'sparse'
+
+	"""
+
+	def __init__(self, x: int, y: int, numpy: bool = NUMPY, mode: str = "auto", store: DenseGrid | SparseGrid | BitGrid = None):
+		if(mode not in BACKENDS):
+			raise(ValueError(f'Uknown backend "{mode}", expected {"|".join(BACKENDS)}'))
+
+		if((mode in ("dense", "bits")) and (int(x)*int(y) > DENSE_LIMIT*(8 if(mode == "bits") else 1))):
+			raise(ValueError(f"Too many cells for a {mode} matrix {x}x{y}"))
+
+		self.x		: int	= int(x)
+		self.y		: int	= int(y)
+		self.mode	: str	= str(mode)
+		self.__numpy: bool	= bool(numpy)
+
+		if(store is not None):
+			self.__store = store
+
+		elif((mode == "sparse") or ((mode == "auto") and (self.x*self.y >= SPARSE_CELLS))):
+			self.__store = SparseGrid(x, y)
+
+		else:
+			self.__store = self.__dense()
+
+	def __len__(self) -> int:
+		return(self.x*self.y)
+
+	@property
+	def backend(self) -> str:
+		return(self.__store.backend)
+
+	@property
+	def numpy(self) -> bool:
+		return(self.__store.numpy)
+
+	def __dense(self) -> DenseGrid | BitGrid:
+		""" Private method creating the dense storage of the mode """
+
+		if((self.mode == "bits") or ((self.mode == "auto") and (len(self) >= BITS_CELLS))):
+			return(BitGrid(self.x, self.y, self.__numpy))
+
+		return(DenseGrid(self.x, self.y, self.__numpy))
+
+	def __convert(self, store: DenseGrid | SparseGrid | BitGrid) -> None:
+		""" Private method to move the set cells into a new storage """
+
+		if(not isinstance(store, SparseGrid)):
+			store.setMany(self.__store.points())
+
+		else:
+			for index in self.__store.points():
+				store.set(index%self.x, index//self.x, 1)
+
+		self.__store = store
+
+	def __adapt(self) -> None:
+		""" Private method applying the density thresholds of the "auto" mode """
+
+		if((self.mode != "auto") or (len(self) < SPARSE_CELLS)):
+			return
+
+		__fill = self.__store.fill()
+
+		if(isinstance(self.__store, SparseGrid)):
+			if((__fill > SPARSE_DENSITY[1]) and (len(self) <= DENSE_LIMIT)):
+				self.__convert(self.__dense())
+
+		elif(__fill < SPARSE_DENSITY[0]):
+			self.__convert(SparseGrid(self.x, self.y))
+
+	def get(self, x: int, y: int) -> int:
+		return(self.__store.get(x, y))
+
+	def set(self, x: int, y: int, value: int = 1) -> int:
+		__previous = self.__store.set(x, y, value)
+
+		if(__previous != (1 if(value) else 0)):
+			self.__adapt()
+
+		return(__previous)
+
+	def row(self, y: int, start: int = 0, end: int = None) -> list[int]:
+		return(self.__store.row(y, start, end))
+
+	def rowSum(self, y: int) -> int:
+		return(self.__store.rowSum(y))
+
+	def colSum(self, x: int) -> int:
+		return(self.__store.colSum(x))
+
+	def rowSums(self) -> list[int]:
+		return(self.__store.rowSums())
+
+	def colSums(self) -> list[int]:
+		return(self.__store.colSums())
+
+	def blockSums(self, bx: int, by: int) -> list[list[int]]:
+		return(self.__store.blockSums(bx, by))
+
+	def total(self) -> int:
+		return(self.__store.total())
+
+	def fill(self) -> float:
+		return(self.__store.fill())
+
+	def recount(self) -> int:
+		return(self.__store.recount())
+
+	def randomPoint(self, value: int = 0, randbelow: Callable = randrange) -> tuple[int, int]:
+		return(self.__store.randomPoint(value, randbelow))
+
+	def points(self) -> Iterator[int]:
+		return(self.__store.points())
+
+	def buffer(self) -> memoryview:
+		return(self.__store.buffer())
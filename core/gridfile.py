@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Binary files of matrices.
+
+	This module saves the grids of the `Matrix` tool in a compact binary format and
+	maps them back into memory. A file is made of a fixed size header, the raw bytes
+	of the grid storage, then the row and column sums as 64 bits integers:
+
+	| Offset      | Content                                                                   |
+	| ----------- | ------------------------------------------------------------------------- |
+	| 0           | Header: magic, version, flags, dtype, x, y, total, iteration, iterations, mode |
+	| HEADER_SIZE | Cells: 1 byte per cell "u1", 8 cells per byte "bit", or sorted set indices "idx" |
+	| ...         | Row sums, then column sums                                                |
+
+	The results of the matrix arithmetic aren't binary, they are saved as matrices
+	of values, 64 bits integers "i8" or floats "f8" in row-major order, without the
+	counters. Any file can be read as a matrix of values.
+
+	Dense cells are not read on loading: the file is mapped with `numpy.memmap`, or
+	`mmap` without NumPy, and its pages are faulted in by the system when touched,
+	so a multi-Gb matrix opens instantly. A grid loaded writable is the mapping
+	itself, a checkpoint flushes its dirty pages and rewrites the counters and the
+	header, without copying the cells.
+
+	A file stays flagged dirty while it is mapped writable, its cells may then be
+	ahead of its counters (e.g. killed process), the counters of a dirty file are
+	rebuilt from the cells on loading.
+
+	The header keeps the storage mode of the grid, so a grid saved in "auto" mode
+	is loaded in "auto" mode and can still switch between its storages, e.g. a
+	sparse grid filling up goes back dense. The files of version 1 don't have it,
+	their sparse grids are loaded in "auto" mode.
+
+	Constants:
+	- MAGIC: Signature of the matrix files.
+	- VERSION: Version of the file format.
+	- HEADER: Binary layout of the header.
+	- HEADER_SIZE: Size of the header, the cells start on a page boundary.
+	- DTYPES: Format of the cells by storage backend.
+	- MODES: Storage mode of the files without one, by format of the cells.
+	- VALUE_DTYPES: Array codes of the matrices of values by format.
+
+"""
+
+from array import array
+from mmap import ACCESS_READ, ACCESS_WRITE, ALLOCATIONGRANULARITY, mmap
+from os import replace
+from os.path import abspath
+from struct import Struct
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+from core.grid import BACKENDS, NUMPY, BitGrid, DenseGrid, Grid, SparseGrid
+
+MAGIC : bytes = b"TMMX"
+""" Signature of the matrix files
+"""
+
+VERSION : int = 2
+""" Version of the file format
+"""
+
+HEADER : Struct = Struct("<4sHH4sQQQQQ8s")
+""" Binary layout of the header
+"""
+
+HEADER_SIZE : int = 4096
+""" Size of the header, the cells start on a page boundary
+"""
+
+DTYPES : dict[str, str] = dict({
+	"numpy": "u1",
+	"bytearray": "u1",
+	"bits": "bit",
+	"sparse": "idx"
+})
+""" Format of the cells by storage backend
+"""
+
+MODES : dict[str, str] = dict({
+	"u1": "dense",
+	"bit": "bits",
+	"idx": "auto"
+})
+""" Storage mode of the files without one, by format of the cells
+"""
+
+VALUE_DTYPES : dict[str, str] = dict({
+	"i8": "q",
+	"f8": "d"
+})
+""" Array codes of the matrices of values by format
+"""
+
+DIRTY : int = 1
+
+class GridFile:
+
+	""" Matrix file with its header, loaded as a memory-mapped grid.
+
+		Attributes:
+			path (str): Absolute path of the file.
+			header (dict): The last header read or written.
+
+		Private Attributes:
+			__grid (Grid | None): The grid loaded writable from the file.
+			__map (numpy.memmap | mmap | None): The mapping of the cells of `__grid`.
+
+		Methods:
+
+			read() -> dict:
+				Reads and checks the header of the file.
+
+			load(writable: bool = False) -> Grid:
+				Maps the file and returns its grid.
+
+			save(grid: Grid, iteration: int = 0, iterations: int = 0) -> int:
+				Writes a grid, or checkpoints the loaded one, and returns the size of the file.
+
+			values() -> numpy.ndarray | list[list[int | float]]:
+				Reads the file as a matrix of values.
+
+			saveValues(values: numpy.ndarray | list[list[int | float]]) -> int:
+				Writes a matrix of values and returns the size of the file.
+
+			close() -> None:
+				Checkpoints and unmaps the grid loaded writable.
+
+		Example:
+			>>> with GridFile("matrix.tmmx") as file:
+			...     grid = file.load(True)
+			...     grid.set(0, 0)
+			...     file.save(grid, 1, 3)
+
+	"""
+
+	def __init__(self, path: str):
+		self.path	: str	= str(abspath(path))
+		self.header	: dict	= dict({})
+		self.__grid			= None
+		self.__map			= None
+
+	def __enter__(self):
+		return(self)
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __size(self, dtype: str, x: int, y: int, total: int) -> int:
+		""" Private method computing the size in bytes of the cells """
+
+		return(dict({ "u1": x*y, "bit": ((x+7)//8)*y, "idx": 8*total, "i8": 8*x*y, "f8": 8*x*y })[dtype])
+
+	def __pack(self, dtype: str, x: int, y: int, total: int, flags: int = 0, iteration: int = 0, iterations: int = 0, mode: str = "") -> bytes:
+		self.header = dict({
+			"version": VERSION,
+			"dirty": bool(flags & DIRTY),
+			"dtype": dtype,
+			"x": x,
+			"y": y,
+			"total": total,
+			"iteration": int(iteration),
+			"iterations": int(iterations),
+			"mode": mode or MODES.get(dtype, "")
+		})
+
+		return(HEADER.pack(MAGIC, VERSION, flags, dtype.encode(), x, y, total, int(iteration), int(iterations), mode.encode()).ljust(HEADER_SIZE, b"\0"))
+
+	def __header(self, grid: Grid, flags: int, iteration: int, iterations: int) -> bytes:
+		return(self.__pack(DTYPES[grid.backend], grid.x, grid.y, grid.total(), flags, iteration, iterations, grid.mode))
+
+	def __counters(self, grid: Grid) -> bytes:
+		return(array("q", grid.rowSums()).tobytes()+array("q", grid.colSums()).tobytes())
+
+	def __mapCells(self, size: int, shape: tuple[int, int], writable: bool):
+		""" Private method mapping the cells of the file without reading them
+
+			Without NumPy, `mmap` needs an offset aligned on the allocation granularity
+			of the system (64 Kb on Windows), the cells are read otherwise.
+
+		"""
+
+		if(NUMPY):
+			return(np.memmap(self.path, dtype=np.uint8, mode="r+" if(writable) else "r", offset=HEADER_SIZE, shape=shape))
+
+		with open(self.path, "r+b" if(writable) else "rb") as file:
+			if(HEADER_SIZE%ALLOCATIONGRANULARITY):
+				file.seek(HEADER_SIZE)
+				return(bytearray(file.read(size)))
+
+			return(mmap(file.fileno(), size, access=ACCESS_WRITE if(writable) else ACCESS_READ, offset=HEADER_SIZE))
+
+	def read(self) -> dict:
+		""" Read and check the header of the file
+
+			Returns:
+				dict: the header fields
+
+			Raise a ValueError if the file isn't a matrix file of a supported version
+
+		"""
+
+		with open(self.path, "rb") as file:
+			__data = file.read(HEADER.size)
+
+		if((len(__data) < HEADER.size) or (__data[0:4] != MAGIC)):
+			raise(ValueError(f'"{self.path}" is not a matrix file'))
+
+		_, __version, __flags, __dtype, x, y, __total, __iteration, __iterations, __mode = HEADER.unpack(__data)
+
+		if(__version > VERSION):
+			raise(ValueError(f'"{self.path}" has an unsupported version {__version}'))
+
+		__dtype	= __dtype.rstrip(b"\0").decode()
+		__mode	= __mode.rstrip(b"\0").decode() or MODES.get(__dtype, "")
+
+		if(__mode and (__mode not in BACKENDS)):
+			raise(ValueError(f'"{self.path}" has an unknown storage mode "{__mode}"'))
+
+		self.header = dict({
+			"version": __version,
+			"dirty": bool(__flags & DIRTY),
+			"dtype": __dtype,
+			"x": x,
+			"y": y,
+			"total": __total,
+			"iteration": __iteration,
+			"iterations": __iterations,
+			"mode": __mode
+		})
+
+		return(self.header)
+
+	def load(self, writable: bool = False) -> Grid:
+		""" Map the file and return its grid
+
+			Args:
+				writable (bool, optional): True to write the changes of the grid into the file. Defaults to False.
+
+			Returns:
+				Grid: the grid in the mode it was saved with, dense storages are backed by the mapping
+
+		"""
+
+		__header	= self.read()
+		x, y		= __header["x"], __header["y"]
+		__size		= self.__size(__header["dtype"], x, y, __header["total"])
+
+		if(__header["dtype"] in VALUE_DTYPES):
+			raise(ValueError(f'"{self.path}" holds a matrix of values, not a binary matrix'))
+
+		if(__header["dtype"] == "idx"):
+			__indices = array("q")
+
+			with open(self.path, "rb") as file:
+				file.seek(HEADER_SIZE)
+				__indices.frombytes(file.read(__size))
+
+			__store = SparseGrid(x, y)
+			for index in __indices:
+				__store.set(index%x, index//x, 1)
+
+			__grid = Grid(x, y, NUMPY, __header["mode"], __store)
+
+		else:
+			__stride	= x if(__header["dtype"] == "u1") else (x+7)//8
+			__cells		= self.__mapCells(__size, (y, __stride), writable)
+			__counters	= None
+
+			if(not __header["dirty"]):
+				__counts	= array("q")
+
+				with open(self.path, "rb") as file:
+					file.seek(HEADER_SIZE+__size)
+					__counts.frombytes(file.read(8*(x+y)))
+
+				__counters = (__counts[0:y], __counts[y:y+x])
+
+			__store	= (DenseGrid if(__header["dtype"] == "u1") else BitGrid)(x, y, NUMPY, __cells, __counters)
+			__grid	= Grid(x, y, NUMPY, __header["mode"], __store)
+
+			if(writable and not isinstance(__cells, bytearray)):
+				self.__grid, self.__map = __grid, __cells
+
+				with open(self.path, "r+b") as file:
+					file.write(self.__header(__grid, DIRTY, __header["iteration"], __header["iterations"]))
+
+		return(__grid)
+
+	def save(self, grid: Grid, iteration: int = 0, iterations: int = 0) -> int:
+		""" Write a grid into the file
+
+			The grid loaded writable is checkpointed in place, the other grids are
+			written into a temporary file then moved over the file, so a crash never
+			leaves a half written matrix. A grid loaded writable whose "auto" mode
+			changed its storage is no longer backed by the mapping, it is rewritten
+			and unmapped.
+
+			Args:
+				grid (Grid): the grid to save
+				iteration (int, optional): the current iteration of the simulation. Defaults to 0.
+				iterations (int, optional): the number of iterations of the simulation. Defaults to 0.
+
+			Returns:
+				int: the size of the file in bytes
+
+		"""
+
+		__size = self.__size(DTYPES[grid.backend], grid.x, grid.y, grid.total())
+
+		if((grid is self.__grid) and (DTYPES[grid.backend] != self.header["dtype"])):
+			self.__grid, self.__map = None, None
+
+		if((grid is self.__grid) and (self.__map is not None)):
+			self.__map.flush()
+
+			with open(self.path, "r+b") as file:
+				file.seek(HEADER_SIZE+__size)
+				file.write(self.__counters(grid))
+				file.seek(0)
+				file.write(self.__header(grid, DIRTY, iteration, iterations))
+
+		else:
+			with open(f"{self.path}.tmp", "wb") as file:
+				file.write(self.__header(grid, 0, iteration, iterations))
+				file.write(grid.buffer())
+
+				if(grid.backend != "sparse"):
+					file.write(self.__counters(grid))
+
+			replace(f"{self.path}.tmp", self.path)
+
+		return(HEADER_SIZE+__size+(0 if(grid.backend == "sparse") else 8*(grid.x+grid.y)))
+
+	def values(self):
+		""" Read the file as a matrix of values
+
+			Dense files are mapped as with `load()`, bits are unpacked by NumPy.
+
+			Returns:
+				numpy.ndarray | list[list[int | float]]: a `(y, x)` array with NumPy, the list of the rows otherwise
+
+		"""
+
+		__header	= self.read()
+		x, y		= __header["x"], __header["y"]
+
+		if(__header["dtype"] in VALUE_DTYPES):
+			if(NUMPY):
+				return(np.memmap(self.path, dtype=f"<{__header['dtype']}", mode="r", offset=HEADER_SIZE, shape=(y, x)))
+
+			__values = array(VALUE_DTYPES[__header["dtype"]])
+
+			with open(self.path, "rb") as file:
+				file.seek(HEADER_SIZE)
+				__values.frombytes(file.read(8*x*y))
+
+			return(list[list]([ __values[i*x:(i+1)*x].tolist() for i in range(0, y) ]))
+
+		if(NUMPY and (__header["dtype"] != "idx")):
+			__cells = self.__mapCells(self.__size(__header["dtype"], x, y, 0), (y, x if(__header["dtype"] == "u1") else (x+7)//8), False)
+
+			return(__cells if(__header["dtype"] == "u1") else np.unpackbits(__cells, axis=1, count=x, bitorder="little"))
+
+		__grid = self.load()
+
+		if(NUMPY):
+			__values = np.zeros((y, x), dtype=np.uint8)
+			__values.reshape(-1)[np.fromiter(__grid.points(), dtype=np.int64)] = 1
+
+			return(__values)
+
+		return(list[list]([ __grid.row(i) for i in range(0, y) ]))
+
+	def saveValues(self, values) -> int:
+		""" Write a matrix of values, as integers or as floats if any value is a float
+
+			Args:
+				values (numpy.ndarray | list[list[int | float]]): the rows of the matrix
+
+			Returns:
+				int: the size of the file in bytes
+
+		"""
+
+		y, x = len(values), len(values[0])
+
+		if(NUMPY and isinstance(values, np.ndarray)):
+			__dtype = "f8" if(values.dtype.kind == "f") else "i8"
+			__data	= np.ascontiguousarray(values, dtype=f"<{__dtype}")
+			__total	= int(np.count_nonzero(__data))
+
+		else:
+			__dtype = "f8" if(any([ isinstance(v, float) for row in values for v in row ])) else "i8"
+			__data	= array(VALUE_DTYPES[__dtype], [ v for row in values for v in row ])
+			__total	= int(sum([ 1 for v in __data if(v) ]))
+
+		with open(f"{self.path}.tmp", "wb") as file:
+			file.write(self.__pack(__dtype, x, y, __total))
+			file.write(memoryview(__data).cast("B"))
+
+		replace(f"{self.path}.tmp", self.path)
+
+		return(HEADER_SIZE+8*x*y)
+
+	def close(self) -> None:
+		""" Checkpoint and unmap the grid loaded writable, then clear its dirty flag """
+
+		if(self.__map is None):
+			return
+
+		self.save(self.__grid, self.header["iteration"], self.header["iterations"])
+
+		with open(self.path, "r+b") as file:
+			file.write(self.__header(self.__grid, 0, self.header["iteration"], self.header["iterations"]))
+
+		self.__grid, self.__map = None, None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Run history and duration statistics of the schedules of the `Shell` tool.
+
+	Each run of a schedule is appended as one JSON line to the log of the schedule,
+	with its start time, its duration and, for each command, its start time, its
+	duration, its exit code and its status. A line is only appended, never
+	rewritten, so a log grows with the runs without reading it back, and a line
+	cut by a crash is ignored when reading.
+
+	The statistics of a command are computed on the durations of its successful
+	runs. The 95th percentile is the nearest rank, a duration actually measured.
+	The last duration is a regression when it exceeds the median of the previous
+	runs, over a rolling window, by both a ratio and a minimum slowdown, so the
+	jitter of the fast commands isn't flagged.
+
+	Constants:
+	- HISTORY_WINDOW: Number of previous runs of the rolling median.
+	- REGRESSION_RATIO: Ratio of the rolling median from which a duration is a regression.
+	- REGRESSION_DELAY: Minimum slowdown in seconds of a regression.
+
+"""
+
+from json import dumps, loads
+from math import ceil
+from os import makedirs
+from os.path import dirname
+from statistics import median
+
+HISTORY_WINDOW : int = 20
+""" Number of previous runs of the rolling median
+"""
+
+REGRESSION_RATIO : float = 1.5
+""" Ratio of the rolling median from which a duration is a regression
+"""
+
+REGRESSION_DELAY : float = .1
+""" Minimum slowdown in seconds of a regression
+"""
+
+class RunLog:
+
+	""" JSON lines log of the runs of a schedule.
+
+		Attributes:
+			path (str): Path of the log, `.jsonl`.
+
+		Methods:
+
+			append(run: dict) -> None:
+				Appends a run as a line.
+
+			runs() -> list[dict]:
+				Reads the runs, the oldest first.
+
+			stats(window: int = HISTORY_WINDOW) -> list[dict]:
+				Returns the duration statistics of each command, in the order of the last run.
+
+		Example:
+			>>> log = RunLog("Shell/Logs/build.jsonl")
+			>>> log.append({ "start": "2025-01-06T09:00:00", "duration": 1.2, "commands": [
+			...     { "id": "0", "cmd": "make", "start": "2025-01-06T09:00:00", "duration": 1.2, "code": 0, "status": "done" }
+			... ] })
+			>>> log.stats()[0]["p50"]
+			1.2
+
+	"""
+
+	def __init__(self, path: str):
+		self.path : str = str(path)
+
+	def append(self, run: dict) -> None:
+		makedirs(dirname(self.path) or ".", exist_ok=True)
+
+		with open(self.path, "a", encoding="utf-8") as log:
+			log.write(f"{dumps(run)}\n")
+
+	def runs(self) -> list[dict]:
+		__runs = list[dict]([])
+
+		try:
+			with open(self.path, "r", encoding="utf-8") as log:
+				for line in log:
+					try:
+						__runs.append(dict(loads(line)))
+
+					except(ValueError):
+						continue
+
+		except(FileNotFoundError):
+			pass
+
+		return(__runs)
+
+	def stats(self, window: int = HISTORY_WINDOW) -> list[dict]:
+		""" Compute the duration statistics of each command
+
+			Args:
+				window (int, optional): the number of previous runs of the rolling median. Defaults to HISTORY_WINDOW.
+
+			Returns:
+				list[dict]: by command, its "id" and "cmd", its number of "runs" and "failed" runs, the
+				"p50" and "p95" of its durations, its "last" duration, the rolling "median" of the
+				previous ones and whether the last one is a "regression", None without a duration
+
+		"""
+
+		__runs		= self.runs()
+		__order		= list[str]([])
+		__commands	= dict[str, dict]({})
+
+		for run in __runs:
+			for command in run.get("commands", []):
+				__command = __commands.setdefault(command["id"], dict({ "id": command["id"], "runs": 0, "failed": 0, "durations": [] }))
+				__command["cmd"] = command["cmd"]
+
+				if(command["status"] in ("done", "failed", "expired")):
+					__command["runs"] += 1
+
+				if(command["status"] == "done"):
+					__command["durations"].append(float(command["duration"]))
+
+				elif(command["status"] in ("failed", "expired")):
+					__command["failed"] += 1
+
+		for command in (__runs[-1].get("commands", []) if(__runs) else []):
+			__order.append(command["id"])
+
+		__order += [ key for key in __commands if(key not in __order) ]
+
+		__stats = list[dict]([])
+		for key in __order:
+			__command	= __commands[key]
+			__durations	= __command.pop("durations")
+			__sorted	= sorted(__durations)
+			__previous	= __durations[-window-1:-1]
+			__last		= __durations[-1] if(__durations) else None
+			__median	= median(__previous) if(__previous) else None
+
+			__stats.append(dict(__command, **{
+				"p50": median(__sorted) if(__sorted) else None,
+				"p95": __sorted[ceil(.95*len(__sorted))-1] if(__sorted) else None,
+				"last": __last,
+				"median": __median,
+				"regression": bool((__median is not None) and (__last > __median*REGRESSION_RATIO) and (__last-__median > REGRESSION_DELAY))
+			}))
+
+		return(__stats)
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Persistent job queue for tool invocations.
+
+	This module stores tool invocations (e.g. `tr -t <project>`, `wb -n <image>`) in a
+	local SQLite database so they survive the exit of the main program. One or more
+	worker processes drain the queue with claim/lease semantics: a claimed job is
+	leased for a limited time and renewed while it runs, a job whose lease expired
+	(e.g. killed worker) is claimed again by another worker. Failed jobs are retried
+	with a linear backoff until their attempts are exhausted.
+
+	A job fails when its tool reports a failure through its `status`, e.g. a shell
+	command exiting with a non-zero code. A worker whose lease can't be renewed
+	(e.g. the job was claimed again after a long pause) abandons the job: its
+	result is dropped, the job belongs to the worker that claimed it again.
+
+	Constants:
+	- JOBS_PATH: Absolute path of the SQLite database file, in the project directory.
+	- JOB_STATUS: Possible states of a job, including "pending", "running", "done", "failed".
+
+"""
+
+from contextlib import redirect_stdout
+from io import StringIO
+from json import dumps, loads
+from os import getpid
+from os.path import abspath, dirname
+from socket import gethostname
+from threading import Event, Thread
+from time import sleep, time
+from traceback import format_exc
+
+import sqlite3
+import sys
+
+from core.colors import Colors
+from core.icons import Icons
+from core.tool import Tool
+
+JOBS_PATH : str = abspath(f"{dirname(abspath(__file__))}/../jobs.db")
+""" Absolute path of the SQLite database file, in the project directory
+"""
+
+JOB_STATUS : tuple[str] = ("pending", "running", "done", "failed")
+""" Possible states of a job, including "pending", "running", "done", "failed"
+"""
+
+JOBS_SCHEMA = str("""
+	CREATE TABLE IF NOT EXISTS jobs (
+		id			INTEGER PRIMARY KEY AUTOINCREMENT,
+		command		TEXT NOT NULL,
+		status		TEXT NOT NULL DEFAULT 'pending',
+		attempts	INTEGER NOT NULL DEFAULT 0,
+		retries		INTEGER NOT NULL DEFAULT 3,
+		worker		TEXT,
+		lease		REAL,
+		available	REAL NOT NULL,
+		created		REAL NOT NULL,
+		started		REAL,
+		finished	REAL,
+		result		TEXT,
+		error		TEXT
+	);
+	CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available);
+""")
+
+class JobQueue:
+
+	""" SQLite-backed durable queue of tool invocations.
+
+		Private Attributes:
+			__path (str): Path of the SQLite database file.
+			__db (sqlite3.Connection): Connection in autocommit mode, transactions are explicit.
+
+		Methods:
+
+			enqueue(command: list[str], retries: int = 3) -> int:
+				Adds a tool invocation to the queue and returns the job id.
+
+			claim(worker: str, lease: float = 60) -> dict | None:
+				Leases the next available job to a worker.
+
+			renew(job: int, worker: str, lease: float = 60) -> bool:
+				Extends the lease of a running job.
+
+			complete(job: int, worker: str, result: str) -> bool:
+				Stores the result of a succeeded job.
+
+			fail(job: int, worker: str, error: str, backoff: float = 5) -> bool:
+				Reschedules a failed job or marks it as failed when no attempt is left.
+
+			release(job: int, worker: str) -> bool:
+				Gives back a claimed job to the queue without consuming an attempt.
+
+			jobs(limit: int = 20) -> list[dict]:
+				Returns the latest jobs.
+
+	"""
+
+	def __init__(self, path: str = JOBS_PATH):
+		self.__path	= str(path)
+		self.__db	= sqlite3.connect(self.__path, timeout=30, isolation_level=None)
+		self.__db.row_factory = sqlite3.Row
+		self.__db.execute("PRAGMA journal_mode=WAL")
+		self.__db.executescript(JOBS_SCHEMA)
+
+	def __enter__(self):
+		return(self)
+
+	def __exit__(self, *_) -> None:
+		self.close()
+
+	def __job(self, row: sqlite3.Row) -> dict:
+		""" Private method to convert a database row into a job dict
+
+			Args:
+				row (sqlite3.Row): the row to convert
+
+			Returns:
+				dict: the job with its command decoded
+
+		"""
+
+		__job = dict(row)
+		__job["command"] = list[str](loads(__job["command"]))
+
+		return(__job)
+
+	def close(self) -> None:
+		self.__db.close()
+
+	def enqueue(self, command: list[str], retries: int = 3) -> int:
+		""" Add a tool invocation to the queue
+
+			Args:
+				command (list[str]): the tool command and its arguments, e.g. ["tr", "-t", "project"]
+				retries (int, optional): the maximum number of attempts. Defaults to 3.
+
+			Returns:
+				int: the id of the new job
+
+		"""
+
+		__now = time()
+		__cursor = self.__db.execute(
+			"INSERT INTO jobs (command, retries, available, created) VALUES (?, ?, ?, ?)",
+			(dumps(command), max(1, int(retries)), __now, __now)
+		)
+
+		return(int(__cursor.lastrowid))
+
+	def claim(self, worker: str, lease: float = 60) -> dict | None:
+		""" Lease the next available job to a worker
+
+			Pending jobs are claimed in creation order, running jobs whose lease
+			expired are claimed again if they still have attempts left, otherwise
+			they are marked as failed.
+
+			Args:
+				worker (str): the identifier of the claiming worker
+				lease (float, optional): the lease duration in seconds. Defaults to 60.
+
+			Returns:
+				dict | None: the claimed job, None if the queue is empty
+
+		"""
+
+		__now = time()
+
+		self.__db.execute("BEGIN IMMEDIATE")
+		try:
+			self.__db.execute(
+				"UPDATE jobs SET status = 'failed', finished = ?, error = 'Lease expired' WHERE status = 'running' AND lease < ? AND attempts >= retries",
+				(__now, __now)
+			)
+
+			__row = self.__db.execute(
+				"SELECT id FROM jobs WHERE (status = 'pending' AND available <= ?) OR (status = 'running' AND lease < ?) ORDER BY id LIMIT 1",
+				(__now, __now)
+			).fetchone()
+
+			if(__row is None):
+				self.__db.execute("COMMIT")
+				return(None)
+
+			self.__db.execute(
+				"UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, lease = ?, started = ? WHERE id = ?",
+				(worker, __now+lease, __now, __row["id"])
+			)
+
+			__job = self.__db.execute("SELECT * FROM jobs WHERE id = ?", (__row["id"], )).fetchone()
+			self.__db.execute("COMMIT")
+
+		except(Exception):
+			self.__db.execute("ROLLBACK")
+			raise
+
+		return(self.__job(__job))
+
+	def renew(self, job: int, worker: str, lease: float = 60) -> bool:
+		""" Extend the lease of a running job owned by a worker
+
+			Returns:
+				bool: True if the lease was extended, False if the job was lost
+
+		"""
+
+		__cursor = self.__db.execute(
+			"UPDATE jobs SET lease = ? WHERE id = ? AND worker = ? AND status = 'running'",
+			(time()+lease, job, worker)
+		)
+
+		return(bool(__cursor.rowcount))
+
+	def complete(self, job: int, worker: str, result: str) -> bool:
+		""" Store the result of a succeeded job
+
+			Returns:
+				bool: True if the job was completed, False if the job was lost
+
+		"""
+
+		__cursor = self.__db.execute(
+			"UPDATE jobs SET status = 'done', finished = ?, result = ?, error = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+			(time(), result, job, worker)
+		)
+
+		return(bool(__cursor.rowcount))
+
+	def fail(self, job: int, worker: str, error: str, backoff: float = 5) -> bool:
+		""" Reschedule a failed job, or mark it as failed when no attempt is left
+
+			Args:
+				job (int): the job id
+				worker (str): the identifier of the worker owning the job
+				error (str): the error message to store
+				backoff (float, optional): delay in seconds multiplied by the attempts before the retry. Defaults to 5.
+
+			Returns:
+				bool: True if the job was updated, False if the job was lost
+
+		"""
+
+		__now = time()
+		__cursor = self.__db.execute(
+			"""UPDATE jobs SET
+				status = CASE WHEN attempts < retries THEN 'pending' ELSE 'failed' END,
+				available = ? + ? * attempts,
+				finished = CASE WHEN attempts < retries THEN NULL ELSE ? END,
+				lease = NULL,
+				error = ?
+			WHERE id = ? AND worker = ? AND status = 'running'""",
+			(__now, backoff, __now, error, job, worker)
+		)
+
+		return(bool(__cursor.rowcount))
+
+	def release(self, job: int, worker: str) -> bool:
+		""" Give back a claimed job to the queue without consuming an attempt
+
+			Returns:
+				bool: True if the job was released, False if the job was lost
+
+		"""
+
+		__cursor = self.__db.execute(
+			"UPDATE jobs SET status = 'pending', attempts = attempts - 1, lease = NULL, worker = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+			(job, worker)
+		)
+
+		return(bool(__cursor.rowcount))
+
+	def job(self, job: int) -> dict | None:
+		__row = self.__db.execute("SELECT * FROM jobs WHERE id = ?", (job, )).fetchone()
+
+		return(self.__job(__row) if(__row) else None)
+
+	def jobs(self, limit: int = 20) -> list[dict]:
+		__rows = self.__db.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit, )).fetchall()
+
+		return(list[dict]([ self.__job(r) for r in reversed(__rows) ]))
+
+class Worker:
+
+	""" Queue consumer running tool invocations in the current process.
+
+		Tools are started headless: the standard input is closed, so a tool asking
+		a question fails instead of blocking the worker (use `-f` like options to
+		run them unattended). The tool output is captured and stored as job result.
+
+		Attributes:
+			name (str): Worker identifier, e.g. "<hostname>:<pid>".
+
+		Private Attributes:
+			__tools (tuple[Tool]): The tools registry used to resolve the job commands.
+			__lease (float): Lease duration in seconds, renewed on a third of its duration.
+			__poll (float): Delay in seconds between two claims on an empty queue.
+
+	"""
+
+	def __init__(self, tools: tuple[Tool], path: str = JOBS_PATH, lease: float = 60, poll: float = 1):
+		self.name		: str			= f"{gethostname()}:{getpid()}"
+		self.__tools	: tuple[Tool]	= tools
+		self.__path		: str			= str(path)
+		self.__lease	: float			= float(lease)
+		self.__poll		: float			= float(poll)
+
+	def __heartbeat(self, job: int, stop: Event, lost: Event) -> None:
+		""" Private method renewing the lease of a job until stopped, or until the job is lost
+
+			A dedicated connection is used since SQLite connections can't be
+			shared between threads.
+
+		"""
+
+		with JobQueue(self.__path) as __queue:
+			while(not stop.wait(self.__lease/3)):
+				if(not __queue.renew(job, self.name, self.__lease)):
+					lost.set()
+					return
+
+	def __execute(self, command: list[str]) -> str:
+		""" Private method to run a tool command and capture its output
+
+			Args:
+				command (list[str]): the tool command and its arguments
+
+			Returns:
+				str: the captured output of the tool
+
+			Raise a LookupError if no tool matches the command, a RuntimeError
+			with the output if the tool reported a failure through its status
+
+		"""
+
+		for tool in self.__tools:
+			if(command[0] in tool.command[0]):
+				__output	= StringIO()
+				__stdin		= sys.stdin
+				sys.stdin	= StringIO()
+
+				try:
+					with redirect_stdout(__output):
+						__status = tool(command).status
+
+				finally:
+					sys.stdin = __stdin
+
+				if(not __status):
+					raise(RuntimeError(__output.getvalue()))
+
+				return(__output.getvalue())
+
+		raise(LookupError(f'Uknown tool "{command[0]}"'))
+
+	def run(self, once: bool = False) -> bool:
+		""" Drain the queue until interrupted
+
+			Args:
+				once (bool, optional): stop when the queue is empty. Defaults to False.
+
+			Returns:
+				bool: True value when exiting
+
+		"""
+
+		print(f"{Icons.info}Worker {self.name} waiting for jobs on {self.__path}")
+
+		with JobQueue(self.__path) as __queue:
+			while(True):
+				__job = None
+
+				try:
+					__job = __queue.claim(self.name, self.__lease)
+
+					if(__job is None):
+						if(once):
+							break
+
+						sleep(self.__poll)
+						continue
+
+					__command	= " ".join(__job["command"])
+					__stop		= Event()
+					__lost		= Event()
+					__beat		= Thread(target=self.__heartbeat, args=(__job["id"], __stop, __lost), daemon=True)
+
+					print(f'{Icons.play}Job #{__job["id"]} "{__command}" [ attempt {__job["attempts"]}/{__job["retries"]} ]')
+					__beat.start()
+
+					try:
+						__result = self.__execute(__job["command"])
+
+						if(__lost.is_set() or not __queue.complete(__job["id"], self.name, __result)):
+							print(f'{Icons.warn}Job #{__job["id"]} lost its lease, result dropped')
+
+						else:
+							print(f'{Icons.info}Job #{__job["id"]} [ {Colors.green}DONE{Colors.end} ]')
+
+					except(KeyboardInterrupt):
+						raise
+
+					except(Exception):
+						if(__lost.is_set() or not __queue.fail(__job["id"], self.name, format_exc())):
+							print(f'{Icons.warn}Job #{__job["id"]} lost its lease, failure dropped')
+
+						else:
+							print(f'{Icons.warn}Job #{__job["id"]} [ {Colors.red}FAILED{Colors.end} ]')
+
+					finally:
+						__stop.set()
+						__beat.join()
+
+				except(KeyboardInterrupt):
+					if(__job is not None):
+						__queue.release(__job["id"], self.name)
+						print(f'\n{Icons.info}Job #{__job["id"]} released to the queue')
+
+					break
+
+		return(True)
+
+def listJobs(path: str = JOBS_PATH, job: int = None, limit: int = 20) -> list[dict]:
+	""" Interface to display the status of the queued jobs
+
+		Args:
+			path (str, optional): the SQLite database file. Defaults to JOBS_PATH.
+			job (int, optional): a job id to display with its result. Defaults to None.
+			limit (int, optional): the number of latest jobs to display. Defaults to 20.
+
+		Returns:
+			list[dict]: the displayed jobs
+
+	"""
+
+	__colors = dict[str, str]({
+		"pending": Colors.yellow,
+		"running": Colors.cyan,
+		"done": Colors.green,
+		"failed": Colors.red
+	})
+
+	with JobQueue(path) as __queue:
+		if(job is not None):
+			__job = __queue.job(int(job))
+
+			if(__job is None):
+				print(f"{Icons.warn}Job #{job} doesn't exist")
+				return(list[dict]([]))
+
+			print("\n".join([
+				f" Job #{__job['id']}: {' '.join(__job['command'])}",
+				f" Status: {__colors[__job['status']]}{__job['status']}{Colors.end} ({__job['attempts']}/{__job['retries']} attempts)",
+				f" Worker: {__job['worker'] or '-'}",
+				"",
+				__job["error"] if(__job["status"] == "failed") else (__job["result"] or "")
+			]))
+
+			return(list[dict]([ __job ]))
+
+		__jobs = __queue.jobs(limit)
+
+	table = list[str]([ f" *  Id{' '*(8-len('Id'))}Status{' '*(10-len('Status'))}Tries{' '*(7-len('Tries'))}Duration{' '*(10-len('Duration'))}Command" ])
+	for i, job in enumerate(__jobs, start=1):
+		__tries		= f"{job['attempts']}/{job['retries']}"
+		__duration	= f"{round(job['finished']-job['started'], 2)}s" if(job["finished"] and job["started"]) else "-"
+
+		table.append("".join([
+			f"{' '*(2-len(str(i)))}{Colors.green}{i}{Colors.end}.",
+			f"{' '*1}{job['id']}",
+			f"{' '*(8-len(str(job['id'])))}{__colors[job['status']]}{job['status']}{Colors.end}",
+			f"{' '*(10-len(job['status']))}{__tries}",
+			f"{' '*(7-len(__tries))}{Colors.purple}{__duration}{Colors.end}",
+			f"{' '*(10-len(__duration))}{Colors.cyan}{' '.join(job['command'])}{Colors.end}"
+		]))
+
+	_ = "\n".join([ f" {t}" for t in table ])
+	print(f"\n{_}", end="\n"*2)
+
+	return(__jobs)
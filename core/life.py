@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Cellular automaton stepping on binary grids.
+
+	This module runs life-like automata (Conway's "B3/S23" by default) on the grids
+	of the `Matrix` tool, in place of their cells. The neighbour counts are never
+	computed cell by cell:
+
+	- NumPy grids sum the 8 shifted slices of the zero-padded (or wrapped) cells,
+	  then map each `count + 9*cell` to the next state through a lookup table.
+	- Other grids hold each row as a Python int, bit i being the cell i, and add
+	  the 8 shifted neighbour rows with bitwise full adders into 4 bit-planes: a
+	  whole row of cells is counted with a few big-int operations.
+
+	Large grids can be split into tiles of rows stepped by a pool of processes. With
+	NumPy, the cells are double-buffered in shared memory, see `core.tiles`, and
+	each tile reads the halo rows of its neighbours in place. Without NumPy, bands
+	of row ints are sent to the processes with a halo of one row above and below.
+
+	Constants:
+	- RULE: The default rule, Conway's game of life.
+
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+from core.grid import Grid
+from core.tiles import TilePool, attach
+
+RULE : str = "B3/S23"
+""" The default rule, Conway's game of life
+"""
+
+CELLS_TO_DIGITS = bytes([ 48+min(i, 1) for i in range(0, 256) ])
+DIGITS_TO_CELLS = bytes([ 1 if(i == 49) else 0 for i in range(0, 256) ])
+
+def parseRule(rule: str) -> tuple[frozenset[int], frozenset[int]]:
+	""" Parse a rule in the B/S notation, e.g. "B36/S23"
+
+		Returns:
+			tuple[frozenset[int], frozenset[int]]: the neighbour counts giving birth and survival
+
+	"""
+
+	try:
+		__birth, __survive = str(rule).upper().split("/")
+
+		if((__birth[0] != "B") or (__survive[0] != "S")):
+			raise(ValueError)
+
+		__counts = (frozenset([ int(c) for c in __birth[1:] ]), frozenset([ int(c) for c in __survive[1:] ]))
+
+		if(any([ c > 8 for c in __counts[0] | __counts[1] ])):
+			raise(ValueError)
+
+	except(ValueError, IndexError):
+		raise(ValueError(f'Invalid rule "{rule}", expected e.g. "B3/S23"'))
+
+	return(__counts)
+
+def stepArray(cells, birth: frozenset[int], survive: frozenset[int], wrap: bool = False, halo: bool = False):
+	""" Compute the next generation of a `(y, x)` uint8 array
+
+		Args:
+			cells (numpy.ndarray): the cells
+			birth (frozenset[int]): the neighbour counts giving birth
+			survive (frozenset[int]): the neighbour counts keeping a cell alive
+			wrap (bool, optional): True for a torus, dead borders otherwise. Defaults to False.
+			halo (bool, optional): True if the first and last rows are neighbours only, from another band. Defaults to False.
+
+		Returns:
+			numpy.ndarray: the next generation, without the halo rows
+
+	"""
+
+	__table = np.zeros(18, dtype=np.uint8)
+	__table[list(birth)]				= 1
+	__table[[ 9+c for c in survive ]]	= 1
+
+	if(halo):
+		__padded = np.pad(cells, ((0, 0), (1, 1)), mode="wrap" if(wrap) else "constant")
+		cells = cells[1:-1]
+
+	else:
+		__padded = np.pad(cells, 1, mode="wrap" if(wrap) else "constant")
+
+	y, x		= cells.shape
+	__counts	= 9*cells
+
+	for i in range(0, 3):
+		for j in range(0, 3):
+			if((i, j) != (1, 1)):
+				__counts = __counts+__padded[i:i+y, j:j+x]
+
+	return(__table[__counts])
+
+def stepRows(rows: list[int], x: int, birth: frozenset[int], survive: frozenset[int], wrap: bool = False, halo: bool = False) -> list[int]:
+	""" Compute the next generation of rows held as ints, bit i being the cell i
+
+		Same arguments as `stepArray`, the rows replacing the array.
+
+		Returns:
+			list[int]: the next generation, without the halo rows
+
+	"""
+
+	__mask = (1 << x)-1
+
+	def __shift(row: int, left: bool) -> int:
+		if(wrap):
+			return(((row << 1) | (row >> (x-1))) & __mask if(left) else (row >> 1) | ((row & 1) << (x-1)))
+
+		return((row << 1) & __mask if(left) else row >> 1)
+
+	def __equals(planes: list[int], count: int) -> int:
+		__bits = __mask
+
+		for k in range(0, 4):
+			__bits &= planes[k] if((count >> k) & 1) else ~planes[k]
+
+		return(__bits)
+
+	__first, __last = (1, len(rows)-1) if(halo) else (0, len(rows))
+	__next = list[int]([])
+
+	for i in range(__first, __last):
+		__up	= rows[i-1] if((i > 0) or wrap) else 0
+		__down	= rows[(i+1)%len(rows)] if((i+1 < len(rows)) or wrap) else 0
+		__row	= rows[i]
+		__planes = [ 0, 0, 0, 0 ]
+
+		for neighbour in (__up, __down, __shift(__up, True), __shift(__up, False), __shift(__row, True), __shift(__row, False), __shift(__down, True), __shift(__down, False)):
+			__carry = neighbour
+
+			for k in range(0, 4):
+				if(not __carry):
+					break
+
+				__planes[k], __carry = __planes[k] ^ __carry, __planes[k] & __carry
+
+		__alive = 0
+		for count in birth:
+			__alive |= __equals(__planes, count) & ~__row
+
+		for count in survive:
+			__alive |= __equals(__planes, count) & __row
+
+		__next.append(__alive & __mask)
+
+	return(__next)
+
+def stepBand(params: tuple) -> object:
+	""" Step a band of rows with its halo, module level so the process pool can pickle it """
+
+	__cells, x, birth, survive, wrap = params
+
+	if(isinstance(__cells, list)):
+		return(stepRows(__cells, x, birth, survive, wrap, True))
+
+	return(stepArray(__cells, birth, survive, wrap, True))
+
+def stepTile(params: tuple) -> int:
+	""" Step a tile of the cells in shared memory into the next block, see `TilePool.map`
+
+		Returns:
+			int: the population of the tile
+
+	"""
+
+	__names, __shape, _, __start, __end, birth, survive, wrap = params
+
+	__cells	= attach(__names[0], __shape)
+	y, x	= __shape
+	__none	= np.zeros((1, x), dtype=np.uint8)
+	__up	= __cells[[ (__start-1)%y ]] if((__start > 0) or wrap) else __none
+	__down	= __cells[[ __end%y ]] if((__end < y) or wrap) else __none
+	__next	= stepArray(np.concatenate((__up, __cells[__start:__end], __down)), birth, survive, wrap, True)
+
+	attach(__names[1], __shape)[__start:__end] = __next
+
+	return(int(__next.sum(dtype=np.int64)))
+
+class Life:
+
+	""" Life-like automaton stepping the cells of a grid in place.
+
+		A NumPy dense grid is stepped on a view of its own buffer. The other dense
+		grids are read once into ints by row, and written back into the grid by
+		`sync()`, the counters of the grid being rebuilt at the same time. With
+		several workers and NumPy, the cells are copied into a `TilePool` and
+		written back the same way.
+
+		Attributes:
+			grid (Grid): The grid, dense or bits.
+			rule (str): The rule in the B/S notation.
+			wrap (bool): Whether the grid is a torus.
+			workers (int): Number of processes stepping the bands, 1 to step in the current process.
+			generation (int): Number of generations computed.
+
+		Private Attributes:
+			__cells (numpy.ndarray | None): The `(y, x)` view of a NumPy dense grid.
+			__rows (list[int] | None): The rows of the other grids.
+			__tiles (TilePool | None): The shared cells and processes stepping the tiles, with NumPy.
+			__pool (ProcessPoolExecutor | None): The pool stepping the bands, without NumPy.
+
+		Methods:
+
+			randomize(density: float = .5, seed: int = None) -> None:
+				Sets each cell alive with a probability.
+
+			step(n: int = 1) -> int:
+				Computes n generations and returns the generation count.
+
+			sync() -> int:
+				Writes the cells back into the grid, rebuilds its counters and returns the population.
+
+			close() -> None:
+				Stops the process pool.
+
+		Example:
+			>>> life = Life(Grid(64, 64, mode="bits"))
+			>>> life.randomize(.3, 42)
+			>>> life.step(100)
+			100
+			>>> life.sync()
+
+	"""
+
+	def __init__(self, grid: Grid, rule: str = RULE, wrap: bool = False, workers: int = 1):
+		if(grid.backend == "sparse"):
+			raise(ValueError("The automaton needs a dense or bits matrix"))
+
+		self.grid		: Grid	= grid
+		self.rule		: str	= str(rule)
+		self.wrap		: bool	= bool(wrap)
+		self.workers	: int	= max(1, int(workers))
+		self.generation	: int	= int(0)
+
+		self.__birth, self.__survive = parseRule(rule)
+
+		self.__cells	= None
+		self.__rows		= None
+		self.__tiles	= None
+		self.__pool		= None
+
+		if((self.workers > 1) and (np is not None)):
+			self.__tiles = TilePool(grid.x, grid.y, self.workers, 2)
+			self.__tiles.load(grid)
+
+		elif(grid.backend == "numpy"):
+			self.__cells = np.frombuffer(grid.buffer(), dtype=np.uint8).reshape(grid.y, grid.x)
+
+		else:
+			self.__pool = ProcessPoolExecutor(max_workers=self.workers) if(self.workers > 1) else None
+			self.__rows = self.__readRows()
+
+	def __readRows(self) -> list[int]:
+		""" Private method reading the rows of the grid as ints """
+
+		__buffer = self.grid.buffer()
+
+		if(self.grid.backend == "bits"):
+			__stride = (self.grid.x+7)//8
+			return(list[int]([ int.from_bytes(__buffer[i*__stride:(i+1)*__stride], "little") for i in range(0, self.grid.y) ]))
+
+		x = self.grid.x
+		return(list[int]([ int(bytes(__buffer[i*x:(i+1)*x]).translate(CELLS_TO_DIGITS)[::-1], 2) for i in range(0, self.grid.y) ]))
+
+	def __bands(self, cells) -> list[tuple]:
+		""" Private method splitting the cells into a band by worker, with their halo rows """
+
+		y		= len(cells)
+		__size	= -(-y//self.workers)
+		__bands	= list[tuple]([])
+
+		for start in range(0, y, __size):
+			__end = min(start+__size, y)
+
+			if(isinstance(cells, list)):
+				__up	= [ cells[start-1] if((start > 0) or self.wrap) else 0 ]
+				__down	= [ cells[__end%y] if((__end < y) or self.wrap) else 0 ]
+				__band	= __up+cells[start:__end]+__down
+
+			else:
+				__up	= cells[[ (start-1)%y ]] if((start > 0) or self.wrap) else np.zeros((1, self.grid.x), dtype=np.uint8)
+				__down	= cells[[ __end%y ]] if((__end < y) or self.wrap) else np.zeros((1, self.grid.x), dtype=np.uint8)
+				__band	= np.concatenate((__up, cells[start:__end], __down))
+
+			__bands.append((__band, self.grid.x, self.__birth, self.__survive, self.wrap))
+
+		return(__bands)
+
+	def randomize(self, density: float = .5, seed: int = None) -> None:
+		""" Set each cell alive with a probability
+
+			Without NumPy, a row is built from random words of probability 1/2 with the
+			8 first binary digits of the density: a "1" digit ORs a word, a "0" ANDs it.
+
+		"""
+
+		if(self.__tiles):
+			self.__tiles.fill(density, seed)
+			return
+
+		if(self.__cells is not None):
+			self.__cells[:] = np.random.default_rng(seed).random(self.__cells.shape) < density
+			return
+
+		__random = Random(seed)
+		__digits = [ int(density*2**(k+1))%2 for k in range(0, 8) ]
+
+		for i in range(0, self.grid.y):
+			__row = 0
+
+			for digit in reversed(__digits):
+				__word	= __random.getrandbits(self.grid.x)
+				__row	= (__row | __word) if(digit) else (__row & __word)
+
+			self.__rows[i] = __row
+
+	def step(self, n: int = 1) -> int:
+		for _ in range(0, int(n)):
+			if(self.__tiles):
+				self.__tiles.map(stepTile, self.__birth, self.__survive, self.wrap)
+				self.__tiles.swap()
+				self.generation += 1
+				continue
+
+			__cells = self.__rows if(self.__cells is None) else self.__cells
+
+			if(self.__pool):
+				__next = list(self.__pool.map(stepBand, self.__bands(__cells)))
+				__next = [ row for band in __next for row in band ] if(self.__cells is None) else np.concatenate(__next)
+
+			elif(self.__cells is None):
+				__next = stepRows(__cells, self.grid.x, self.__birth, self.__survive, self.wrap)
+
+			else:
+				__next = stepArray(__cells, self.__birth, self.__survive, self.wrap)
+
+			if(self.__cells is None):
+				self.__rows = __next
+
+			else:
+				self.__cells[:] = __next
+
+			self.generation += 1
+
+		return(self.generation)
+
+	def sync(self) -> int:
+		if(self.__tiles):
+			return(self.__tiles.store(self.grid))
+
+		if(self.__rows is not None):
+			__buffer = self.grid.buffer()
+
+			if(self.grid.backend == "bits"):
+				__stride = (self.grid.x+7)//8
+
+				for i, row in enumerate(self.__rows):
+					__buffer[i*__stride:(i+1)*__stride] = row.to_bytes(__stride, "little")
+
+			else:
+				x = self.grid.x
+
+				for i, row in enumerate(self.__rows):
+					__buffer[i*x:(i+1)*x] = format(row, f"0{x}b")[::-1].encode().translate(DIGITS_TO_CELLS)
+
+		return(self.grid.recount())
+
+	def close(self) -> None:
+		if(self.__tiles):
+			self.__tiles.close()
+			self.__tiles = None
+
+		if(self.__pool):
+			self.__pool.shutdown()
+			self.__pool = None
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Arithmetic on matrices of values.
+
+	This module provides the matrix arithmetic of the `Matrix` tool: product, sum,
+	transposition and 2D convolution. Matrices are NumPy arrays when NumPy is
+	installed, lists of rows otherwise.
+
+	With NumPy, the product runs on BLAS through a float64 `matmul`. Integer
+	matrices are converted back exactly while the products can't exceed 2^53,
+	larger values fall back on the integer `matmul` of NumPy, exact but without
+	BLAS. Without NumPy, the product and the transposition are cache-blocked: they
+	work on `BLOCK` x `BLOCK` tiles whose rows stay in the caches while they are
+	reused, and the innermost loop runs over row slices instead of single cells.
+
+	Constants:
+	- BLOCK: Size of the tiles of the blocked algorithms.
+
+"""
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+BLOCK : int = 64
+""" Size of the tiles of the blocked algorithms
+"""
+
+def shape(a) -> tuple[int, int]:
+	return(len(a), len(a[0]))
+
+def naiveMultiply(a: list[list], b: list[list]) -> list[list]:
+	""" Reference product of two lists of rows, one cell after another """
+
+	(n, m), (_m, p) = shape(a), shape(b)
+
+	if(m != _m):
+		raise(ValueError(f"Can't multiply {n}x{m} by {_m}x{p} matrices"))
+
+	__b = [ [ b[k][j] for k in range(0, m) ] for j in range(0, p) ]
+
+	return(list[list]([ [ sum([ a[i][k]*__b[j][k] for k in range(0, m) ]) for j in range(0, p) ] for i in range(0, n) ]))
+
+def blockedMultiply(a: list[list], b: list[list], block: int = BLOCK) -> list[list]:
+	""" Cache-blocked product of two lists of rows
+
+		The output row `i` accumulates `a[i][k] * b[k]` on a tile of columns at a
+		time, the `block` rows of `b` of a tile are reused by all the rows of `a`,
+		and the zeros of `a` (most of the cells of a sparse binary matrix) are skipped.
+
+		Args:
+			a (list[list]): the left matrix, n x m
+			b (list[list]): the right matrix, m x p
+			block (int, optional): the size of the tiles. Defaults to BLOCK.
+
+		Returns:
+			list[list]: the n x p product
+
+	"""
+
+	(n, m), (_m, p) = shape(a), shape(b)
+
+	if(m != _m):
+		raise(ValueError(f"Can't multiply {n}x{m} by {_m}x{p} matrices"))
+
+	__c = [ [0]*p for _ in range(0, n) ]
+
+	for j0 in range(0, p, block):
+		j1 = min(j0+block, p)
+
+		for k0 in range(0, m, block):
+			__tile = [ b[k][j0:j1] for k in range(k0, min(k0+block, m)) ]
+
+			for i in range(0, n):
+				__row	= a[i]
+				__out	= __c[i][j0:j1]
+
+				for k, bk in enumerate(__tile, start=k0):
+					aik = __row[k]
+
+					if(aik):
+						__out = [ c+aik*v for c, v in zip(__out, bk) ]
+
+				__c[i][j0:j1] = __out
+
+	return(__c)
+
+def multiply(a, b):
+	""" Product of two matrices, on BLAS with NumPy or blocked otherwise
+
+		Returns:
+			numpy.ndarray | list[list]: the product, integers if both matrices hold integers
+
+	"""
+
+	if(np is None):
+		return(blockedMultiply(a, b))
+
+	a, b = np.asarray(a), np.asarray(b)
+
+	if(a.shape[1] != b.shape[0]):
+		raise(ValueError(f"Can't multiply {a.shape[0]}x{a.shape[1]} by {b.shape[0]}x{b.shape[1]} matrices"))
+
+	if((a.dtype.kind == "f") or (b.dtype.kind == "f")):
+		return(a.astype(np.float64) @ b.astype(np.float64))
+
+	__bound = int(np.abs(a).max(initial=0))*int(np.abs(b).max(initial=0))*a.shape[1]
+
+	if(__bound < 2**53):
+		return(np.rint(a.astype(np.float64) @ b.astype(np.float64)).astype(np.int64))
+
+	return(a.astype(np.int64) @ b.astype(np.int64))
+
+def add(a, b):
+	if(shape(a) != shape(b)):
+		raise(ValueError(f"Can't add {len(a)}x{len(a[0])} and {len(b)}x{len(b[0])} matrices"))
+
+	if(np is None):
+		return(list[list]([ [ u+v for u, v in zip(ra, rb) ] for ra, rb in zip(a, b) ]))
+
+	__a, __b = np.asarray(a), np.asarray(b)
+
+	return(np.add(__a, __b, dtype=np.float64 if("f" in (__a.dtype.kind, __b.dtype.kind)) else np.int64))
+
+def transpose(a, block: int = BLOCK):
+	""" Transpose a matrix, by tiles of `block` rows without NumPy """
+
+	if(np is not None):
+		return(np.ascontiguousarray(np.asarray(a).T))
+
+	n, m	= shape(a)
+	__t		= [ [0]*n for _ in range(0, m) ]
+
+	for i0 in range(0, n, block):
+		__tile = [ a[i] for i in range(i0, min(i0+block, n)) ]
+
+		for j in range(0, m):
+			__t[j][i0:i0+len(__tile)] = [ row[j] for row in __tile ]
+
+	return(__t)
+
+def convolve(a, kernel):
+	""" 2D convolution of a matrix by a kernel, with zero padding
+
+		The output has the shape of the matrix, the kernel is centered on each cell
+		and flipped as in a mathematical convolution. Each kernel cell adds a whole
+		shifted copy of the matrix, so the cost is one vectorised pass per kernel
+		cell instead of one loop per output cell.
+
+		Args:
+			a (numpy.ndarray | list[list]): the matrix
+			kernel (numpy.ndarray | list[list]): the kernel, e.g. 3x3
+
+		Returns:
+			numpy.ndarray | list[list]: the convolved matrix
+
+	"""
+
+	(n, m), (kn, km) = shape(a), shape(kernel)
+	__py, __px = kn-1-kn//2, km-1-km//2
+
+	if(np is not None):
+		__a, __k	= np.asarray(a), np.asarray(kernel)
+		__dtype		= np.float64 if("f" in (__a.dtype.kind, __k.dtype.kind)) else np.int64
+		__padded	= np.zeros((n+kn-1, m+km-1), dtype=__dtype)
+		__out		= np.zeros((n, m), dtype=__dtype)
+
+		__padded[__py:__py+n, __px:__px+m] = __a
+
+		for i in range(0, kn):
+			for j in range(0, km):
+				if(__k[kn-1-i, km-1-j]):
+					__out += __k[kn-1-i, km-1-j]*__padded[i:i+n, j:j+m]
+
+		return(__out)
+
+	__out = [ [0]*m for _ in range(0, n) ]
+
+	for i in range(0, kn):
+		for j in range(0, km):
+			__weight = kernel[kn-1-i][km-1-j]
+
+			if(not __weight):
+				continue
+
+			__x0, __x1 = max(0, __px-j), min(m, m+__px-j)
+
+			for y in range(max(0, __py-i), min(n, n+__py-i)):
+				__src = a[y+i-__py]
+				__out[y][__x0:__x1] = [ o+__weight*v for o, v in zip(__out[y][__x0:__x1], __src[__x0+j-__px:__x1+j-__px]) ]
+
+	return(__out)
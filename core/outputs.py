@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Compressed and rotated output logs of the schedules of the `Shell` tool.
+
+	The output lines of the commands of a logged run are queued to a writer
+	thread instead of the terminal. The writer gathers the lines of each command
+	in chunks of `LOG_CHUNK` bytes, and compresses each chunk as its own gzip
+	member, appended to the current log file of the run, e.g. `<run>.0.log.gz`.
+	The members of a file form a valid gzip stream, readable by `zcat`, and a file
+	is rotated to the next one, `<run>.1.log.gz`, once over `LOG_SIZE` bytes.
+
+	Each member is recorded by a line of the index of the run, `<run>.index.jsonl`,
+	with its command, its file, its offset and size in the file, and its number of
+	bytes and lines. The output of a command is read back by decompressing its
+	members only, without scanning the logs.
+
+	The lines are handed to the writer by batches of `LOG_BATCH` bytes, through
+	a bounded queue: a command writing faster than the compression is slowed down,
+	and the memory stays below a chunk and a batch by running command plus the
+	queued batches, whatever the output volume. The logs of the oldest runs are
+	deleted to keep the last `LOG_RUNS` runs.
+
+	A failure of the writer, e.g. a full disk, is kept and raised by the next
+	`write`, `end` or `close`. The writer then drops the queued batches until the
+	end of the run, so no command waits on the queue of a dead writer.
+
+	Constants:
+	- LOG_SIZE: Size in bytes from which a log file is rotated.
+	- LOG_CHUNK: Number of bytes of output of a command compressed by gzip member.
+	- LOG_BATCH: Number of bytes of output of a command handed at once to the writer.
+	- LOG_QUEUE: Maximum number of batches waiting for the writer.
+	- LOG_LEVEL: Compression level, from 1 (fastest) to 9 (smallest).
+	- LOG_RUNS: Number of runs whose logs are kept by schedule.
+
+"""
+
+from glob import glob
+from json import dumps, loads
+from os import makedirs, remove
+from os.path import basename, dirname, join
+from queue import Queue
+from threading import Lock, Thread
+from typing import Iterator
+from zlib import DEFLATED, compressobj, decompress
+
+LOG_SIZE : int = 2**26
+""" Size in bytes from which a log file is rotated
+"""
+
+LOG_CHUNK : int = 2**20
+""" Number of bytes of output of a command compressed by gzip member
+"""
+
+LOG_BATCH : int = 2**16
+""" Number of bytes of output of a command handed at once to the writer
+"""
+
+LOG_QUEUE : int = 2**6
+""" Maximum number of batches waiting for the writer
+"""
+
+LOG_LEVEL : int = 1
+""" Compression level, from 1 (fastest) to 9 (smallest)
+"""
+
+LOG_RUNS : int = 10
+""" Number of runs whose logs are kept by schedule
+"""
+
+class OutputLog:
+
+	""" Writer of the output of the commands of a run into compressed logs.
+
+		Attributes:
+			path (str): Path of the run without extension, e.g. `Shell/Logs/build/20250106-090000`.
+			index (str): Path of the index of the run.
+
+		Private Attributes:
+			__batches (dict[str, list[bytes]]): Lines of each command not yet handed to the writer.
+			__sizes (dict[str, int]): Number of bytes of the batch of each command.
+			__lock (Lock): Serializes the lines of the streams of the commands.
+			__queue (Queue): Batches waiting for the writer, with their command, None at the end of a command.
+			__writer (Thread): The thread compressing and writing the chunks.
+			__error (Exception | None): The failure of the writer, raised to the callers.
+
+		Methods:
+
+			write(key: str, line: str) -> None:
+				Queues an output line of a command.
+
+			end(key: str) -> None:
+				Writes the last chunk of a command.
+
+			close() -> None:
+				Writes the remaining chunks and waits for the writer.
+
+			read(index: str, key: str) -> Iterator[str]:
+				Yields the output lines of a command of a run, static.
+
+			entries(index: str) -> list[dict]:
+				Reads the members of the index of a run, static.
+
+		Example:
+			>>> with OutputLog("Shell/Logs/build/20250106-090000") as log:
+			...     log.write("make", "cc -c main.c")
+			...     log.end("make")
+			>>> list(OutputLog.read(log.index, "make"))
+			['cc -c main.c']
+
+	"""
+
+	def __init__(self, path: str, size: int = LOG_SIZE, keep: int = LOG_RUNS):
+		""" Start the writer of a run, deleting the logs of the oldest runs of its directory
+
+			Args:
+				path (str): the path of the run without extension
+				size (int, optional): the size in bytes from which a log file is rotated. Defaults to LOG_SIZE.
+				keep (int, optional): the number of runs kept, this one included. Defaults to LOG_RUNS.
+
+		"""
+
+		self.path	: str = str(path)
+		self.index	: str = f"{self.path}.index.jsonl"
+
+		makedirs(dirname(self.path) or ".", exist_ok=True)
+
+		__runs = sorted(glob(join(dirname(self.path) or ".", "*.index.jsonl")))
+
+		for index in __runs[0:max(0, len(__runs)-max(1, int(keep))+1)]:
+			for file in glob(f"{index[0:-len('.index.jsonl')]}.*.log.gz")+[ index ]:
+				remove(file)
+
+		self.__batches	= dict[str, list[bytes]]({})
+		self.__sizes	= dict[str, int]({})
+		self.__lock		= Lock()
+		self.__queue	= Queue(maxsize=LOG_QUEUE)
+		self.__error	= None
+		self.__writer	= Thread(target=self.__write, args=(max(1, int(size)), ), daemon=True)
+		self.__writer.start()
+
+	def __enter__(self):
+		return(self)
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __flush(self, state: dict, key: str) -> None:
+		""" Private method compressing the pending chunk of a command as a gzip member, and indexing it """
+
+		__data = b"".join(state["chunks"].pop(key, []))
+		state["bytes"].pop(key, None)
+
+		if(not __data):
+			return
+
+		__compressor	= compressobj(LOG_LEVEL, DEFLATED, 31)
+		__member		= __compressor.compress(__data)+__compressor.flush()
+
+		if(state["log"] and (state["offset"]+len(__member) > state["size"])):
+			state["log"].close()
+			state.update({ "n": state["n"]+1, "offset": 0, "log": None })
+
+		if(not state["log"]):
+			state["log"] = open(f"{self.path}.{state['n']}.log.gz", "wb")
+
+		state["log"].write(__member)
+		state["index"].write(f"{dumps(dict({ 'key': key, 'file': basename(state['log'].name), 'offset': state['offset'], 'size': len(__member), 'bytes': len(__data), 'lines': __data.count(10) }))}\n")
+		state["offset"] += len(__member)
+
+	def __write(self, size: int) -> None:
+		""" Private method of the writer thread, gathering the lines in chunks until the end of the run
+
+			On a failure, the error is kept for the callers and the next batches are
+			dropped until the end of the run.
+
+		"""
+
+		__state	= dict({ "chunks": dict[str, list[bytes]]({}), "bytes": dict[str, int]({}), "size": size, "n": 0, "offset": 0, "log": None, "index": None })
+		__key	= str("")
+
+		try:
+			with open(self.index, "w", encoding="utf-8") as index:
+				__state["index"] = index
+
+				while(True):
+					__key, __batch = self.__queue.get()
+
+					if(__key is None):
+						break
+
+					if(__batch is None):
+						self.__flush(__state, __key)
+						continue
+
+					__state["chunks"].setdefault(__key, []).append(__batch)
+					__state["bytes"][__key] = __state["bytes"].get(__key, 0)+len(__batch)
+
+					if(__state["bytes"][__key] >= LOG_CHUNK):
+						self.__flush(__state, __key)
+
+				for key in list(__state["chunks"]):
+					self.__flush(__state, key)
+
+				if(__state["log"]):
+					__state["log"].close()
+
+		except(Exception) as e:
+			self.__error = e
+
+			while(__key is not None):
+				__key, _ = self.__queue.get()
+
+	def __put(self, key: str, batch: bytes | None) -> None:
+		""" Private method handing a batch to the writer, raising its failure if it failed """
+
+		if(self.__error):
+			raise(self.__error)
+
+		self.__queue.put((key, batch))
+
+	def __pop(self, key: str) -> bytes:
+		""" Private method taking the batch of a command, the lock being held """
+
+		self.__sizes.pop(key, None)
+		return(b"".join(self.__batches.pop(key, [])))
+
+	def write(self, key: str, line: str) -> None:
+		__line	= f"{line}\n".encode("utf-8", "replace")
+		__batch	= None
+
+		with self.__lock:
+			self.__batches.setdefault(key, []).append(__line)
+			self.__sizes[key] = self.__sizes.get(key, 0)+len(__line)
+
+			if(self.__sizes[key] >= LOG_BATCH):
+				__batch = self.__pop(key)
+
+		if(__batch):
+			self.__put(key, __batch)
+
+	def end(self, key: str) -> None:
+		with self.__lock:
+			__batch = self.__pop(key)
+
+		if(__batch):
+			self.__put(key, __batch)
+
+		self.__put(key, None)
+
+	def close(self) -> None:
+		with self.__lock:
+			__keys = list(self.__batches)
+
+		try:
+			for key in __keys:
+				self.end(key)
+
+		finally:
+			if(self.__writer.is_alive()):
+				self.__queue.put((None, None))
+				self.__writer.join()
+
+		if(self.__error):
+			raise(self.__error)
+
+	@staticmethod
+	def entries(index: str) -> list[dict]:
+		try:
+			with open(index, "r", encoding="utf-8") as file:
+				return(list[dict]([ dict(loads(line)) for line in file if(line.strip()) ]))
+
+		except(FileNotFoundError):
+			return(list[dict]([]))
+
+	@staticmethod
+	def read(index: str, key: str) -> Iterator[str]:
+		""" Yield the output lines of a command of a run, decompressing its members only
+
+			Args:
+				index (str): the path of the index of the run
+				key (str): the id of the command
+
+		"""
+
+		for entry in OutputLog.entries(index):
+			if(entry["key"] != key):
+				continue
+
+			with open(join(dirname(index) or ".", entry["file"]), "rb") as log:
+				log.seek(entry["offset"])
+				__data = decompress(log.read(entry["size"]), 31)
+
+			yield from __data.decode("utf-8", "replace").splitlines()
@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Command execution on subprocesses with streamed output.
+
+	This module runs the commands of the `Shell` tool. `os.system` spawns a shell
+	for each command and only returns a wait status, the output going straight to
+	the terminal. Here, a command without any shell syntax is split and executed
+	directly, without the extra shell process, and the others are given to the
+	shell. A command that is only echoed inherits the terminal, so pagers, editors,
+	prompts and colors work as in a shell. Otherwise, e.g. when its lines are
+	prefixed, logged or captured, the standard output and error are read line by
+	line by two threads, echoed as they come and kept in bounded buffers, the last
+	`OUTPUT_LINES` lines of each stream. Each run returns its exit code and
+	duration, and the output it read.
+
+	A command given a timeout is started in its own session, so the whole process
+	group, e.g. a pipeline of the shell, is killed when it expires. An executor
+	keeps its running commands, on Ctrl-C they are terminated, then killed if they
+	are still alive after `TERMINATE_GRACE` seconds.
+
+	The commands of a schedule can declare an `id` and the ids they `needs`: they
+	are then sorted in topological order and run by a pool of threads, each command
+	being started as soon as all the commands it needs succeeded. The lines of the
+	commands running together are prefixed with their id, and written whole.
+
+	A `Session` runs the commands one after another in a single long-lived shell
+	instead, fed on its stdin, so a `cd` or an `export` is kept for the next
+	commands and no process is spawned by command. The end of a command and its
+	exit code are known from markers printed after it on both streams.
+
+	Constants:
+	- SHELL_SYNTAX: Characters that need a shell to be interpreted, e.g. pipes, redirections, globs.
+	- SHELL_BUILTINS: Commands of the shell itself, which can't be executed directly.
+	- OUTPUT_LINES: Number of last lines kept by stream.
+	- LINE_LIMIT: Maximum number of characters read at once from a line.
+	- SESSION_SHELLS: Shells of the sessions, by preference.
+	- TERMINATE_GRACE: Delay in seconds given to an interrupted command to exit before being killed.
+
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from heapq import heappop, heappush
+from os import name as osName
+from queue import Empty, Queue
+from shlex import quote, split
+from shutil import which
+from subprocess import PIPE, Popen, TimeoutExpired
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Callable, TextIO
+from uuid import uuid4
+
+import re
+import sys
+
+from signal import SIGTERM
+
+try:
+	from os import killpg
+	from signal import SIGKILL
+
+except(ImportError):
+	killpg	= None
+	SIGKILL	= SIGTERM
+
+from core.exceptions import ValidationError
+
+SHELL_SYNTAX : str = str(r"[|&;<>()$`\\\"'*?\[\]#~=%{}!\n]")
+""" Characters that need a shell to be interpreted, e.g. pipes, redirections, globs
+"""
+
+SHELL_BUILTINS : frozenset[str] = frozenset({
+	".", "alias", "bg", "cd", "command", "eval", "exec", "exit", "export", "fg", "history", "jobs",
+	"popd", "pushd", "read", "set", "shopt", "source", "trap", "type", "ulimit", "umask", "unalias", "unset", "wait"
+})
+""" Commands of the shell itself, which can't be executed directly
+"""
+
+OUTPUT_LINES : int = 1000
+""" Number of last lines kept by stream
+"""
+
+LINE_LIMIT : int = 2**16
+""" Maximum number of characters read at once from a line
+"""
+
+SESSION_SHELLS : tuple[str, ...] = tuple[str, ...](("bash", "sh"))
+""" Shells of the sessions, by preference
+"""
+
+TERMINATE_GRACE : float = 2
+""" Delay in seconds given to an interrupted command to exit before being killed
+"""
+
+def needsShell(command: str) -> bool:
+	""" Check if a command has to be interpreted by the shell
+
+		Commands always go through the shell on Windows, where most of the basic
+		commands (e.g. `dir`, `copy`) are builtins of `cmd.exe`.
+
+	"""
+
+	if((osName == "nt") or re.search(SHELL_SYNTAX, command)):
+		return(True)
+
+	__words = command.split()
+
+	return(bool(not __words or (__words[0] in SHELL_BUILTINS)))
+
+def failed(result: dict) -> bool:
+	""" Check if a command exited with an error, timed out or was skipped """
+
+	return(bool(result["code"] or result["expired"] or result.get("skipped")))
+
+def planGraph(entries: list[str | dict]) -> list[dict]:
+	""" Normalize the commands of a schedule and sort them in topological order
+
+		Args:
+			entries (list[str | dict]): the commands, strings or `{ "cmd", "id", "needs", "timeout", "inputs", "outputs" }`
+				objects, an entry without id being named by its index
+
+		Raises:
+			ValidationError: on a duplicated id, an unknown need or a cycle
+
+		Returns:
+			list[dict]: the commands with their "id", "cmd", "needs", "timeout", "inputs" and "outputs"
+			globs, each one after all the commands it needs, in the order of the schedule otherwise
+
+	"""
+
+	__list	= lambda value:list[str]([ str(v) for v in ([ value ] if(isinstance(value, (str, int))) else value) ])
+	__tasks	= list[dict]([])
+
+	for i, entry in enumerate(entries):
+		__entry = dict(entry) if(isinstance(entry, dict)) else dict({ "cmd": entry })
+
+		__tasks.append(dict({
+			"id": str(__entry.get("id", i)),
+			"cmd": str(__entry["cmd"]),
+			"needs": __list(__entry.get("needs", [])),
+			"timeout": __entry.get("timeout"),
+			"inputs": __list(__entry.get("inputs", [])),
+			"outputs": __list(__entry.get("outputs", []))
+		}))
+
+	__index = dict[str, int]({ task["id"]: i for i, task in enumerate(__tasks) })
+
+	if(len(__index) < len(__tasks)):
+		raise(ValidationError("id", "each command of a schedule needs a distinct id"))
+
+	__waiting	= list[int]([ len(set(task["needs"])) for task in __tasks ])
+	__users		= list[list[int]]([ [] for _ in __tasks ])
+
+	for i, task in enumerate(__tasks):
+		for need in set(task["needs"]):
+			if(need not in __index):
+				raise(ValidationError("needs", f'"{task["id"]}" needs the unknown command "{need}"'))
+
+			__users[__index[need]].append(i)
+
+	__ready = list[int]([ i for i, n in enumerate(__waiting) if(not n) ])
+	__order = list[dict]([])
+
+	while(__ready):
+		i = heappop(__ready)
+		__order.append(__tasks[i])
+
+		for user in __users[i]:
+			__waiting[user] -= 1
+
+			if(not __waiting[user]):
+				heappush(__ready, user)
+
+	if(len(__order) < len(__tasks)):
+		raise(ValidationError("needs", f"cycle between the commands {', '.join([ t['id'] for i, t in enumerate(__tasks) if(__waiting[i]) ])}"))
+
+	return(__order)
+
+def runGraph(tasks: list[dict], run: Callable[[dict], dict], workers: int = 1, failFast: bool = False, cancel: Callable[[], None] = None) -> list[dict]:
+	""" Run the commands of a graph with a pool of threads
+
+		A command is started once all the commands it needs succeeded, the first
+		ones of the topological order first. The commands needing a failed one are
+		skipped, the others still run, unless `failFast` where no command is started
+		after the first failure, the running ones being completed.
+
+		A KeyboardInterrupt only reaches the main thread: the commands not started
+		are dropped and `cancel` stops the running ones, e.g. `Executor.terminate`,
+		so their threads return before the interruption is raised again.
+
+		Args:
+			tasks (list[dict]): the commands sorted by `planGraph`
+			run (Callable[[dict], dict]): the function running a command, returning its result
+			workers (int, optional): the number of commands run together. Defaults to 1.
+			failFast (bool, optional): whether to stop starting commands on the first failure. Defaults to False.
+			cancel (Callable[[], None], optional): called on a KeyboardInterrupt to stop the running commands. Defaults to None.
+
+		Returns:
+			list[dict]: the results of the commands, with their "id" and whether they were "skipped", in topological order
+
+	"""
+
+	__index		= dict[str, int]({ task["id"]: i for i, task in enumerate(tasks) })
+	__waiting	= list[int]([ len(set(task["needs"])) for task in tasks ])
+	__users		= list[list[int]]([ [] for _ in tasks ])
+	__ready		= list[int]([ i for i, n in enumerate(__waiting) if(not n) ])
+	__results	= dict[int, dict]({})
+	__running	= dict({})
+	__stopped	= False
+
+	for i, task in enumerate(tasks):
+		for need in set(task["needs"]):
+			__users[__index[need]].append(i)
+
+	with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+		try:
+			while(__ready or __running):
+				while(__ready and (len(__running) < max(1, int(workers))) and not __stopped):
+					i = heappop(__ready)
+					__running[pool.submit(run, tasks[i])] = i
+
+				if(not __running):
+					break
+
+				__done, _ = wait(__running, return_when=FIRST_COMPLETED)
+
+				for future in __done:
+					i				= __running.pop(future)
+					__results[i]	= dict(future.result(), id=tasks[i]["id"], skipped=False)
+
+					if(failed(__results[i])):
+						__stopped = __stopped or bool(failFast)
+						continue
+
+					for user in __users[i]:
+						__waiting[user] -= 1
+
+						if(not __waiting[user]):
+							heappush(__ready, user)
+
+		except(KeyboardInterrupt):
+			pool.shutdown(wait=False, cancel_futures=True)
+
+			if(cancel):
+				cancel()
+
+			raise
+
+	__skipped = dict({ "shell": False, "code": None, "duration": float(0), "expired": False, "stdout": [], "stderr": [], "skipped": True })
+
+	return(list[dict]([ __results.get(i, dict(__skipped, command=task["cmd"], id=task["id"])) for i, task in enumerate(tasks) ]))
+
+class Executor:
+
+	""" Runner of commands on subprocesses, with a shell only when needed.
+
+		Attributes:
+			timeout (float | None): Default timeout in seconds of the commands, None to wait for them.
+			echo (bool): Whether the output lines are written to the terminal as they come.
+			lines (int): Number of last lines kept by stream.
+			encoding (str): Encoding of the output of the commands.
+			capture (bool): Whether the output is always read, even when it could go straight to the terminal.
+
+		Private Attributes:
+			__lock (Lock): Serializes the lines echoed by the reader threads, and the running commands.
+			__processes (dict[Popen, bool]): The running commands, with whether they run in their own session.
+
+		Methods:
+
+			run(command: str, timeout: float = None, prefix: str = "", sink: Callable = None, cwd: str = None) -> dict:
+				Runs a command until it exits or times out and returns its result.
+
+			write(text: str, output: TextIO = None) -> None:
+				Writes a line to the terminal without mixing it with the lines of the commands.
+
+			terminate() -> None:
+				Terminates the running commands, e.g. from another thread on Ctrl-C.
+
+		Example:
+			>>> result = Executor(echo=False).run("git status --short")
+			>>> result["code"], result["duration"], result["stdout"][-1]
+
+	"""
+
+	def __init__(self, timeout: float = None, echo: bool = True, lines: int = OUTPUT_LINES, encoding: str = "utf-8", capture: bool = False):
+		self.timeout	: float | None	= None if(timeout is None) else float(timeout)
+		self.echo		: bool			= bool(echo)
+		self.lines		: int			= max(1, int(lines))
+		self.encoding	: str			= str(encoding)
+		self.capture	: bool			= bool(capture)
+
+		self.__lock			= Lock()
+		self.__processes	= dict[Popen, bool]({})
+
+	def __read(self, pipe: TextIO, buffer: deque, output: TextIO, prefix: str, sink: Callable[[str, str], None] | None) -> None:
+		""" Private method reading a stream line by line until it's closed, a failing sink is replaced by the echo """
+
+		__stream = "stdout" if(output is sys.stdout) else "stderr"
+
+		for line in iter(lambda:pipe.readline(LINE_LIMIT), ""):
+			buffer.append(line.rstrip("\r\n"))
+
+			if(sink):
+				try:
+					sink(__stream, buffer[-1])
+
+				except(Exception):
+					sink = None
+
+			elif(self.echo):
+				self.write(f"{prefix}{buffer[-1]}", output)
+
+		pipe.close()
+
+	def write(self, text: str, output: TextIO = None) -> None:
+		with self.__lock:
+			__output = output or sys.stdout
+			__output.write(f"{text}\n")
+			__output.flush()
+
+	def __kill(self, process: Popen, session: bool, signal: int = SIGKILL) -> None:
+		""" Private method signaling a command, with its whole process group when started in its own session """
+
+		if(session and killpg):
+			try:
+				killpg(process.pid, signal)
+				return
+
+			except(ProcessLookupError):
+				pass
+
+		process.kill() if(signal == SIGKILL) else process.terminate()
+
+	def terminate(self) -> None:
+		""" Terminate the running commands, then kill the ones still alive after `TERMINATE_GRACE` seconds """
+
+		with self.__lock:
+			__processes = dict(self.__processes)
+
+		for process, session in __processes.items():
+			self.__kill(process, session, SIGTERM)
+
+		__deadline = perf_counter()+TERMINATE_GRACE
+
+		for process, session in __processes.items():
+			try:
+				process.wait(max(0, __deadline-perf_counter()))
+
+			except(TimeoutExpired):
+				self.__kill(process, session)
+
+	def run(self, command: str, timeout: float = None, prefix: str = "", sink: Callable[[str, str], None] = None, cwd: str = None) -> dict:
+		""" Run a command until it exits or times out
+
+			Args:
+				command (str): the command line
+				timeout (float, optional): the timeout in seconds. Defaults to the timeout of the executor.
+				prefix (str, optional): the prefix of the echoed lines, e.g. the id of the command. Defaults to "".
+				sink (Callable[[str, str], None], optional): called with the stream name and each line instead of echoing it. Defaults to None.
+				cwd (str, optional): the working directory of the command. Defaults to the one of the tool.
+
+			Returns:
+				dict: the "command", whether it ran in a "shell", its exit "code", its "duration"
+				in seconds, whether it "expired" and the last lines of its "stdout" and "stderr"
+
+			A command echoed without prefix, sink nor timeout inherits the terminal, its
+			output isn't read and its lines are empty, unless the executor captures.
+			A command that can't be found or executed returns the codes of the shell,
+			127 and 126. A KeyboardInterrupt kills the command before being raised.
+
+		"""
+
+		__timeout	= self.timeout if(timeout is None) else float(timeout)
+		__shell		= needsShell(command)
+		__session	= bool((__timeout is not None) and killpg)
+		__pipes		= bool(self.capture or (not self.echo) or prefix or sink or (__timeout is not None))
+		__result	= dict({
+			"command": command,
+			"shell": __shell,
+			"code": None,
+			"duration": float(0),
+			"expired": False,
+			"stdout": deque(maxlen=self.lines),
+			"stderr": deque(maxlen=self.lines)
+		})
+
+		__start = perf_counter()
+
+		try:
+			__process = Popen(command if(__shell) else split(command), shell=__shell, stdout=PIPE if(__pipes) else None, stderr=PIPE if(__pipes) else None, text=True, encoding=self.encoding, errors="replace", start_new_session=__session, cwd=cwd)
+
+		except(FileNotFoundError, PermissionError) as e:
+			__result["code"] = 127 if(isinstance(e, FileNotFoundError)) else 126
+			__result["stderr"].append(f"{command.split()[0]}: {e.strerror}")
+
+			if(sink):
+				sink("stderr", __result["stderr"][-1])
+
+			elif(self.echo):
+				self.write(f"{prefix}{__result['stderr'][-1]}", sys.stderr)
+
+			__result.update({ "stdout": list(__result["stdout"]), "stderr": list(__result["stderr"]) })
+			return(__result)
+
+		with self.__lock:
+			self.__processes[__process] = __session
+
+		__readers = [
+			Thread(target=self.__read, args=(__process.stdout, __result["stdout"], sys.stdout, prefix, sink), daemon=True),
+			Thread(target=self.__read, args=(__process.stderr, __result["stderr"], sys.stderr, prefix, sink), daemon=True)
+		] if(__pipes) else []
+
+		for reader in __readers:
+			reader.start()
+
+		try:
+			__result["code"] = __process.wait(__timeout)
+
+		except(TimeoutExpired):
+			__result["expired"] = True
+			self.__kill(__process, __session)
+			__result["code"] = __process.wait()
+
+		except(KeyboardInterrupt):
+			self.__kill(__process, __session)
+			__process.wait()
+			raise
+
+		finally:
+			with self.__lock:
+				self.__processes.pop(__process, None)
+
+		for reader in __readers:
+			reader.join()
+
+		__result.update({
+			"duration": perf_counter()-__start,
+			"stdout": list(__result["stdout"]),
+			"stderr": list(__result["stderr"])
+		})
+
+		return(__result)
+
+class Session(Executor):
+
+	""" Long-lived shell running commands one after another and keeping its state.
+
+		Each command is written on the stdin of the shell as an `eval` of the quoted
+		command reading /dev/null, so a syntax error fails the command alone and a
+		command can't read the next ones, followed by a marker with its exit status
+		on stdout and a marker on stderr. The command is done once both markers are
+		read back. A command timing out or exiting the shell ends the session, the
+		next command starting a new one from the initial state. The working directory
+		given to a command is the initial one of a new shell, the commands of a
+		running shell run where the previous ones left it.
+
+		Attributes:
+			shell (str): Path of the shell, the first of `SESSION_SHELLS` found.
+
+		Private Attributes:
+			__process (Popen | None): The running shell.
+			__queue (Queue): Lines of both streams of the shell, with their stream, None at their end.
+			__marker (str): Random marker of the end of the commands.
+
+		Methods:
+
+			run(command: str, timeout: float = None, prefix: str = "", sink: Callable = None, cwd: str = None) -> dict:
+				Runs a command in the shell and returns its result, like `Executor.run`.
+
+			terminate() -> None:
+				Terminates the shell with its running command, the next command starts a new one.
+
+			close() -> None:
+				Exits the shell.
+
+		Example:
+			>>> with Session(echo=False) as session:
+			...     session.run("cd /tmp")
+			...     session.run("pwd")["stdout"]
+			['/tmp']
+
+	"""
+
+	def __init__(self, timeout: float = None, echo: bool = True, lines: int = OUTPUT_LINES, encoding: str = "utf-8"):
+		super().__init__(timeout, echo, lines, encoding)
+
+		self.shell : str = next((path for path in map(which, SESSION_SHELLS) if(path)), "")
+
+		if(not self.shell):
+			raise(ValueError(f"The sessions need one of the shells {', '.join(SESSION_SHELLS)}"))
+
+		self.__process	= None
+		self.__queue	= Queue()
+		self.__marker	= f"__session_{uuid4().hex}__"
+
+	def __enter__(self):
+		return(self)
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __pump(self, pipe: TextIO, stream: str, queue: Queue) -> None:
+		""" Private method queuing the lines of a stream of the shell until it's closed """
+
+		for line in iter(lambda:pipe.readline(LINE_LIMIT), ""):
+			queue.put((stream, line))
+
+		queue.put((stream, None))
+		pipe.close()
+
+	def __start(self, cwd: str = None) -> None:
+		""" Private method starting the shell in its own session, with the readers of its streams """
+
+		__args			= [ self.shell, "--noprofile", "--norc" ] if(self.shell.endswith("bash")) else [ self.shell ]
+		self.__process	= Popen(__args, stdin=PIPE, stdout=PIPE, stderr=PIPE, text=True, encoding=self.encoding, errors="replace", start_new_session=bool(killpg), cwd=cwd)
+		self.__queue	= Queue()
+
+		for pipe, stream in ((self.__process.stdout, "stdout"), (self.__process.stderr, "stderr")):
+			Thread(target=self.__pump, args=(pipe, stream, self.__queue), daemon=True).start()
+
+	def __stop(self) -> None:
+		""" Private method killing the shell with the commands it started """
+
+		if(self.__process):
+			try:
+				killpg(self.__process.pid, SIGKILL) if(killpg) else self.__process.kill()
+
+			except(ProcessLookupError):
+				pass
+
+			self.__process.wait()
+			self.__process = None
+
+	def terminate(self) -> None:
+		__process = self.__process
+
+		if((__process is None) or (__process.poll() is not None)):
+			return
+
+		try:
+			killpg(__process.pid, SIGTERM) if(killpg) else __process.terminate()
+			__process.wait(TERMINATE_GRACE)
+
+		except(TimeoutExpired):
+			killpg(__process.pid, SIGKILL) if(killpg) else __process.kill()
+
+		except(ProcessLookupError):
+			pass
+
+	def run(self, command: str, timeout: float = None, prefix: str = "", sink: Callable[[str, str], None] = None, cwd: str = None) -> dict:
+		__timeout	= self.timeout if(timeout is None) else float(timeout)
+		__result	= dict({
+			"command": command,
+			"shell": True,
+			"code": None,
+			"duration": float(0),
+			"expired": False,
+			"stdout": deque(maxlen=self.lines),
+			"stderr": deque(maxlen=self.lines)
+		})
+
+		if((self.__process is None) or (self.__process.poll() is not None)):
+			self.__start(cwd)
+
+		__start		= perf_counter()
+		__deadline	= None if(__timeout is None) else __start+__timeout
+		__open		= set[str]({ "stdout", "stderr" })
+
+		try:
+			self.__process.stdin.write(f"eval {quote(command)} </dev/null\nprintf '%s %d\\n' {self.__marker} $?\nprintf '%s\\n' {self.__marker} >&2\n")
+			self.__process.stdin.flush()
+
+			while(__open):
+				try:
+					__stream, __line = self.__queue.get(timeout=None if(__deadline is None) else max(0, __deadline-perf_counter()))
+
+				except(Empty):
+					__result["expired"] = True
+					self.__stop()
+					__result["code"] = -SIGKILL if(killpg) else -9
+					break
+
+				if(__line is None):
+					__open.discard(__stream)
+					continue
+
+				__text = __line.rstrip("\r\n")
+
+				if(self.__marker in __text):
+					__text, __status = __text.split(self.__marker, 1)
+					__open.discard(__stream)
+
+					if(__stream == "stdout"):
+						__result["code"] = int(__status)
+
+					if(not __text):
+						continue
+
+				__result[__stream].append(__text)
+
+				if(sink):
+					sink(__stream, __text)
+
+				elif(self.echo):
+					self.write(f"{prefix}{__text}", sys.stdout if(__stream == "stdout") else sys.stderr)
+
+		except(BrokenPipeError):
+			pass
+
+		except(KeyboardInterrupt):
+			self.__stop()
+			raise
+
+		if(__result["code"] is None):
+			__result["code"] = self.__process.wait()
+			self.__process = None
+
+		__result.update({
+			"duration": perf_counter()-__start,
+			"stdout": list(__result["stdout"]),
+			"stderr": list(__result["stderr"])
+		})
+
+		return(__result)
+
+	def close(self) -> None:
+		if(self.__process and (self.__process.poll() is None)):
+			try:
+				self.__process.stdin.write("exit\n")
+				self.__process.stdin.close()
+				self.__process.wait(1)
+				self.__process = None
+
+			except(BrokenPipeError, TimeoutExpired):
+				pass
+
+		self.__stop()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Time series recording of the matrix runs.
+
+	This module records each point placed or removed during a run of the `Matrix`
+	tool, with the iteration, the number of points and the fill ratio of the grid,
+	and the time since the start of the recording. The samples are written into
+	columns preallocated for the whole run, typed `array`s without a boxed Python
+	object by sample, and are only written to a file once, in bulk, at the end of
+	the run.
+
+	A run longer than the columns keeps its last samples: the columns are a ring
+	buffer, and the number of dropped samples is kept. The recorded points can be
+	applied again on an empty grid to replay the run without drawing them again,
+	as long as no sample was dropped.
+
+	Constants:
+	- RECORD_FIELDS: Columns of a recording with their `array` type codes, in file order.
+	- RECORD_LIMIT: Maximum number of samples held in memory.
+
+"""
+
+from array import array
+from csv import reader, writer
+from os.path import splitext
+from time import perf_counter
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+RECORD_FIELDS : dict[str, str] = dict({
+	"iteration": "q",
+	"x": "q",
+	"y": "q",
+	"value": "b",
+	"points": "q",
+	"fill": "d",
+	"time": "d"
+})
+""" Columns of a recording with their `array` type codes, in file order
+"""
+
+RECORD_LIMIT : int = 2**22
+""" Maximum number of samples held in memory
+"""
+
+class Recorder:
+
+	""" Ring buffer of the samples of a matrix run.
+
+		Attributes:
+			capacity (int): Number of samples held.
+			iteration (int): Iteration of the next samples, set by the run.
+			dropped (int): Number of the first samples overwritten.
+
+		Private Attributes:
+			__columns (dict[str, array]): The preallocated columns, by `RECORD_FIELDS`.
+			__next (int): Number of samples recorded.
+			__start (float): Time of the start of the recording.
+
+		Methods:
+
+			record(x: int, y: int, value: int, points: int, fill: float) -> None:
+				Adds the sample of a changed cell.
+
+			columns() -> dict[str, array]:
+				Returns the columns of the held samples, in chronological order.
+
+			save(path: str) -> int:
+				Writes the samples in a CSV or NPY file by extension and returns their number.
+
+			load(path: str) -> dict[str, list]:
+				Reads the columns of a CSV or NPY recording, static.
+
+		Example:
+			>>> recorder = Recorder(len(grid)*3)
+			>>> recorder.record(1, 2, 1, grid.total(), grid.fill())
+			>>> recorder.save("run.csv")
+			1
+
+	"""
+
+	def __init__(self, capacity: int):
+		self.capacity	: int	= max(1, min(int(capacity), RECORD_LIMIT))
+		self.iteration	: int	= int(0)
+
+		self.__columns	= dict[str, array]({ name: array(code, bytes(array(code).itemsize*self.capacity)) for name, code in RECORD_FIELDS.items() })
+		self.__next		= int(0)
+		self.__start	= perf_counter()
+
+	def __len__(self) -> int:
+		return(min(self.__next, self.capacity))
+
+	@property
+	def dropped(self) -> int:
+		return(max(0, self.__next-self.capacity))
+
+	def record(self, x: int, y: int, value: int, points: int, fill: float) -> None:
+		i	= self.__next%self.capacity
+		__c	= self.__columns
+
+		__c["iteration"][i]	= self.iteration
+		__c["x"][i]			= x
+		__c["y"][i]			= y
+		__c["value"][i]		= value
+		__c["points"][i]	= points
+		__c["fill"][i]		= fill
+		__c["time"][i]		= perf_counter()-self.__start
+
+		self.__next += 1
+
+	def columns(self) -> dict[str, array]:
+		__split = self.__next%self.capacity if(self.dropped) else len(self)
+
+		return(dict[str, array]({ name: column[__split:len(self)]+column[0:__split] if(self.dropped) else column[0:__split] for name, column in self.__columns.items() }))
+
+	def save(self, path: str) -> int:
+		""" Write the samples in a file, NPY for a `.npy` path and CSV otherwise
+
+			The NPY file holds a structured array of the `RECORD_FIELDS`, allocated once,
+			each column being copied into its field from its buffer in chronological
+			order, without an intermediate array.
+
+			Returns:
+				int: the number of samples written
+
+		"""
+
+		if(splitext(path)[1].lower() == ".npy"):
+			if(np is None):
+				raise(ValueError("The NPY recordings need NumPy"))
+
+			__split		= self.__next%self.capacity if(self.dropped) else len(self)
+			__records	= np.empty(len(self), dtype=list([ (name, code) for name, code in RECORD_FIELDS.items() ]))
+
+			for name, column in self.__columns.items():
+				__values = np.frombuffer(column, dtype=column.typecode)
+				__records[name][0:len(self)-__split]	= __values[__split:len(self)]
+				__records[name][len(self)-__split:]		= __values[0:__split]
+
+			np.save(path, __records)
+
+		else:
+			with open(path, "w", newline="", encoding="utf-8") as csvFile:
+				__writer = writer(csvFile)
+				__writer.writerow(RECORD_FIELDS)
+				__writer.writerows(zip(*self.columns().values()))
+
+		return(len(self))
+
+	@staticmethod
+	def load(path: str) -> dict[str, list]:
+		if(splitext(path)[1].lower() == ".npy"):
+			if(np is None):
+				raise(ValueError("The NPY recordings need NumPy"))
+
+			__records = np.load(path)
+			return(dict[str, list]({ name: __records[name].tolist() for name in RECORD_FIELDS }))
+
+		with open(path, "r", newline="", encoding="utf-8") as csvFile:
+			__rows = reader(csvFile)
+
+			if(tuple(next(__rows, ())) != tuple(RECORD_FIELDS)):
+				raise(ValueError(f"Invalid recording {path}, expected the columns {', '.join(RECORD_FIELDS)}"))
+
+			__columns = list(zip(*__rows)) or [ () ]*len(RECORD_FIELDS)
+
+		return(dict[str, list]({ name: [ float(v) if(code == "d") else int(v) for v in column ] for (name, code), column in zip(RECORD_FIELDS.items(), __columns) }))
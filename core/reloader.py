@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Hot reload of tool modules for the interactive prompt.
+
+	This module watches the source files of the registered tools and reloads only
+	the modules whose modification time changed since the last check. The main
+	prompt keeps its session, history and config, only the dispatch entries of the
+	reloaded tools are rebuilt.
+
+"""
+
+from importlib import reload
+from os.path import getmtime
+from sys import modules
+from traceback import format_exc
+
+from core.icons import Icons
+from core.tool import Tool
+
+class Reloader:
+
+	""" Tool modules watcher based on file modification time.
+
+		Private Attributes:
+			__mtimes (dict[str, float]): Last known modification time by module name.
+
+		Methods:
+
+			reload(tools: tuple[Tool]) -> tuple[Tool]:
+				Reloads the changed tool modules and returns the updated registry.
+
+		Example:
+			>>> reloader = Reloader(TOOLS)
+			>>> tools = reloader.reload(tools) # Called before each prompt dispatch
+
+	"""
+
+	def __init__(self, tools: tuple[Tool]):
+		self.__mtimes : dict[str, float] = dict({
+			tool.__module__: self.__mtime(tool) for tool in tools
+		})
+
+	def __mtime(self, tool: Tool) -> float:
+		""" Private method to read the modification time of a tool file
+
+			Args:
+				tool (Tool): the tool class to watch
+
+			Returns:
+				float: the modification time, 0 if the file can't be reached
+
+		"""
+
+		try:
+			return(getmtime(tool.path))
+
+		except(OSError):
+			return(float(0))
+
+	def reload(self, tools: tuple[Tool]) -> tuple[Tool]:
+		""" Reload the tool modules changed since the last check
+
+			A module that fails to reload keeps its previous tool class, the new
+			modification time is still stored to retry only on the next change.
+
+			Args:
+				tools (tuple[Tool]): the current tools registry
+
+			Returns:
+				tuple[Tool]: the registry with the reloaded tool classes
+
+		"""
+
+		__tools = list[Tool](tools)
+
+		for i, tool in enumerate(tools):
+			__mtime = self.__mtime(tool)
+
+			if(__mtime == self.__mtimes.get(tool.__module__)):
+				continue
+
+			self.__mtimes[tool.__module__] = __mtime
+
+			try:
+				__module	= reload(modules[tool.__module__])
+				__tools[i]	= getattr(__module, tool.__name__)
+				print(f'{Icons.info}"{tool.name}" reloaded from {tool.path}')
+
+			except(Exception):
+				print(f'{Icons.err}"{tool.name}" reload failed, keeping previous version\n{format_exc()}')
+
+		return(tuple[Tool](__tools))
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Terminal rendering of binary matrices.
+
+	This module formats the grids of the `Matrix` tool and animates them in a
+	terminal. The animation renderer draws the whole matrix once, then only moves
+	the cursor with ANSI escape sequences to repaint the cells and the statistics
+	that changed since the previous frame. Each frame is sent in a single buffered
+	write and frames are capped at a target frame rate: the changes made between
+	two frames are coalesced into the next one, by batches sized so that a fill of
+	the whole matrix takes about `FRAME_FILL` frames. The animated loop only waits
+	for the next frame once its batch is complete, so a small matrix still shows
+	one change by frame and a large one isn't slowed down to it.
+
+	Matrices larger than the terminal are downsampled: the grid counts its set cells
+	by blocks of cells, and each block is drawn as a single character, a shade or a
+	braille pattern, colored on a ramp of its density. The cost of a frame then
+	depends on the terminal size and on a vectorised reduction of the grid, not on
+	the formatting of its rows.
+
+	Constants:
+	- ANSI: Escape sequences used to drive the terminal cursor and screen.
+	- VIEWS: Display modes of a matrix, "auto", "cells", "shade" or "braille".
+	- SHADES: Characters of the shade view, from empty to full blocks.
+	- RAMP: Colors of the density views, from empty to full blocks.
+	- FRAME_FILL: Number of frames of the animated fill of a whole matrix.
+
+"""
+
+from math import ceil
+from shutil import get_terminal_size
+from sys import stdout
+from time import perf_counter, sleep
+from typing import TextIO
+
+from core.colors import Colors
+from core.grid import Grid
+
+ANSI : dict[str, str] = dict({
+	"clear": "\033[2J\033[H",
+	"home": "\033[H",
+	"eol": "\033[K",
+	"eos": "\033[J",
+	"hide": "\033[?25l",
+	"show": "\033[?25h"
+})
+""" Escape sequences used to drive the terminal cursor and screen
+"""
+
+VIEWS : tuple[str] = ("auto", "cells", "shade", "braille")
+""" Display modes of a matrix, "auto", "cells", "shade" or "braille"
+"""
+
+SHADES : str = " ░▒▓█"
+""" Characters of the shade view, from empty to full blocks
+"""
+
+RAMP : tuple[str] = (Colors.blue, Colors.cyan, Colors.green, Colors.yellow, Colors.red)
+""" Colors of the density views, from empty to full blocks
+"""
+
+FRAME_FILL : int = 200
+""" Number of frames of the animated fill of a whole matrix
+"""
+
+BRAILLE = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+DITHER = ((0, 4), (6, 2), (1, 5), (7, 3))
+
+def matrixView(grid: Grid) -> tuple[int, int]:
+	""" Compute the part of a grid fitting in the terminal
+
+		Returns:
+			tuple[int, int]: the number of displayed columns and rows
+
+	"""
+
+	__columns, __lines = get_terminal_size()
+
+	return(min(grid.x, max(1, (__columns-40)//3)), min(grid.y, max(3, __lines-2)))
+
+def matrixExtras(grid: Grid, stats: dict = {}, rows: int = None) -> dict[int, str]:
+	""" Build the statistics displayed on the right of the matrix rows
+
+		Args:
+			grid (Grid): the displayed grid
+			stats (dict, optional): the run statistics, e.g. { "Iterations": "1/3" }. Defaults to {}.
+			rows (int, optional): the number of displayed rows. Defaults to all the rows.
+
+		Returns:
+			dict[int, str]: the statistics text by row index
+
+	"""
+
+	_ = str(" "*2)
+	__rows = grid.y if(rows is None) else rows
+	__extras = dict[int, str]({})
+
+	if(__rows > 2):
+		_fill = str(round(grid.fill()*100, 2))
+
+		__extras[__rows-3] = f"{_}Points : {grid.total()}"
+		__extras[__rows-2] = f"{_}Cells  : {len(grid)}"
+		__extras[__rows-1] = f"{_}Filled : {_fill}{' '*(3-len(_fill))} %"
+
+	if(stats):
+		__extras[0] = __extras.get(0, "") + f"{_}Iteration(s) : {stats['Iterations']}"
+
+	return(__extras)
+
+def matrixTail(grid: Grid, y: int, total: int, extras: dict[int, str]) -> str:
+	""" Build the end of a matrix row, after its cells
+
+		Args:
+			grid (Grid): the displayed grid
+			y (int): the row index
+			total (int): the number of set cells of the row
+			extras (dict[int, str]): the statistics text by row index
+
+		Returns:
+			str: the row sum followed by the row statistics
+
+	"""
+
+	return(f" = {Colors.red if(total < (grid.x/3)) else Colors.green}{total}{Colors.end}{' '*(2-len(str(total)))}{extras.get(y, '')}")
+
+def matrixLines(grid: Grid, stats: dict = {}, view: tuple[int, int] = None) -> list[str]:
+	""" Format a grid with its statistics
+
+		Only the rows and columns of the view are read, so huge (e.g. sparse)
+		grids are displayed at the cost of the terminal size.
+
+		Args:
+			grid (Grid): the displayed grid
+			stats (dict, optional): the run statistics. Defaults to {}.
+			view (tuple[int, int], optional): the displayed columns and rows. Defaults to `matrixView(grid)`.
+
+		Returns:
+			list[str]: the lines of the matrix
+
+	"""
+
+	__columns, __rows	= view or matrixView(grid)
+	__extras			= matrixExtras(grid, stats, __rows)
+	__lines				= list[str]([])
+
+	for y in range(0, __rows):
+		__row = str(grid.row(y, 0, __columns))
+		__row = f"{__row[0:-1]}, ...]" if(__columns < grid.x) else __row
+
+		__lines.append(f" {__row}{matrixTail(grid, y, grid.rowSum(y), __extras)}")
+
+	if(__rows < grid.y):
+		__lines.append(f" ... {grid.y-__rows} more rows")
+
+	return(__lines)
+
+def matrixMode(grid: Grid, view: str = "auto") -> str:
+	""" Resolve the display mode of a grid, "auto" being "cells" when the grid fits in the terminal and "shade" otherwise """
+
+	if(view not in VIEWS):
+		raise(ValueError(f'Unknown view "{view}", expected {"|".join(VIEWS)}'))
+
+	if(view != "auto"):
+		return(view)
+
+	return("cells" if(matrixView(grid) == (grid.x, grid.y)) else "shade")
+
+def densityView(grid: Grid, view: str = "shade") -> tuple[int, int, int, int]:
+	""" Compute the blocks of cells drawn by each dot of a density view
+
+		A shade character is drawn from a block twice as high as wide, as a terminal
+		character, and a braille character from 2 x 4 square blocks, so the view
+		keeps the proportions of the matrix.
+
+		Returns:
+			tuple[int, int, int, int]: the columns and rows of a block, and the columns and rows of dots by character
+
+	"""
+
+	__columns, __lines	= get_terminal_size()
+	__columns, __lines	= max(1, __columns-32), max(3, __lines-3)
+	__dx, __dy			= (2, 4) if(view == "braille") else (1, 2)
+	__block				= max(-(-grid.x//(__columns*__dx)), -(-grid.y//(__lines*__dy)), 1)
+
+	return((__block, __block, __dx, __dy) if(view == "braille") else (__block, 2*__block, 1, 1))
+
+def densityLines(grid: Grid, stats: dict = {}, view: str = "shade") -> list[str]:
+	""" Format a grid downsampled to the terminal, with its statistics
+
+		The set cells are counted by block with `Grid.blockSums`. In the shade view,
+		each character is a block drawn with one of the `SHADES`. In the braille view,
+		each of the 8 dots of a character is a block, raised when its density exceeds
+		the threshold of its dot in an ordered dither, so uniform areas keep their
+		density. The characters are colored on the `RAMP` by their density.
+
+		Args:
+			grid (Grid): the displayed grid
+			stats (dict, optional): the run statistics. Defaults to {}.
+			view (str, optional): "shade" or "braille". Defaults to "shade".
+
+		Returns:
+			list[str]: the lines of the matrix
+
+	"""
+
+	bx, by, __dx, __dy	= densityView(grid, view)
+	__sums				= grid.blockSums(bx, by)
+	__widths			= [ min(bx, grid.x-x) for x in range(0, grid.x, bx) ]
+	__heights			= [ min(by, grid.y-y) for y in range(0, grid.y, by) ]
+	__rows				= -(-len(__sums)//__dy)
+	__extras			= matrixExtras(grid, stats, __rows)
+	__lines				= list[str]([])
+
+	for j in range(0, __rows):
+		__line, __color = [ " " ], None
+
+		for i in range(0, -(-len(__widths)//__dx)):
+			__cells, __set, __dots = 0, 0, 0
+
+			for v in range(j*__dy, min((j+1)*__dy, len(__sums))):
+				for u in range(i*__dx, min((i+1)*__dx, len(__widths))):
+					__area	= __widths[u]*__heights[v]
+					__count	= __sums[v][u]
+					__cells, __set = __cells+__area, __set+__count
+
+					if(16*__count > __area*(2*DITHER[v-j*__dy][u-i*__dx]+1)):
+						__dots |= BRAILLE[v-j*__dy][u-i*__dx]
+
+			__density = __set/__cells
+
+			if(RAMP[min(4, int(5*__density))] != __color):
+				__color = RAMP[min(4, int(5*__density))]
+				__line.append(__color)
+
+			__line.append(chr(0x2800+__dots) if(view == "braille") else SHADES[-(-__set*4//__cells)])
+
+		__lines.append(f"{''.join(__line)}{Colors.end}{__extras.get(j, '')}")
+
+	__lines.append(f" {bx}x{by} cells by {'dot' if(view == 'braille') else 'character'}")
+
+	return(__lines)
+
+def displayLines(grid: Grid, stats: dict = {}, view: str = "auto") -> list[str]:
+	""" Format a grid in a display mode of `VIEWS` """
+
+	__mode = matrixMode(grid, view)
+
+	return(matrixLines(grid, stats) if(__mode == "cells") else densityLines(grid, stats, __mode))
+
+def valuesLines(values) -> list[str]:
+	""" Format a matrix of values, e.g. an arithmetic result, clipped to the terminal
+
+		Args:
+			values (numpy.ndarray | list[list]): the rows of the matrix
+
+		Returns:
+			list[str]: the lines of the matrix
+
+	"""
+
+	__columns, __lines	= get_terminal_size()
+	y, x				= len(values), len(values[0])
+	__rows				= min(y, max(3, __lines-2))
+	__cells				= [ [ f"{v:g}" if(isinstance(v, float)) else str(v) for v in list(values[i][0:min(x, max(1, __columns//3))]) ] for i in range(0, __rows) ]
+	__width				= max([ len(v) for row in __cells for v in row ])
+	__visible			= min(x, max(1, (__columns-4)//(__width+2)))
+	__lines				= list[str]([])
+
+	for row in __cells:
+		__lines.append(f" [{', '.join([ v.rjust(__width) for v in row[0:__visible] ])}{', ...' if(__visible < x) else ''}]")
+
+	if(__rows < y):
+		__lines.append(f" ... {y-__rows} more rows")
+
+	return(__lines)
+
+class MatrixRenderer:
+
+	""" Diff-based ANSI renderer animating a grid.
+
+		The cell `(x, y)` of a row formatted as ` [0, 1, ...] = n` is at the terminal
+		position `(y+1, 3+3x)`, the row tail starts at the column `3*grid.x+2`. Changed
+		cells are registered with `point()`, the next `frame()` repaints them, the
+		tails of their rows and the rows whose statistics changed, nothing else.
+
+		A call to `frame()` before the time of the next frame returns at once while
+		fewer than `batch` cells changed, the changes are kept for the next one, and
+		waits for that time once the batch is complete: only `fps` frames are written
+		per second, each one showing at least one change.
+
+		When the matrix doesn't fit in the terminal, the cursor can't reach all its
+		rows, the renderer falls back on a full redraw on each frame: of the visible
+		part in the "cells" view, of the whole matrix downsampled in the density views.
+		Full redraws overwrite the previous frame from the top left corner instead of
+		clearing the screen, which would flicker.
+
+		Attributes:
+			fps (float): Target frame rate, 0 to render as fast as possible.
+			batch (int): Number of changes shown by frame, `ceil(cells/FRAME_FILL)`.
+			view (str): The display mode, one of `VIEWS` except "auto".
+
+		Private Attributes:
+			__grid (Grid): The animated grid.
+			__stream (TextIO): The output stream of the frames.
+			__points (set[tuple[int, int]]): Cells changed since the last frame.
+			__changes (int): Number of changes since the last frame.
+			__extras (dict[int, str]): Statistics text displayed by row index.
+			__deadline (float): Time of the next frame.
+			__fits (bool): Whether the matrix fits in the terminal.
+			__pending (dict | None): Statistics of the last skipped frame, None when the screen is up to date.
+
+		Methods:
+
+			draw(stats: dict = {}) -> None:
+				Clears the screen and draws the whole matrix.
+
+			point(x: int, y: int) -> None:
+				Registers a changed cell for the next frame.
+
+			frame(stats: dict = {}, full: bool = False) -> None:
+				Repaints the changes in a single write once the frame time is reached or the batch complete, or waits for it to redraw the whole matrix when full.
+
+			close() -> None:
+				Writes the last skipped frame, moves the cursor under the matrix and shows it again.
+
+	"""
+
+	def __init__(self, grid: Grid, fps: float = 20, stream: TextIO = stdout, view: str = "auto"):
+		__view = matrixView(grid)
+
+		self.fps		: float						= max(0, float(fps))
+		self.batch		: int						= max(1, ceil(len(grid)/FRAME_FILL))
+		self.view		: str						= matrixMode(grid, view)
+		self.__grid		: Grid						= grid
+		self.__stream	: TextIO					= stream
+		self.__points	: set[tuple[int, int]]		= set()
+		self.__changes	: int						= int(0)
+		self.__extras	: dict[int, str]			= dict({})
+		self.__deadline	: float						= perf_counter()
+		self.__fits		: bool						= bool((self.view == "cells") and (__view == (grid.x, grid.y)))
+		self.__pending	: dict | None				= None
+
+	def __wait(self) -> None:
+		""" Private method pacing the full frames on the target frame rate, e.g. the generations of an automaton
+
+			The deadline moves by a frame period on each frame, the time spent to
+			compute and write the frame is deduced from the sleep.
+
+		"""
+
+		if(not self.fps):
+			return
+
+		__now = perf_counter()
+		self.__deadline = max(self.__deadline+(1/self.fps), __now)
+		sleep(self.__deadline-__now)
+
+	def draw(self, stats: dict = {}) -> None:
+		self.__extras = matrixExtras(self.__grid, stats)
+		self.__points.clear()
+		self.__changes = 0
+
+		self.__stream.write("".join([ ANSI["hide"], ANSI["clear"], "\n".join(displayLines(self.__grid, stats, self.view)) ]))
+		self.__stream.flush()
+		self.__deadline	= perf_counter()
+		self.__pending	= None
+
+	def __redraw(self, stats: dict = {}) -> None:
+		""" Private method overwriting the whole previous frame """
+
+		self.__points.clear()
+		self.__changes = 0
+
+		self.__stream.write("".join([ ANSI["home"], f"{ANSI['eol']}\n".join(displayLines(self.__grid, stats, self.view)), ANSI["eol"], ANSI["eos"] ]))
+		self.__stream.flush()
+
+	def point(self, x: int, y: int) -> None:
+		self.__changes += 1
+
+		if(self.__fits):
+			self.__points.add((x, y))
+
+	def __diff(self, stats: dict = {}) -> None:
+		""" Private method repainting the changed cells and the changed row tails """
+
+		__extras	= matrixExtras(self.__grid, stats)
+		__rows		= set[int]([ y for _, y in self.__points ])
+		__buffer	= list[str]([])
+
+		for x, y in self.__points:
+			__buffer.append(f"\033[{y+1};{3+3*x}H{self.__grid.get(x, y)}")
+
+		for y, extra in __extras.items():
+			if(self.__extras.get(y) != extra):
+				__rows.add(y)
+
+		for y in __rows:
+			__tail = matrixTail(self.__grid, y, self.__grid.rowSum(y), __extras)
+			__buffer.append(f"\033[{y+1};{3*self.__grid.x+2}H{__tail}{ANSI['eol']}")
+
+		self.__extras = __extras
+		self.__points.clear()
+		self.__changes = 0
+
+		self.__stream.write("".join(__buffer))
+		self.__stream.flush()
+
+	def frame(self, stats: dict = {}, full: bool = False) -> None:
+		""" Write a frame of the changes since the previous one, once its time is reached
+
+			Before that time, the changes are kept for the next frame until the batch is
+			complete, then the frame waits for its time.
+
+			Args:
+				stats (dict, optional): the run statistics, e.g. { "Iterations": "1/3" }. Defaults to {}.
+				full (bool, optional): True to redraw the whole matrix now, then wait for the next frame time. Defaults to False.
+
+		"""
+
+		if(full):
+			self.__pending = None
+			self.__redraw(stats)
+			self.__wait()
+			return
+
+		__now = perf_counter()
+
+		if(self.fps and (__now < self.__deadline)):
+			if(self.__changes < self.batch):
+				self.__pending = stats
+				return
+
+			sleep(self.__deadline-__now)
+			__now = perf_counter()
+
+		self.__pending	= None
+		self.__deadline	= max(self.__deadline+(1/self.fps), __now) if(self.fps) else __now
+
+		self.__diff(stats) if(self.__fits) else self.__redraw(stats)
+
+	def close(self) -> None:
+		if(self.__pending is not None):
+			self.__diff(self.__pending) if(self.__fits) else self.__redraw(self.__pending)
+			self.__pending = None
+
+		self.__stream.write(f"\033[{self.__grid.y};1H\n{ANSI['show']}" if(self.__fits) else f"\n{ANSI['show']}")
+		self.__stream.flush()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Seeded random generator drawing integers in batches.
+
+	The random draws of the `Matrix` tool are made one by one through
+	`random.randrange`, whose cost is mostly the Python call overhead of its
+	argument checks and of its rejection loop. This generator produces 64 bits
+	words in batches, with a NumPy `Generator` when NumPy is installed or a single
+	`getrandbits` call split into words otherwise, and maps a word to `[0, n)` with
+	a multiplication and a shift, `(word*n) >> 64`, which has a bias under `n/2^64`.
+
+	A generator seeded with the same value replays the same draws, on the same
+	backend: NumPy and the fallback don't produce the same sequences.
+
+	Constants:
+	- BATCH: Number of 64 bits words generated at once.
+
+"""
+
+from array import array
+from random import Random
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+BATCH : int = 4096
+""" Number of 64 bits words generated at once
+"""
+
+class BatchRandom:
+
+	""" Random integer generator buffering batches of 64 bits words.
+
+		Attributes:
+			seed (int | None): The seed, None to seed from the system entropy.
+			numpy (bool): Whether the words come from a NumPy `Generator`.
+
+		Private Attributes:
+			__generator (numpy.random.Generator | random.Random): The source of the words.
+			__next (Callable): Returns the next buffered word, raises StopIteration when the batch is used up.
+
+		Methods:
+
+			randbelow(n: int) -> int:
+				Returns a random integer in `[0, n)`, usable as the `randbelow` of `Grid.randomPoint`.
+
+		Example:
+			>>> rng = BatchRandom(42)
+			>>> grid.randomPoint(0, rng.randbelow)
+
+	"""
+
+	def __init__(self, seed: int = None, numpy: bool = True, batch: int = BATCH):
+		self.seed	: int	= None if(seed is None) else int(seed)
+		self.numpy	: bool	= bool(numpy and (np is not None))
+		self.__batch: int	= int(batch)
+
+		self.__generator	= np.random.default_rng(self.seed) if(self.numpy) else Random(self.seed)
+		self.__next			= iter(()).__next__
+
+	def __refill(self) -> None:
+		""" Private method generating the next batch of words """
+
+		if(self.numpy):
+			__words = self.__generator.bit_generator.random_raw(self.__batch).tolist()
+
+		else:
+			__words = array("Q", self.__generator.getrandbits(64*self.__batch).to_bytes(8*self.__batch, "little")).tolist()
+
+		self.__next = iter(__words).__next__
+
+	def randbelow(self, n: int) -> int:
+		try:
+			return((self.__next()*n) >> 64)
+
+		except(StopIteration):
+			self.__refill()
+			return((self.__next()*n) >> 64)
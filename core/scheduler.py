@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Time-based triggers and scheduler loop.
+
+	This module parses cron-style expressions and runs callbacks when their triggers
+	are due. Triggers are kept in a heap ordered by their next fire time, so a wake-up
+	costs O(log n) whatever the number of triggers, instead of polling all of them.
+
+	A trigger woken up too late (e.g. suspended machine) is a misfire: the missed
+	occurrences are coalesced into a single run, or skipped with the "skip" policy.
+	A job still running when its trigger fires again is never started twice, and
+	the triggers of a job due by the time it last fired, e.g. several triggers
+	matching the same minute, are coalesced into that fire.
+
+	Constants:
+	- CRON_ALIASES: Shortcuts for common expressions, including "@hourly", "@daily", "@weekly", "@monthly", "@yearly".
+	- MISFIRE_GRACE: Delay in seconds after which a late trigger is considered as misfired.
+
+"""
+
+from datetime import datetime, timedelta
+from heapq import heappop, heappush
+from itertools import count
+from threading import Event, Lock, Thread
+from time import time
+from traceback import format_exc
+from typing import Callable
+
+from core.colors import Colors
+from core.exceptions import ValidationError
+from core.icons import Icons
+
+CRON_ALIASES : dict[str, str] = dict({
+	"@hourly": "0 * * * *",
+	"@daily": "0 0 * * *",
+	"@weekly": "0 0 * * 0",
+	"@monthly": "0 0 1 * *",
+	"@yearly": "0 0 1 1 *"
+})
+""" Shortcuts for common expressions, including "@hourly", "@daily", "@weekly", "@monthly", "@yearly"
+"""
+
+MISFIRE_GRACE : float = 60
+""" Delay in seconds after which a late trigger is considered as misfired
+"""
+
+CRON_FIELDS = tuple[tuple[str, int, int]]((
+	("minute", 0, 59),
+	("hour", 0, 23),
+	("day", 1, 31),
+	("month", 1, 12),
+	("weekday", 0, 7)
+))
+
+class Cron:
+
+	""" Cron-style trigger expression.
+
+		Supports the 5 standard fields `minute hour day month weekday` with `*`,
+		lists `1,2`, ranges `1-5` and steps `*/15`, plus the `CRON_ALIASES`.
+		Weekdays run from 0 (sunday) to 6, 7 is also accepted for sunday.
+
+		Attributes:
+			expression (str): The source expression.
+
+		Methods:
+
+			next(after: datetime) -> datetime:
+				Returns the first fire time strictly after a date.
+
+			nexts(after: datetime, n: int = 5) -> list[datetime]:
+				Returns the n next fire times after a date.
+
+		Example:
+			>>> Cron("*/15 9-18 * * 1-5").next(datetime(2025, 1, 6, 9, 7))
+			datetime.datetime(2025, 1, 6, 9, 15)
+
+	"""
+
+	def __init__(self, expression: str):
+		self.expression	: str = str(expression).strip()
+		__fields		= CRON_ALIASES.get(self.expression, self.expression).split()
+
+		if(len(__fields) != len(CRON_FIELDS)):
+			raise(ValidationError("cron", f'"{self.expression}" must have {len(CRON_FIELDS)} fields'))
+
+		__values = [ self.__parse(f, *CRON_FIELDS[i]) for i, f in enumerate(__fields) ]
+
+		self.__minutes	: tuple[int]	= tuple(sorted(__values[0]))
+		self.__hours	: set[int]		= __values[1]
+		self.__days		: set[int]		= __values[2]
+		self.__months	: set[int]		= __values[3]
+		self.__weekdays	: set[int]		= set([ d%7 for d in __values[4] ])
+		self.__anyDay	: bool			= bool(__fields[2] == "*")
+		self.__anyWeek	: bool			= bool(__fields[4] == "*")
+
+	def __repr__(self) -> str:
+		return(f'Cron("{self.expression}")')
+
+	def __parse(self, field: str, name: str, low: int, high: int) -> set[int]:
+		""" Private method to expand a cron field into its values
+
+			Args:
+				field (str): the field expression, e.g. "*/15" or "1-5,10"
+				name (str): the field name used on errors
+				low (int): the lowest accepted value
+				high (int): the highest accepted value
+
+			Returns:
+				set[int]: the values matched by the field
+
+		"""
+
+		__values = set[int]()
+
+		try:
+			for part in field.split(","):
+				__range, _, __step = part.partition("/")
+				__step = int(__step or 1)
+
+				if(__range == "*"):
+					__start, __end = low, high
+
+				elif("-" in __range):
+					__start, __end = [ int(v) for v in __range.split("-") ]
+
+				else:
+					__start = int(__range)
+					__end	= high if(__step > 1) else __start
+
+				if((__start < low) or (__end > high) or (__start > __end) or (__step < 1)):
+					raise(ValueError)
+
+				__values.update(range(__start, __end+1, __step))
+
+		except(ValueError):
+			raise(ValidationError(name, f'"{field}" is out of range {low}-{high}'))
+
+		return(__values)
+
+	def __matchDay(self, date: datetime) -> bool:
+		""" Private method to match a date on the day and weekday fields
+
+			As in cron, when both fields are restricted a date matches either of them.
+
+		"""
+
+		__day		= bool(date.day in self.__days)
+		__weekday	= bool((date.weekday()+1)%7 in self.__weekdays)
+
+		if(self.__anyDay or self.__anyWeek):
+			return(__day and __weekday)
+
+		return(__day or __weekday)
+
+	def next(self, after: datetime) -> datetime:
+		""" Compute the first fire time strictly after a date
+
+			Unmatched months, days and hours are skipped as a whole, so the search
+			stays short even for sparse expressions.
+
+			Args:
+				after (datetime): the reference date
+
+			Returns:
+				datetime: the next fire time
+
+			Raise a ValidationError if the expression never matches (e.g. "0 0 31 2 *")
+
+		"""
+
+		__date	= after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+		__limit	= __date + timedelta(days=366*5)
+
+		while(__date < __limit):
+			if(__date.month not in self.__months):
+				__date = (__date.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+
+			elif(not self.__matchDay(__date)):
+				__date = __date.replace(hour=0, minute=0) + timedelta(days=1)
+
+			elif(__date.hour not in self.__hours):
+				__date = __date.replace(minute=0) + timedelta(hours=1)
+
+			else:
+				for minute in self.__minutes:
+					if(minute >= __date.minute):
+						return(__date.replace(minute=minute))
+
+				__date = __date.replace(minute=0) + timedelta(hours=1)
+
+		raise(ValidationError("cron", f'"{self.expression}" never matches'))
+
+	def nexts(self, after: datetime, n: int = 5) -> list[datetime]:
+		__dates = list[datetime]([])
+
+		for _ in range(0, int(n)):
+			after = self.next(after)
+			__dates.append(after)
+
+		return(__dates)
+
+class Scheduler:
+
+	""" Heap-ordered timer queue running callbacks on cron triggers.
+
+		Each entry of the heap is `(fire time, sequence, key, cron)`, the sequence
+		keeps the order stable between triggers firing at the same time. Callbacks
+		run on their own thread, a key already running is skipped on its next fire,
+		a trigger due before the last fire of its key is silently dropped.
+
+		Private Attributes:
+			__heap (list[tuple]): The timer queue.
+			__jobs (dict[str, tuple[Callable, str]]): Callback and misfire policy by key.
+			__running (set[str]): Keys whose callback is still running.
+			__fired (dict[str, float]): Timestamp of the last fire by key.
+			__stop (Event): Event interrupting the loop.
+
+		Methods:
+
+			add(key: str, cron: Cron, callback: Callable, misfire: str = "run") -> datetime:
+				Registers a trigger and returns its first fire time.
+
+			run() -> bool:
+				Waits for the triggers and runs their callbacks until stopped.
+
+			stop() -> None:
+				Interrupts the loop.
+
+	"""
+
+	def __init__(self, grace: float = MISFIRE_GRACE):
+		self.__grace	: float							= float(grace)
+		self.__heap		: list[tuple]					= list[tuple]([])
+		self.__jobs		: dict[str, tuple[Callable, str]] = dict({})
+		self.__lock		: Lock							= Lock()
+		self.__running	: set[str]						= set[str]()
+		self.__fired	: dict[str, float]				= dict({})
+		self.__sequence	: count							= count()
+		self.__stop		: Event							= Event()
+
+	def __push(self, key: str, cron: Cron, after: datetime) -> datetime:
+		__next = cron.next(after)
+		heappush(self.__heap, (__next.timestamp(), next(self.__sequence), key, cron))
+
+		return(__next)
+
+	def __execute(self, key: str) -> None:
+		""" Private method running a callback and releasing its key """
+
+		try:
+			self.__jobs[key][0]()
+
+		except(Exception):
+			print(f"{Icons.err}{key}: {format_exc()}")
+
+		finally:
+			with self.__lock:
+				self.__running.discard(key)
+
+	def __fire(self, key: str, due: float, now: float) -> None:
+		""" Private method applying the misfire and overlap rules before a run
+
+			Args:
+				key (str): the trigger key
+				due (float): the expected fire timestamp
+				now (float): the current timestamp
+
+		"""
+
+		if(due <= self.__fired.get(key, float(0))):
+			return
+
+		__stamp				= datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+		self.__fired[key]	= now
+
+		if((now-due > self.__grace) and (self.__jobs[key][1] == "skip")):
+			print(f"{Icons.warn}{__stamp} {key} misfired, skipped")
+			return
+
+		with self.__lock:
+			if(key in self.__running):
+				print(f"{Icons.warn}{__stamp} {key} still running, skipped")
+				return
+
+			self.__running.add(key)
+
+		print(f"{Icons.play}{__stamp} Trigger {Colors.cyan}{key}{Colors.end}")
+		Thread(target=self.__execute, args=(key, ), daemon=True).start()
+
+	def add(self, key: str, cron: Cron, callback: Callable, misfire: str = "run") -> datetime:
+		""" Register a trigger
+
+			Args:
+				key (str): the trigger key, a key can have several triggers
+				cron (Cron): the trigger expression
+				callback (Callable): the function to run when the trigger fires
+				misfire (str, optional): "run" to coalesce missed fires into a single run,
+					"skip" to ignore them. Defaults to "run".
+
+			Returns:
+				datetime: the first fire time
+
+		"""
+
+		if(misfire not in ("run", "skip")):
+			raise(ValidationError("misfire", f'"{misfire}" must be "run" or "skip"'))
+
+		self.__jobs[key] = (callback, misfire)
+
+		return(self.__push(key, cron, datetime.now()))
+
+	def run(self) -> bool:
+		""" Wait for the next triggers and run their callbacks until stopped
+
+			Only the head of the heap is checked on each wake-up, the next fire time
+			of a trigger is computed from the current time, so missed occurrences
+			are never replayed one by one.
+
+			Returns:
+				bool: True value when exiting
+
+		"""
+
+		try:
+			while(self.__heap and not self.__stop.is_set()):
+				__due, _, __key, __cron = self.__heap[0]
+
+				if(self.__stop.wait(max(0, __due-time()))):
+					break
+
+				heappop(self.__heap)
+				__now = time()
+				self.__fire(__key, __due, __now)
+				self.__push(__key, __cron, datetime.fromtimestamp(__now))
+
+		except(KeyboardInterrupt):
+			print(f"\n{Icons.info}Scheduler stopped")
+
+		return(True)
+
+	def stop(self) -> None:
+		self.__stop.set()
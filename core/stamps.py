@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Incremental runs of the schedules of the `Shell` tool.
+
+	A command of a schedule can declare the globs of its `inputs` and `outputs`
+	files. After its successful run, the size, the modification time and the
+	SHA-256 digest of each of its input files are kept in the state file of the
+	schedule. The next run skips the command as long as the same input files are
+	found unchanged and each output glob matches a file, as `make` would.
+
+	A file is first compared by size and modification time, only read when its
+	time changed with the same size, e.g. on a checkout or a touch, where the
+	digest decides and the new time is kept. An up-to-date schedule is checked
+	without reading any file.
+
+	The globs are relative to the directory of the schedule, where its commands
+	run, whatever the working directory of the tool, and recursive with `**`. The
+	files are kept by their path relative to it.
+
+	Constants:
+	- STAMP_CHUNK: Number of bytes of a file read at once to compute its digest.
+
+"""
+
+from glob import glob
+from hashlib import sha256
+from json import dump, load
+from os import makedirs, replace, stat
+from os.path import dirname, isfile, join
+from threading import Lock
+
+STAMP_CHUNK : int = 2**20
+""" Number of bytes of a file read at once to compute its digest
+"""
+
+def expand(patterns: list[str], root: str = ".") -> list[str]:
+	""" List the files matching globs relative to a directory, sorted and without duplicates """
+
+	return(sorted({ path for pattern in patterns for path in glob(pattern, root_dir=root, recursive=True) if(isfile(join(root, path))) }))
+
+def stamp(path: str) -> dict:
+	""" Take the size, the modification time in nanoseconds and the SHA-256 digest of a file, read by chunks """
+
+	__stat		= stat(path)
+	__digest	= sha256()
+
+	with open(path, "rb") as file:
+		for chunk in iter(lambda:file.read(STAMP_CHUNK), b""):
+			__digest.update(chunk)
+
+	return(dict({ "size": __stat.st_size, "mtime": __stat.st_mtime_ns, "sha256": __digest.hexdigest() }))
+
+class Stamps:
+
+	""" Stamps of the inputs of the commands of a schedule at their last successful run.
+
+		Attributes:
+			path (str): Path of the state file of the schedule.
+			root (str): Directory of the schedule, the globs and the stamped files are relative to it.
+
+		Private Attributes:
+			__stamps (dict[str, dict]): The command line and the stamps of the input files, by command id.
+			__changed (bool): Whether the stamps have to be saved.
+			__lock (Lock): Serializes the updates of the commands run together.
+
+		Methods:
+
+			fresh(task: dict) -> bool:
+				Checks if a command is up to date.
+
+			update(task: dict) -> None:
+				Stamps the inputs of a command after its successful run.
+
+			save() -> None:
+				Writes the state file when a stamp changed.
+
+		Example:
+			>>> stamps = Stamps("Shell/States/build.json", "/home/user/project")
+			>>> task = { "id": "cc", "cmd": "make", "inputs": [ "src/*.c" ], "outputs": [ "app" ] }
+			>>> stamps.fresh(task)
+			False
+			>>> stamps.update(task)
+			>>> stamps.save()
+
+	"""
+
+	def __init__(self, path: str, root: str = "."):
+		self.path : str = str(path)
+		self.root : str = str(root)
+
+		self.__stamps	= dict[str, dict]({})
+		self.__changed	= False
+		self.__lock		= Lock()
+
+		try:
+			with open(self.path, "r", encoding="utf-8") as json:
+				self.__stamps = dict[str, dict](load(json))
+
+		except(FileNotFoundError, ValueError):
+			pass
+
+	def __same(self, path: str, previous: dict) -> bool:
+		""" Private method comparing a file to its stamp, by digest only when its time changed """
+
+		__stat = stat(join(self.root, path))
+
+		if(__stat.st_size != previous["size"]):
+			return(False)
+
+		if(__stat.st_mtime_ns == previous["mtime"]):
+			return(True)
+
+		__stamp = stamp(join(self.root, path))
+
+		if(__stamp["sha256"] != previous["sha256"]):
+			return(False)
+
+		with self.__lock:
+			previous["mtime"]	= __stamp["mtime"]
+			self.__changed		= True
+
+		return(True)
+
+	def fresh(self, task: dict) -> bool:
+		""" Check if a command is up to date
+
+			Args:
+				task (dict): the command, with its "id", "cmd", "inputs" and "outputs"
+
+			Returns:
+				bool: True when the command declares files, ran with the same command line,
+				has the same unchanged input files and an existing file for each output glob
+
+		"""
+
+		if(not (task["inputs"] or task["outputs"])):
+			return(False)
+
+		__previous = self.__stamps.get(task["id"])
+
+		if((not __previous) or (__previous["cmd"] != task["cmd"])):
+			return(False)
+
+		if(not all([ expand([ pattern ], self.root) for pattern in task["outputs"] ])):
+			return(False)
+
+		__files = expand(task["inputs"], self.root)
+
+		if(__files != sorted(__previous["inputs"])):
+			return(False)
+
+		try:
+			return(all([ self.__same(path, __previous["inputs"][path]) for path in __files ]))
+
+		except(FileNotFoundError):
+			return(False)
+
+	def update(self, task: dict) -> None:
+		if(not (task["inputs"] or task["outputs"])):
+			return
+
+		__inputs = dict[str, dict]({ path: stamp(join(self.root, path)) for path in expand(task["inputs"], self.root) })
+
+		with self.__lock:
+			self.__stamps[task["id"]]	= dict({ "cmd": task["cmd"], "inputs": __inputs })
+			self.__changed				= True
+
+	def save(self) -> None:
+		""" Write the state file when a stamp changed, through a temporary file """
+
+		with self.__lock:
+			if(not self.__changed):
+				return
+
+			makedirs(dirname(self.path) or ".", exist_ok=True)
+
+			with open(f"{self.path}.tmp", "w", encoding="utf-8") as json:
+				dump(self.__stamps, json, sort_keys=True, indent=2)
+
+			replace(f"{self.path}.tmp", self.path)
+			self.__changed = False
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Tiled parallel updates of grids in shared memory.
+
+	This module splits the cells of a large grid into tiles of whole rows, processed
+	by a pool of processes. The cells live in `multiprocessing.shared_memory`
+	blocks that each worker attaches once by name: a task only carries the names,
+	the shape and the rows of its tile, and returns small results such as counters.
+	No cell is ever pickled between the processes.
+
+	A tile holds about `TILE_CELLS` cells whatever the number of workers, so the
+	random fill of a tile, seeded with the seed and the tile index, gives the same
+	cells with 1 or 8 workers.
+
+	The cells are a `(y, x)` uint8 array, unpacked from the bits backend, so the
+	pool needs NumPy. A pool can hold several blocks of cells for double-buffered
+	updates, e.g. the automaton steps of `core.life`: each tile reads its rows and
+	the halo rows of its neighbours in a block and writes its next generation in
+	the other one, then both blocks are swapped.
+
+	The tasks are module level functions, so the process pool can pickle them,
+	called with a tuple of the names of the blocks, their shape, the index of the
+	tile, its first and last rows, and the arguments of the task.
+
+	With a single worker, `fillGrid` fills the cells of the grid in place, tile by
+	tile with the same seeds, without any shared memory block nor copy. Without
+	NumPy, it draws the cells with `random.Random`, which gives other cells.
+
+	Constants:
+	- TILE_CELLS: Number of cells of a tile, rounded to whole rows.
+
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from random import Random
+from sys import version_info
+from typing import Callable
+
+try:
+	import numpy as np
+
+except(ModuleNotFoundError):
+	np = None
+
+from core.grid import Grid
+
+TILE_CELLS : int = 2**20
+""" Number of cells of a tile, rounded to whole rows
+"""
+
+SHARED = dict({})
+
+def attach(name: str, shape: tuple[int, int]):
+	""" Map a shared memory block as a `(y, x)` uint8 array, once by process
+
+		The blocks are created, tracked and unlinked by the `TilePool`, which maps
+		them first, the workers only attach them, without registering them to the
+		resource tracker when Python allows it.
+
+	"""
+
+	if(name not in SHARED):
+		__memory		= SharedMemory(name, track=False) if(version_info >= (3, 13)) else SharedMemory(name)
+		SHARED[name]	= (__memory, np.ndarray(shape, dtype=np.uint8, buffer=__memory.buf))
+
+	return(SHARED[name][1])
+
+def fillTile(params: tuple) -> tuple[list[int], list[int]]:
+	""" Fill a tile at random and count its cells
+
+		Args:
+			params (tuple): the task arguments, followed by the density and the seed
+
+		Returns:
+			tuple[list[int], list[int]]: the row sums of the tile and its column sums
+
+	"""
+
+	__names, __shape, __tile, __start, __end, __density, __seed = params
+
+	__cells = attach(__names[0], __shape)
+	__cells[__start:__end] = np.random.default_rng([ __tile, __seed ]).random((__end-__start, __shape[1])) < __density
+
+	return(countTile(params[0:5]))
+
+def fillGrid(grid: Grid, density: float = .5, seed: int = None) -> int:
+	""" Fill a dense or bits grid at random in the current process
+
+		Args:
+			grid (Grid): the grid, filled in place
+			density (float, optional): the probability of a cell to be set. Defaults to .5.
+			seed (int, optional): the seed of the fill, None to seed from the system entropy. Defaults to None.
+
+		Returns:
+			int: the number of set cells
+
+	"""
+
+	if(grid.backend not in ("numpy", "bytearray", "bits")):
+		raise(ValueError("The random fill needs a dense or bits matrix"))
+
+	__buffer = grid.buffer()
+	__stride = (grid.x+7)//8 if(grid.backend == "bits") else grid.x
+
+	if(np is not None):
+		__seed	= np.random.SeedSequence(seed).entropy
+		__rows	= max(1, TILE_CELLS//grid.x)
+		__cells	= np.frombuffer(__buffer, dtype=np.uint8).reshape(grid.y, __stride)
+
+		for i, start in enumerate(range(0, grid.y, __rows)):
+			__tile = np.random.default_rng([ i, __seed ]).random((min(start+__rows, grid.y)-start, grid.x)) < density
+			__cells[start:start+__rows] = np.packbits(__tile, axis=1, bitorder="little") if(grid.backend == "bits") else __tile
+
+		return(grid.recount())
+
+	__random = Random(seed)
+
+	for i in range(0, grid.y):
+		__row = [ __random.random() < density for _ in range(0, grid.x) ]
+
+		if(grid.backend == "bits"):
+			__buffer[i*__stride:(i+1)*__stride] = sum([ 1 << j for j, cell in enumerate(__row) if(cell) ]).to_bytes(__stride, "little")
+
+		else:
+			__buffer[i*__stride:(i+1)*__stride] = bytes(__row)
+
+	return(grid.recount())
+
+def countTile(params: tuple) -> tuple[list[int], list[int]]:
+	""" Count the cells of a tile by row and by column """
+
+	__names, __shape, _, __start, __end = params
+	__cells = attach(__names[0], __shape)[__start:__end]
+
+	return(__cells.sum(axis=1, dtype=np.int64).tolist(), __cells.sum(axis=0, dtype=np.int64).tolist())
+
+class TilePool:
+
+	""" Pool of processes updating cells in shared memory by tiles of rows.
+
+		Attributes:
+			x (int): Number of columns.
+			y (int): Number of rows.
+			workers (int): Number of processes, 1 to process the tiles in the current process.
+			tiles (list[tuple[int, int]]): First and last rows of each tile.
+			cells (numpy.ndarray): The current cells, a `(y, x)` uint8 array in shared memory.
+
+		Private Attributes:
+			__blocks (list[SharedMemory]): The shared memory blocks, the current cells first.
+			__pool (ProcessPoolExecutor | None): The processes.
+
+		Methods:
+
+			fill(density: float = .5, seed: int = None) -> tuple[list[int], list[int]]:
+				Sets each cell alive with a probability, returns the row and column sums.
+
+			counts() -> tuple[list[int], list[int]]:
+				Returns the row and column sums.
+
+			map(fn: Callable, *args) -> list:
+				Runs a task on each tile and returns its results, in the order of the tiles.
+
+			swap() -> None:
+				Moves the next block of cells in first position, the current one in last.
+
+			load(grid: Grid) -> None:
+				Copies the cells of a dense or bits grid.
+
+			store(grid: Grid) -> int:
+				Copies the cells into a dense or bits grid, rebuilds its counters and returns its total.
+
+			close() -> None:
+				Stops the processes and releases the shared memory.
+
+		Example:
+			>>> with TilePool(4096, 4096, 4) as pool:
+			...     rows, cols = pool.fill(.3, 42)
+			...     pool.store(grid)
+
+	"""
+
+	def __init__(self, x: int, y: int, workers: int = 1, buffers: int = 1):
+		""" Allocate the shared cells and start the processes
+
+			Args:
+				x (int): the number of columns
+				y (int): the number of rows
+				workers (int, optional): the number of processes. Defaults to 1.
+				buffers (int, optional): the number of blocks of cells, 2 to step an automaton. Defaults to 1.
+
+		"""
+
+		if(np is None):
+			raise(ValueError("The tiled updates need NumPy"))
+
+		self.x			: int	= int(x)
+		self.y			: int	= int(y)
+		self.workers	: int	= max(1, int(workers))
+
+		__rows			= max(1, TILE_CELLS//self.x)
+		self.tiles		= list[tuple[int, int]]([ (i, min(i+__rows, self.y)) for i in range(0, self.y, __rows) ])
+
+		self.__blocks	= list[SharedMemory]([ SharedMemory(create=True, size=self.x*self.y) for _ in range(0, max(1, int(buffers))) ])
+		self.__pool		= ProcessPoolExecutor(max_workers=self.workers) if(self.workers > 1) else None
+
+		for block in self.__blocks:
+			SHARED[block.name] = (block, np.ndarray((self.y, self.x), dtype=np.uint8, buffer=block.buf))
+
+		self.cells = attach(self.__blocks[0].name, (self.y, self.x))
+
+	def __enter__(self):
+		return(self)
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def map(self, fn: Callable, *args) -> list:
+		""" Run a task on each tile, in the processes or in the current one
+
+			Args:
+				fn (Callable): a module level function of a tuple, see the tasks of the module
+				*args: the arguments of the task, the same for each tile
+
+			Returns:
+				list: the results of the tiles
+
+		"""
+
+		__names		= tuple[str]([ block.name for block in self.__blocks ])
+		__params	= [ (__names, (self.y, self.x), i, start, end, *args) for i, (start, end) in enumerate(self.tiles) ]
+
+		if(self.__pool):
+			return(list(self.__pool.map(fn, __params)))
+
+		return(list([ fn(p) for p in __params ]))
+
+	def swap(self) -> None:
+		self.__blocks	= self.__blocks[1:]+self.__blocks[0:1]
+		self.cells		= attach(self.__blocks[0].name, (self.y, self.x))
+
+	def __merge(self, counts: list[tuple[list[int], list[int]]]) -> tuple[list[int], list[int]]:
+		""" Private method joining the row sums and adding the column sums of the tiles """
+
+		__cols = np.zeros(self.x, dtype=np.int64)
+
+		for _, cols in counts:
+			__cols += cols
+
+		return(list[int]([ v for rows, _ in counts for v in rows ]), __cols.tolist())
+
+	def fill(self, density: float = .5, seed: int = None) -> tuple[list[int], list[int]]:
+		return(self.__merge(self.map(fillTile, float(density), np.random.SeedSequence(seed).entropy)))
+
+	def counts(self) -> tuple[list[int], list[int]]:
+		return(self.__merge(self.map(countTile)))
+
+	def load(self, grid: Grid) -> None:
+		if(grid.backend == "bits"):
+			__packed = np.frombuffer(grid.buffer(), dtype=np.uint8).reshape(self.y, -1)
+			self.cells[:] = np.unpackbits(__packed, axis=1, count=self.x, bitorder="little")
+
+		elif(grid.backend in ("numpy", "bytearray")):
+			self.cells[:] = np.frombuffer(grid.buffer(), dtype=np.uint8).reshape(self.y, self.x)
+
+		else:
+			raise(ValueError("The tiled updates need a dense or bits matrix"))
+
+	def store(self, grid: Grid) -> int:
+		if(grid.backend == "bits"):
+			np.frombuffer(grid.buffer(), dtype=np.uint8).reshape(self.y, -1)[:] = np.packbits(self.cells, axis=1, bitorder="little")
+
+		elif(grid.backend in ("numpy", "bytearray")):
+			np.frombuffer(grid.buffer(), dtype=np.uint8).reshape(self.y, self.x)[:] = self.cells
+
+		else:
+			raise(ValueError("The tiled updates need a dense or bits matrix"))
+
+		return(grid.recount())
+
+	def close(self) -> None:
+		if(self.__pool):
+			self.__pool.shutdown()
+			self.__pool = None
+
+		self.cells = None
+
+		for block in self.__blocks:
+			SHARED.pop(block.name, None)
+			block.close()
+			block.unlink()
+
+		self.__blocks = list[SharedMemory]([])
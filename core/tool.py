@@ -31,6 +31,7 @@ class Tool:
 			name (str): Tool name.
 			path (str): Absolute file path to the tool.
 			version (str): Version string of the tool.
+			status (bool): False when the last dispatched command failed, on an uncaught error or a failure reported by the tool.
 
 			_args (list[tuple[tuple[str, str, str], str]]): List of accepted arguments and descriptions.
 			_execs (list[Callable]): List of methods executed when a corresponding argument is found.
@@ -47,6 +48,7 @@ class Tool:
 	name	: str						= ""
 	path	: str						= ""
 	version	: str						= ""
+	status	: bool						= True
 
 	def __init__(self):
 		self._args	= self._args[:] + [
@@ -127,6 +129,7 @@ class Tool:
 		except(Exception):
 			print(f"{Icons.err}{format_exc()}")
 
+		self.status = bool(False)
 		return(False)
 
 	def _helper(self, jumps: list[int] = []) -> None:
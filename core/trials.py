@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Monte Carlo trials of the matrix fill and drain.
+
+	This module runs many independent fill and drain simulations of the `Matrix`
+	tool across a pool of processes. Each trial draws its points from its own
+	`BatchRandom` seeded with `seed+trial`, so a run is reproducible whatever the
+	number of workers and the order in which the trials complete.
+
+	A trial records the number of points placed when the first row and the first
+	column become full during the first fill, and the mean time of a fill and of
+	a drain. The trials are then aggregated into distribution summaries, and
+	written one per line into a CSV file.
+
+	Constants:
+	- TRIAL_FIELDS: Columns of the statistics of a trial, in CSV order.
+	- SUMMARY_FIELDS: Columns of the distribution summary of a statistic.
+
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from csv import DictWriter
+from math import ceil
+from statistics import fmean, median, stdev
+from time import perf_counter
+
+from core.grid import Grid
+from core.rng import BatchRandom
+
+TRIAL_FIELDS = tuple[str]((
+	"trial",
+	"seed",
+	"full_row",
+	"full_col",
+	"fill_time",
+	"drain_time"
+))
+""" Columns of the statistics of a trial, in CSV order
+"""
+
+SUMMARY_FIELDS = tuple[str](("mean", "stdev", "min", "median", "p95", "max"))
+""" Columns of the distribution summary of a statistic
+"""
+
+def trial(params: tuple[int, int, int, int, int, str]) -> dict:
+	""" Run one seeded fill and drain simulation
+
+		The function is module level so the process pool can pickle it.
+
+		Args:
+			params (tuple): the trial index, seed, columns, rows, iterations and storage backend
+
+		Returns:
+			dict: the statistics of the trial, by `TRIAL_FIELDS`
+
+	"""
+
+	__index, __seed, x, y, __iterations, __backend = params
+
+	__random	= BatchRandom(__seed)
+	__grid		= Grid(x, y, mode=__backend)
+	__times		= tuple[list[float], list[float]](([], []))
+	__fullRow	= None
+	__fullCol	= None
+
+	for i in range(0, __iterations):
+		__value = 1-(i%2)
+		__start = perf_counter()
+
+		while(__grid.total() != (0, len(__grid))[__value]):
+			_x, _y = __grid.randomPoint(1-__value, __random.randbelow)
+			__grid.set(_x, _y, __value)
+
+			if(__value and (__fullRow is None) and (__grid.rowSum(_y) == x)):
+				__fullRow = __grid.total()
+
+			if(__value and (__fullCol is None) and (__grid.colSum(_x) == y)):
+				__fullCol = __grid.total()
+
+		__times[i%2].append(perf_counter()-__start)
+
+	return(dict({
+		"trial": __index,
+		"seed": __seed,
+		"full_row": __fullRow,
+		"full_col": __fullCol,
+		"fill_time": fmean(__times[0]) if(__times[0]) else None,
+		"drain_time": fmean(__times[1]) if(__times[1]) else None
+	}))
+
+def runTrials(x: int, y: int, trials: int, workers: int = 1, iterations: int = 2, seed: int = 0, backend: str = "auto") -> list[dict]:
+	""" Run independent trials across a pool of processes
+
+		Args:
+			x (int): number of columns of the matrices
+			y (int): number of rows of the matrices
+			trials (int): number of trials
+			workers (int, optional): number of processes, 1 to run in the current process. Defaults to 1.
+			iterations (int, optional): fills and drains of a trial, a fill then a drain by default. Defaults to 2.
+			seed (int, optional): seed of the first trial, the trial i is seeded with seed+i. Defaults to 0.
+			backend (str, optional): storage of the matrices. Defaults to "auto".
+
+		Returns:
+			list[dict]: the statistics of the trials, in trial order
+
+	"""
+
+	__params = [ (i, seed+i, int(x), int(y), int(iterations), backend) for i in range(0, int(trials)) ]
+
+	if(workers <= 1):
+		return(list[dict](map(trial, __params)))
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		return(list[dict](executor.map(trial, __params, chunksize=max(1, len(__params)//(4*workers)))))
+
+def summary(values: list[float]) -> dict[str, float]:
+	""" Summarize the distribution of a statistic
+
+		The 95th percentile is the nearest rank, a value actually measured.
+
+		Returns:
+			dict[str, float]: the statistic by `SUMMARY_FIELDS`, empty without values
+
+	"""
+
+	__values = sorted([ v for v in values if(v is not None) ])
+
+	if(not __values):
+		return(dict({}))
+
+	return(dict({
+		"mean": fmean(__values),
+		"stdev": stdev(__values) if(len(__values) > 1) else 0.0,
+		"min": __values[0],
+		"median": median(__values),
+		"p95": __values[ceil(.95*len(__values))-1],
+		"max": __values[-1]
+	}))
+
+def writeCsv(path: str, results: list[dict]) -> None:
+	with open(path, "w", newline="", encoding="utf-8") as file:
+		__writer = DictWriter(file, fieldnames=TRIAL_FIELDS)
+		__writer.writeheader()
+		__writer.writerows(results)
@@ -22,6 +22,8 @@ try:
 	from core.config import Config, getConfig, setConfig
 	from core.generate import Generate
 	from core.icons import Icons
+	from core.jobs import JobQueue, Worker, listJobs
+	from core.reloader import Reloader
 
 	# --- Importing the tool registry ---
 	from tools import TOOLS
@@ -51,6 +53,9 @@ def arg(cfg: Config) -> bool:
 			(("-l", "--list"), ""),
 			(("-s", "--set"), "<prop> <value>"),
 			(("-t", "--tool"), "<tool>"),
+			(("-q", "--queue"), "<tool> *"),
+			(("-j", "--jobs"), "*"),
+			(("-w", "--worker"), "*"),
 			(("-h", "--help"), ""),
 			(("-D", "--debug"), ""),
 			(("-v", "--version"), "")
@@ -60,6 +65,9 @@ def arg(cfg: Config) -> bool:
 			"List all registered python tools",
 			("Apply new configuration value on property", "prop: colors|encode|splash"),
 			"Start a selected tools by name",
+			("Add a tool invocation to the jobs queue", "ex: -q tr -t <project>"),
+			("Show the status of the queued jobs", "opt: <id> to show the result of a job"),
+			("Start a worker draining the jobs queue", "opt: --once to stop when the queue is empty"),
 			"Show the helper commands menu",
 			"Launch the script in debug mod",
 			"Show version of script"
@@ -81,6 +89,20 @@ def arg(cfg: Config) -> bool:
 				if(argv[2] in tool.command[0]):
 					launch(tool, argv[2:len(argv)])
 
+		elif(argv[1] in __args["prefix"][4][0]): # -q, --queue
+			if(not any([ argv[2] in tool.command[0] for tool in TOOLS ])):
+				print(f'{Icons.warn}Uknown tool "{argv[2]}" !')
+				return(False)
+
+			with JobQueue() as __queue:
+				print(f'{Icons.info}Job #{__queue.enqueue(argv[2:len(argv)])} "{" ".join(argv[2:len(argv)])}" queued')
+
+		elif(argv[1] in __args["prefix"][5][0]): # -j, --jobs
+			listJobs(job=(int(argv[2]) if(len(argv) > 2) else None))
+
+		elif(argv[1] in __args["prefix"][6][0]): # -w, --worker
+			Worker(TOOLS).run("--once" in argv)
+
 		elif(argv[1] in __args["prefix"][-3][0]): # -h, --help
 			__table = list[str]([
 				f"{INFO['name']} by {INFO['author']}",
@@ -115,6 +137,10 @@ def arg(cfg: Config) -> bool:
 		print(f"{Icons.warn}Insufficient arguments !")
 		return(False)
 
+	except(ValueError) as e:
+		print(f"{Icons.warn}{e}")
+		return(False)
+
 	return(True)
 
 def config(cfg: Config) -> bool:
@@ -185,7 +211,9 @@ def main(cfg: Config) -> bool:
 
 	"""
 
-	__cmds = list[tuple]([ tool.command for tool in TOOLS ] + [
+	__tools		= tuple(TOOLS)
+	__reloader	= Reloader(__tools)
+	__cmds		= list[tuple]([ tool.command for tool in __tools ] + [
 		(("settings", "s"), "(s)ettings"),
 		(("version", "v"), "(v)ersion"),
 		(("help", "h"), "(h)elp"),
@@ -204,11 +232,18 @@ def main(cfg: Config) -> bool:
 		__args = list[str](split(REGEX_ARGS, prompt))
 		__f = bool(False)
 
+		__reloaded = __reloader.reload(__tools)
+		for i, tool in enumerate(__reloaded):
+			if(tool is not __tools[i]):
+				__cmds[i] = tool.command
+
+		__tools = __reloaded
+
 		for i, command in enumerate(__cmds[0:len(__cmds)-4]):
 			if(__args[0] in command[0]):
 				try:
 					__f = bool(True)
-					launch(TOOLS[i], __args)
+					launch(__tools[i], __args)
 					break
 
 				except:
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Tests of the matrix files of `core.gridfile` without NumPy.
+
+	Each test runs a script in a new interpreter where the import of NumPy fails,
+	so the grids and the mapped files take their fallback paths.
+
+"""
+
+from os.path import abspath, dirname, join
+from subprocess import run
+from tempfile import TemporaryDirectory
+
+import sys
+import unittest
+
+ROOT : str = abspath(join(dirname(abspath(__file__)), ".."))
+""" Root of the repository, imported by the scripts
+"""
+
+SCRIPT : str = r"""
+import sys
+sys.modules["numpy"] = None
+sys.path.insert(0, sys.argv[1])
+
+from core.grid import NUMPY, Grid
+from core.gridfile import GridFile
+from core.render import displayLines
+
+assert not NUMPY
+
+grid = Grid(300, 200, mode="dense")
+for i in range(0, 6000):
+	grid.set((i*7)%300, (i*13)%200, 1)
+
+file = GridFile(sys.argv[2])
+file.save(grid)
+loaded = file.load()
+
+assert loaded.total() == grid.total()
+assert loaded.blockSums(7, 5) == grid.blockSums(7, 5)
+
+for view in ("auto", "shade", "braille"):
+	assert displayLines(loaded, {}, view)
+
+print("ok")
+"""
+
+class GridFileWithoutNumPyTest(unittest.TestCase):
+
+	def test_load_and_render_density_views(self):
+		with TemporaryDirectory() as directory:
+			__result = run([ sys.executable, "-c", SCRIPT, ROOT, join(directory, "grid.tmmx") ], capture_output=True, text=True)
+
+		self.assertEqual(__result.returncode, 0, __result.stderr)
+		self.assertEqual(__result.stdout.strip(), "ok")
+
+if(__name__ == "__main__"):
+	unittest.main()
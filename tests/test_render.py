@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+r""" Tests of the frame pacing of `core.render.MatrixRenderer`. """
+
+from io import StringIO
+from os.path import abspath, dirname, join
+from time import perf_counter
+
+import sys
+import unittest
+
+sys.path.insert(0, abspath(join(dirname(abspath(__file__)), "..")))
+
+from core.grid import Grid
+from core.render import MatrixRenderer
+
+class MatrixRendererTest(unittest.TestCase):
+
+	def __animate(self, grid: Grid, fps: float) -> tuple[MatrixRenderer, float]:
+		""" Private method filling a grid point by point through a renderer, returns the renderer and the duration """
+
+		__renderer	= MatrixRenderer(grid, fps, StringIO(), "cells")
+		__start		= perf_counter()
+		__renderer.draw()
+
+		for i in range(0, len(grid)):
+			grid.set(i%grid.x, i//grid.x, 1)
+			__renderer.point(i%grid.x, i//grid.x)
+			__renderer.frame()
+
+		__renderer.close()
+
+		return(__renderer, perf_counter()-__start)
+
+	def test_frames_are_paced_on_the_frame_rate(self):
+		__renderer, __duration = self.__animate(Grid(5, 5, mode="dense"), 50)
+
+		self.assertEqual(__renderer.batch, 1)
+		self.assertGreaterEqual(__duration, .9*(25-1)/50)
+
+	def test_large_matrices_coalesce_the_changes(self):
+		__renderer, __duration = self.__animate(Grid(100, 40, mode="dense"), 50)
+
+		self.assertEqual(__renderer.batch, 20)
+		self.assertGreaterEqual(__duration, .9*(4000//20-1)/50)
+		self.assertLess(__duration, 4000/50)
+
+if(__name__ == "__main__"):
+	unittest.main()
@@ -3,13 +3,30 @@
 
 # tools/matrix.py
 
-from os import system as shell
-from random import randrange
-from time import sleep
+from os import cpu_count, mkdir
+from os.path import abspath, dirname, getsize, splitext
+from sys import platform
+from time import perf_counter
 from traceback import format_exc
 
-from core.colors import Colors
+try:
+	from resource import RUSAGE_SELF, getrusage
+
+except(ModuleNotFoundError):
+	getrusage = None
+
+from core import stringSize
+from core.grid import BACKENDS, BITS_CELLS, NUMPY, Grid
+from core.gridfile import VALUE_DTYPES, GridFile
+from core.icons import Icons
+from core.life import RULE, Life
+from core.linalg import add, convolve, multiply, transpose
+from core.render import ANSI, VIEWS, MatrixRenderer, displayLines, valuesLines
+from core.recorder import Recorder
+from core.rng import BatchRandom
+from core.tiles import TilePool, fillGrid
 from core.tool import Tool
+from core.trials import SUMMARY_FIELDS, TRIAL_FIELDS, runTrials, summary, writeCsv
 
 class Matrix(Tool):
 	command	= (("matrix", "mat"), "(mat)rix")
@@ -19,22 +36,329 @@ class Matrix(Tool):
 
 	def __init__(self, args: list[str]):
 		self._args	= [
-			(("-n", "--new", "<x> <y>"), "Create a matrix with custom dimensions"),
-			(("-r", "--random", "<x> <y> <i>"), "Create a matrix with placed random point")
+			(("-a", "--add", "<a> <b> *"), ("Add two saved matrices", "opt: --save <file> output matrix, <a>.add.tmmx by default")),
+			(("-b", "--bench", "<x> <y> <i> *"), ("Run the random fill and drain headless and report its throughput", "opt: --limit <n> to stop after n points", "opt: --backend <mode> storage of the cells", "opt: --save <file> to run on a matrix file", "opt: --checkpoint <n> points between two saves", "opt: --seed <s> to replay the same draws")),
+			(("-c", "--convolve", "<a> <kernel> *"), ("Convolve a saved matrix by a saved kernel", "opt: --save <file> output matrix, <a>.convolve.tmmx by default")),
+			(("-L", "--life", "<x> <y> <gens> *"), ("Run a life-like automaton on a random matrix", f"opt: --rule <rule> B/S notation, {RULE} by default", "opt: --density <p> of the alive cells at start, 0.3 by default", "opt: --wrap to connect the borders", "opt: --headless to only report the generations/s", "opt: --workers <k> processes stepping bands of rows", "opt: --backend <dense|bits> storage of the cells", "opt: --fps <n> frame rate, --seed <s> of the start", f"opt: --view <{'|'.join(VIEWS)}> display mode, auto by default")),
+			(("-l", "--load", "<file> *"), ("Load a saved matrix and display it", "opt: --resume to resume its fill and drain headless", "opt: --limit <n> to stop after n points", "opt: --checkpoint <n> points between two saves", "opt: --view <mode> display mode, auto by default")),
+			(("-m", "--mul", "<a> <b> *"), ("Multiply two saved matrices", "opt: --save <file> output matrix, <a>.mul.tmmx by default")),
+			(("-n", "--new", "<x> <y> *"), ("Create a matrix with custom dimensions", f"opt: --backend <{'|'.join(BACKENDS)}> storage of the cells, auto by default", "opt: --save <file> to save the matrix", "opt: --fill <p> to fill the cells at random, in bulk", "opt: --workers <k> processes filling tiles of rows, --seed <s> of the fill", f"opt: --view <{'|'.join(VIEWS)}> display mode, auto by default")),
+			(("-r", "--random", "<x> <y> <i> *"), ("Create a matrix with placed random point", "opt: --fps <n> frame rate of the animation, 20 by default", "opt: --backend <mode> storage of the cells", "opt: --save <file> to save the matrix", "opt: --checkpoint <n> points between two saves", "opt: --seed <s> to replay the same draws", "opt: --view <mode> display mode, auto by default", "opt: --record <file> points, fill and time of each change, .csv or .npy", "opt: --replay <file> to render a recorded run again")),
+			(("-t", "--trials", "<n> <x> <y> *"), ("Run n seeded fill and drain trials across processes and summarize them", "opt: --workers <k> number of processes, all the cpus by default", "opt: --iterations <i> fills and drains by trial, 2 by default", "opt: --seed <s> seed of the first trial, 0 by default", "opt: --backend <mode> storage of the cells", "opt: --csv <file> output of the trials, in the workspace by default")),
+			(("-T", "--transpose", "<a> *"), ("Transpose a saved matrix", "opt: --save <file> output matrix, <a>.transpose.tmmx by default"))
 		]
 
 		self._execs = [
+			lambda x:self.__arithmetic(x, "add", add, 2),
+			lambda x:self._bench(x),
+			lambda x:self.__arithmetic(x, "convolve", convolve, 2),
+			lambda x:self._life(x),
+			lambda x:self._load(x),
+			lambda x:self.__arithmetic(x, "mul", multiply, 2),
 			lambda x:self._new(x),
-			lambda x:self._random(x)
+			lambda x:self._random(x),
+			lambda x:self._trials(x),
+			lambda x:self.__arithmetic(x, "transpose", transpose, 1)
 		]
 
+		self.__path			= str(abspath(f"{dirname(abspath(__file__))}/../{self.name}"))
+		self.__random		= None
+		self.__renderer		= None
+		self.__file			= None
+		self.__checkpoint	= int(0)
+		self.__recorder		= None
+
 		super().__init__()
 		self._run(args)
 
-	def _new(self, args: list[str]) -> list[list[int]]:
-		shell("clear")
-		matrix = self.__createMatrix(int(args[0]), int(args[1]))
-		self.__displayMatrix(matrix)
+	def __setup(self) -> None:
+		try:
+			mkdir(self.__path)
+			print(f"{Icons.info}Create path workspace for {self.name} tool at {self.__path}")
+
+		except(FileExistsError):
+			pass
+
+		except(PermissionError):
+			print(f"{Icons.warn}Permission denied: Unable to create '{self.__path}'.")
+
+	def __option(self, args: list[str], names: tuple[str], default: str = None) -> str:
+		for i, arg in enumerate(args):
+			if(arg in names):
+				return(args[i+1] if(i+1 < len(args)) else default)
+
+		return(default)
+
+	def __seed(self, args: list[str]) -> BatchRandom:
+		""" Private method creating the generator of the draws, seeded by the `--seed <s>` option """
+
+		__seed = self.__option(args, ("--seed", ))
+
+		if((__seed is not None) and not __seed.lstrip("-").isdigit()):
+			raise(ValueError(f'Invalid seed "{__seed}", expected an integer'))
+
+		self.__random = BatchRandom(__seed)
+
+		return(self.__random)
+
+	def __peakMemory(self) -> str:
+		if(getrusage is None):
+			return("-")
+
+		return(stringSize(getrusage(RUSAGE_SELF).ru_maxrss*(1 if(platform == "darwin") else 1024)))
+
+	def __openFile(self, args: list[str]) -> None:
+		""" Private method opening the matrix file and the checkpoint period of the options """
+
+		__path				= self.__option(args, ("--save", ))
+		self.__file			= GridFile(__path) if(__path) else None
+		self.__checkpoint	= int(self.__option(args, ("--checkpoint", ), 0))
+
+	def __cycle(self, matrix: Grid, first: int, x: int, limit: float = float("inf")) -> tuple[Grid, int]:
+		""" Private method running the fill and drain headless from an iteration
+
+			The matrix file is saved every `--checkpoint` points and when the run ends
+			or is interrupted, with the current iteration to resume from.
+
+			Returns:
+				tuple[Grid, int]: the matrix and the number of points placed or removed
+
+		"""
+
+		_exec = (
+			lambda x:self.__addRandomPoint(x),
+			lambda x:self.__removeRandomPoint(x)
+		)
+
+		__ops	= int(0)
+		i		= int(first)
+
+		try:
+			while((i < x) and (__ops < limit)):
+				while((matrix.total() != (len(matrix), 0)[i%2]) and (__ops < limit)):
+					matrix = _exec[i%2](matrix)
+					__ops += 1
+
+					if(self.__file and self.__checkpoint and not (__ops%self.__checkpoint)):
+						self.__file.save(matrix, i, x)
+
+				i += 1 if(matrix.total() == (len(matrix), 0)[i%2]) else 0
+
+		except(KeyboardInterrupt):
+			print(f"{Icons.warn}Interrupted at iteration {i+1}/{x}")
+
+		if(self.__file):
+			self.__file.save(matrix, i, x)
+			self.__file.close()
+			print(f"{Icons.info}Saved at iteration {min(i+1, x)}/{x} in {self.__file.path}")
+
+		return(matrix, __ops)
+
+	def __arithmetic(self, args: list[str], name: str, operation, operands: int):
+		""" Private method applying an arithmetic operation on saved matrices
+
+			The operands are read as matrices of values, the result is saved as a
+			matrix of values next to the first operand, or in `--save <file>`.
+
+			Args:
+				args (list[str]): the paths of the operands, then the options
+				name (str): the name of the operation
+				operation (Callable): the function of `core.linalg`
+				operands (int): the number of operands
+
+			Returns:
+				numpy.ndarray | list[list]: the result
+
+		"""
+
+		__files = [ GridFile(path) for path in args[0:operands] ]
+		__out	= GridFile(self.__option(args, ("--save", )) or f"{splitext(__files[0].path)[0]}.{name}.tmmx")
+
+		__start		= perf_counter()
+		__result	= operation(*[ file.values() for file in __files ])
+		__time		= perf_counter()-__start
+
+		__out.saveValues(__result)
+		print("\n".join(valuesLines(__result)))
+		print(f"\n{Icons.info}{name.capitalize()} {len(__result)}x{len(__result[0])} ({__out.header['dtype']}) in {round(__time, 4)} s, saved in {__out.path}")
+
+		return(__result)
+
+	def __report(self, matrix: Grid, x: int, ops: int, created: float, wall: float) -> dict:
+		stats = dict({
+			"Matrix": f"{matrix.x}x{matrix.y} ({matrix.backend})",
+			"Iterations": f"{x}",
+			"Operations": f"{ops}",
+			"Creation": f"{round(created, 4)} s",
+			"Wall time": f"{round(wall, 4)} s",
+			"Throughput": f"{round(ops/wall) if(wall) else 0} ops/s",
+			"Peak memory": self.__peakMemory()
+		})
+
+		print("\n".join([ f" {k}{' '*(14-len(k))}: {v}" for k, v in stats.items() ]))
+
+		return(stats)
+
+	def _bench(self, args: list[str]) -> dict:
+		x		= int(args[2] if((len(args) > 2) and not args[2].startswith("-")) else 3)
+		__limit	= int(self.__option(args, ("--limit", ), 0)) or float("inf")
+
+		self.__seed(args)
+		self.__openFile(args)
+
+		__start		= perf_counter()
+		matrix		= self.__createMatrix(int(args[0]), int(args[1]), self.__option(args, ("--backend", ), "auto"))
+
+		if(self.__file):
+			self.__file.save(matrix, 0, x)
+			matrix = self.__file.load(True)
+
+		__created	= perf_counter()-__start
+
+		__start			= perf_counter()
+		matrix, __ops	= self.__cycle(matrix, 0, x, __limit)
+
+		return(self.__report(matrix, x, __ops, __created, perf_counter()-__start))
+
+	def _life(self, args: list[str]) -> dict | Grid:
+		x, y, __gens	= int(args[0]), int(args[1]), int(args[2])
+		__backend		= self.__option(args, ("--backend", ), "bits" if(x*y >= BITS_CELLS) else "dense")
+		matrix			= self.__createMatrix(x, y, __backend)
+		life			= Life(matrix, self.__option(args, ("--rule", ), RULE), "--wrap" in args, int(self.__option(args, ("--workers", ), 1)))
+
+		life.randomize(float(self.__option(args, ("--density", ), .3)), self.__seed(args).seed)
+
+		try:
+			if("--headless" in args):
+				__start = perf_counter()
+				life.step(__gens)
+				__wall	= perf_counter()-__start
+
+				stats = dict({
+					"Matrix": f"{matrix.x}x{matrix.y} ({matrix.backend})",
+					"Rule": f"{life.rule}{' wrapped' if(life.wrap) else ''}",
+					"Generations": f"{__gens}",
+					"Workers": f"{life.workers}",
+					"Population": f"{life.sync()}",
+					"Wall time": f"{round(__wall, 4)} s",
+					"Throughput": f"{round(__gens/__wall, 2) if(__wall) else 0} gens/s, {round(__gens*len(matrix)/__wall) if(__wall) else 0} cells/s",
+					"Peak memory": self.__peakMemory()
+				})
+
+				print("\n".join([ f" {k}{' '*(14-len(k))}: {v}" for k, v in stats.items() ]))
+
+				return(stats)
+
+			life.sync()
+			self.__renderer = MatrixRenderer(matrix, float(self.__option(args, ("--fps", ), 10)), view=self.__option(args, ("--view", ), "auto"))
+			self.__renderer.draw({ "Iterations": f"0/{__gens}" })
+
+			for i in range(0, __gens):
+				life.step()
+				life.sync()
+				self.__renderer.frame({ "Iterations": f"{i+1}/{__gens}" }, True)
+
+			self.__renderer.close()
+
+		except(KeyboardInterrupt):
+			self.__renderer.close() if(self.__renderer) else None
+
+		finally:
+			life.close()
+
+		return(matrix)
+
+	def _load(self, args: list[str]) -> dict | Grid:
+		self.__file			= GridFile(args[0])
+		self.__checkpoint	= int(self.__option(args, ("--checkpoint", ), 0))
+
+		__start		= perf_counter()
+		__header	= self.__file.read()
+
+		if(__header["dtype"] in VALUE_DTYPES):
+			__values = self.__file.values()
+			print("\n".join(valuesLines(__values)))
+			print(f"\n{Icons.info}Loaded {self.__file.path} ({__header['dtype']}, {stringSize(getsize(self.__file.path))}) in {round(perf_counter()-__start, 4)} s")
+
+			return(__values)
+
+		matrix		= self.__file.load("--resume" in args)
+		__created	= perf_counter()-__start
+
+		if("--resume" in args):
+			self.__seed(args)
+			__limit	= int(self.__option(args, ("--limit", ), 0)) or float("inf")
+			x		= __header["iterations"]
+
+			print(f"{Icons.info}Resume {self.__file.path} at iteration {min(__header['iteration']+1, x)}/{x}")
+
+			__start			= perf_counter()
+			matrix, __ops	= self.__cycle(matrix, __header["iteration"], x, __limit)
+
+			return(self.__report(matrix, x, __ops, __created, perf_counter()-__start))
+
+		print(ANSI["clear"], end="")
+		self.__displayMatrix(matrix, { "Iterations": f"{min(__header['iteration']+1, __header['iterations'])}/{__header['iterations']}" } if(__header["iterations"]) else {}, self.__option(args, ("--view", ), "auto"))
+		print(f"\n{Icons.info}Loaded {self.__file.path} ({__header['dtype']}, {stringSize(getsize(self.__file.path))}) in {round(__created, 4)} s")
+
+		return(matrix)
+
+	def _new(self, args: list[str]) -> Grid:
+		x, y	= int(args[0]), int(args[1])
+		__fill	= self.__option(args, ("--fill", ))
+		matrix	= self.__createMatrix(x, y, self.__option(args, ("--backend", ), ("bits" if(x*y >= BITS_CELLS) else "dense") if(__fill) else "auto"))
+
+		self.__seed(args)
+
+		__workers = int(self.__option(args, ("--workers", ), 1))
+
+		if(__fill and (__workers > 1) and NUMPY):
+			with TilePool(x, y, __workers) as pool:
+				pool.fill(float(__fill), self.__random.seed)
+				pool.store(matrix)
+
+		elif(__fill):
+			fillGrid(matrix, float(__fill), self.__random.seed)
+
+		print(ANSI["clear"], end="")
+		self.__displayMatrix(matrix, view=self.__option(args, ("--view", ), "auto"))
+
+		if(self.__option(args, ("--save", ))):
+			__file = GridFile(self.__option(args, ("--save", )))
+			__file.save(matrix)
+			print(f"\n{Icons.info}Saved in {__file.path}")
+
+		return(matrix)
+
+	def __replay(self, matrix: Grid, path: str, args: list[str]) -> Grid:
+		""" Private method rendering the points of a recording again on an empty matrix
+
+			The points are applied in order without any draw, the recorded number of
+			points is checked on each change, a recording whose first samples were
+			dropped can't be replayed.
+
+		"""
+
+		__records	= Recorder.load(path)
+		x			= max(__records["iteration"], default=0)+1
+
+		if((max(__records["x"], default=0) >= matrix.x) or (max(__records["y"], default=0) >= matrix.y)):
+			raise(ValueError(f"The recording {path} doesn't fit in a {matrix.x}x{matrix.y} matrix"))
+
+		self.__renderer = MatrixRenderer(matrix, float(self.__option(args, ("--fps", ), 20)), view=self.__option(args, ("--view", ), "auto"))
+		self.__renderer.draw({ "Iterations": f"1/{x}" })
+
+		for i, _x, _y, value, points in zip(__records["iteration"], __records["x"], __records["y"], __records["value"], __records["points"]):
+			matrix = self.__setPoint(matrix, _x, _y, value)
+
+			if(matrix.total() != points):
+				self.__renderer.close()
+				raise(ValueError(f"The recording {path} doesn't start from an empty matrix"))
+
+			self.__renderer.frame({ "Iterations": f"{i+1}/{x}" })
+
+		self.__renderer.close()
+		print(f"{Icons.info}Replayed {len(__records['x'])} points of {path}")
 
 		return(matrix)
 
@@ -43,93 +367,112 @@ class Matrix(Tool):
 			matrix = self._new(args)
 			input("\nPress key to start ...")
 
+			if(self.__option(args, ("--replay", ))):
+				self.__replay(matrix, self.__option(args, ("--replay", )), args)
+				return
+
 			_exec = (
 				lambda x:self.__addRandomPoint(x),
 				lambda x:self.__removeRandomPoint(x)
 			)
 
-			x = int(args[2] if(len(args) == 3) else 3)
+			x		= int(args[2] if((len(args) > 2) and not args[2].startswith("-")) else 3)
+			__ops	= int(0)
+
+			self.__openFile(args)
+			self.__recorder = Recorder(x*len(matrix)) if(self.__option(args, ("--record", ))) else None
+			self.__renderer = MatrixRenderer(matrix, float(self.__option(args, ("--fps", ), 20)), view=self.__option(args, ("--view", ), "auto"))
+			self.__renderer.draw({ "Iterations": f"1/{x}" })
+
 			for i in range(0, x):
 				stats = {
 					"Iterations": f"{i+1}/{x}"
 				}
 
-				while(sum([ value for x in matrix for value in x ]) != (len(matrix)*len(matrix[0]), 0)[i%2]):
-					shell("clear")
+				if(self.__recorder is not None):
+					self.__recorder.iteration = i
+
+				while(matrix.total() != (len(matrix), 0)[i%2]):
 					matrix = _exec[i%2](matrix)
-					self.__displayMatrix(matrix, stats)
-					sleep(.05)
+					self.__renderer.frame(stats)
+					__ops += 1
+
+					if(self.__file and self.__checkpoint and not (__ops%self.__checkpoint)):
+						self.__file.save(matrix, i, x)
+
+			self.__renderer.close()
+
+			if(self.__file):
+				self.__file.save(matrix, x, x)
+				print(f"{Icons.info}Saved in {self.__file.path}")
 
 		except:
 			print(format_exc())
+			self.status = bool(False)
 
-	def __setPoint(self, matrix: list[list[int]], x: int, y: int, value: int = 1) -> list[list[int]]:
-		matrix[y][x] = round(value, 2)
-
-		return(matrix)
+		finally:
+			if(self.__recorder is not None):
+				__path = self.__option(args, ("--record", ))
+				print(f"{Icons.info}Recorded {self.__recorder.save(__path)} points in {__path}{f', the {self.__recorder.dropped} first dropped' if(self.__recorder.dropped) else ''}")
 
-	def __randomXY(self, xMax: int = 5, yMax: int = 5):
-			x = randrange(0, xMax)
-			y = randrange(0, yMax)
+	def _trials(self, args: list[str]) -> list[dict]:
+		n, x, y		= int(args[0]), int(args[1]), int(args[2])
+		__workers	= int(self.__option(args, ("--workers", ), cpu_count() or 1))
+		__csv		= self.__option(args, ("--csv", ))
 
-			return x, y
+		if(not __csv):
+			self.__setup()
+			__csv = f"{self.__path}/trials-{x}x{y}-{n}.csv"
 
-	def __addRandomPoint(self, matrix: list[list[int]]) -> list[list[int]]:
-		dim = (len(matrix[0]), len(matrix))
-		x, y = self.__randomXY(dim[0], dim[1])
+		print(f"{Icons.play}Run {n} trials of {x}x{y} on {__workers} worker(s) ...")
 
-		while(True):
-			x, y = self.__randomXY(dim[0], dim[1])
+		__start		= perf_counter()
+		__results	= runTrials(
+			x, y, n, __workers,
+			int(self.__option(args, ("--iterations", ), 2)),
+			int(self.__option(args, ("--seed", ), 0)),
+			self.__option(args, ("--backend", ), "auto")
+		)
+		__wall		= perf_counter()-__start
 
-			if(not matrix[y][x]):
-				matrix = self.__setPoint(matrix, x, y, 1)
-				break
+		writeCsv(__csv, __results)
 
-		return(matrix)
-	
-	def __removeRandomPoint(self, matrix: list[list[int]]) -> list[list[int]]:
-		dim = (len(matrix[0]), len(matrix))
-		x, y = self.__randomXY(dim[0], dim[1])
+		__table = list[str]([ f" Statistic{' '*3}{''.join([ f'{f.capitalize():>12}' for f in SUMMARY_FIELDS ])}" ])
+		for field in TRIAL_FIELDS[2:]:
+			__summary = summary([ r[field] for r in __results ])
 
-		while(True):
-			x, y = self.__randomXY(dim[0], dim[1])
+			if(__summary):
+				__format = ".6f" if(field.endswith("_time")) else ".1f"
+				__table.append(f" {field}{' '*(12-len(field))}{''.join([ f'{__summary[f]:>12{__format}}' for f in SUMMARY_FIELDS ])}")
 
-			if(matrix[y][x]):
-				matrix = self.__setPoint(matrix, x, y, 0)
-				break
+		print("\n".join(__table))
+		print(f"\n{Icons.info}{n} trials in {round(__wall, 4)} s ({round(n/__wall, 2) if(__wall) else 0} trials/s), saved in {abspath(__csv)}")
 
-		return(matrix)
+		return(__results)
 
-	def __createMatrix(self, x: int, y: int) -> list[list[int]]:
-		matrix = list[list[int]]([])
+	def __setPoint(self, matrix: Grid, x: int, y: int, value: int = 1) -> Grid:
+		matrix.set(x, y, value)
 
-		for i in range(0, int(y)):
-			matrix.append([])
+		if(self.__renderer):
+			self.__renderer.point(x, y)
 
-			for j in range(0, int(x)):
-				matrix[i].append(0)
+		if(self.__recorder is not None):
+			self.__recorder.record(x, y, value, matrix.total(), matrix.fill())
 
 		return(matrix)
 
-	def __displayMatrix(self, matrix: list[list[int]], stats: dict = {}) -> None:
-		output = list[str]([])
-		values = sum([ value for x in matrix for value in x ])
-		cells  = int(len(matrix)*len(matrix[0]))
-		_ = str(" "*2)
-		_fill = str(round((values/cells)*100, 2))
+	def __addRandomPoint(self, matrix: Grid) -> Grid:
+		x, y = matrix.randomPoint(0, self.__random.randbelow)
 
-		for i, row in enumerate(matrix):
-			output.append("")
-			_sum = sum(row)
+		return(self.__setPoint(matrix, x, y, 1))
 
-			output[i] += f" {row} = {Colors.red if(_sum < (len(matrix[0])/3)) else Colors.green}{_sum}{Colors.end}{' '*(2-len(str(_sum)))}"
+	def __removeRandomPoint(self, matrix: Grid) -> Grid:
+		x, y = matrix.randomPoint(1, self.__random.randbelow)
 
-		if(len(matrix) > 2):
-			output[-3] += f"{_}Points : {values}"
-			output[-2] += f"{_}Cells  : {cells}"
-			output[-1] += f"{_}Filled : {_fill}{' '*(3-len(_fill))} %"
+		return(self.__setPoint(matrix, x, y, 0))
 
-		if(stats):
-			output[0] += f"{_}Iteration(s) : {stats['Iterations']}"
+	def __createMatrix(self, x: int, y: int, backend: str = "auto") -> Grid:
+		return(Grid(x, y, mode=backend))
 
-		print(f"\n".join(output))
\ No newline at end of file
+	def __displayMatrix(self, matrix: Grid, stats: dict = {}, view: str = "auto") -> None:
+		print(f"\n".join(displayLines(matrix, stats, view)))
@@ -3,16 +3,30 @@
 
 # tools/shell.py
 
+from datetime import datetime
+from glob import glob
 from json import dump, load
-from os import listdir, mkdir, remove, system as shell
-from os.path import abspath, dirname
+from os import listdir, mkdir, remove
+from os.path import abspath, basename, dirname, isdir, isfile, join
+from shutil import rmtree
+from threading import Lock
+from time import perf_counter
 from traceback import format_exc
+from typing import Callable
 
+import asyncio
 import re
 
+from core.aioprocess import AsyncExecutor, runGraphAsync
 from core.colors import Colors
 from core.config import Config
+from core.exceptions import ValidationError
+from core.history import HISTORY_WINDOW, RunLog
 from core.icons import Icons
+from core.outputs import OutputLog
+from core.process import Executor, Session, failed, planGraph, runGraph
+from core.scheduler import Cron, Scheduler
+from core.stamps import Stamps
 from core.tool import Tool
 
 SCHEDULENAME_REGEX = str("(\\s)|([/:])")
@@ -27,14 +41,23 @@ class Shell(Tool):
 		self.__cfg	= Config()
 		self.__path	= str(abspath(f"{dirname(abspath(__file__))}/../{self.name}"))
 		self.__schedulesPath = abspath(f"{self.__path}/Schedules")
+		self.__statesPath = abspath(f"{self.__path}/States")
+		self.__logsPath = abspath(f"{self.__path}/Logs")
+		self.__executor = Executor(encoding=self.__cfg.getEncoding())
+		self.__lock = Lock()
 		self.__setup()
 
 		self._args = [
-			(("-c", "--command", "<cmd>"), "Run a bash command"),
+			(("-c", "--command", "<cmd>"), ("Run a bash command", "opt: --timeout <s> before the command to kill it after <s> seconds")),
 			(("-d", "--delete-schedule", "<sch> *"), ("Delete a schedule of commands", "opt: -f to delete without asking")),
 			(("-l", "--list-schedule", ""), "List all schedules save in workspace"),
 			(("-n", "--new-schedule", "<sch>"), "Create a schedule of commands"),
-			(("-r", "--run-schedule", "<sch> *"), ("Run a schedule of commands", "opt: -p to pause between all commands"))
+			(("-N", "--next-runs", "<sch> *"), ("Preview the next runs of a schedule triggers", "opt: <n> number of runs to show, 5 by default")),
+			(("-o", "--output", "<sch> *"), ("Show the output logged by the last run of a schedule", "opt: <id> of a command, the logged commands without it")),
+			(("-r", "--run-schedule", "<sch> *"), ("Run a schedule of commands", "opt: -p to pause between all commands, -e to stop on the first failure, --timeout <s> by command, -j <n> commands at once, --session to run them in a single shell, --force to run the up-to-date ones, --async to run them on asyncio, --log to write their output in compressed logs")),
+			(("-s", "--stats", "<sch> *"), ("Show the durations of the commands of a schedule over its runs", f"opt: <n> runs of the rolling median, {HISTORY_WINDOW} by default")),
+			(("-S", "--scheduler", ""), "Run all the schedules on their triggers until interrupted"),
+			(("-t", "--trigger", "<sch> *"), ("Add a cron trigger on a schedule", 'opt: <cron> e.g. "*/5 * * * *", list the triggers without it'))
 		]
 
 		self._execs = [
@@ -42,7 +65,12 @@ class Shell(Tool):
 			lambda x:self._deleteSchedule(x),
 			lambda x:self._listSchedule(),
 			lambda x:self._newSchedule(x),
+			lambda x:self._nextRuns(x),
+			lambda x:self._output(x),
 			lambda x:self._runSchedule(x),
+			lambda x:self._stats(x),
+			lambda x:self._scheduler(),
+			lambda x:self._trigger(x)
 		]
 
 		super().__init__()
@@ -57,6 +85,14 @@ class Shell(Tool):
 		print(f"{Icons.warn}Schedule doesn't exist on workspace")
 		return(False)
 
+	def __loadSchedule(self, scheduleName: str) -> dict:
+		with open(abspath(f"{self.__schedulesPath}/{scheduleName}.json"), "r", encoding=self.__cfg.getEncoding()) as json:
+			return(dict(load(json)))
+
+	def __saveSchedule(self, scheduleName: str, schedule: dict) -> None:
+		with open(abspath(f"{self.__schedulesPath}/{scheduleName}.json"), "w", encoding=self.__cfg.getEncoding()) as json:
+			dump(dict(schedule), json, sort_keys=True, indent=2)
+
 	def __setup(self) -> None:
 		try:
 			mkdir(self.__path)
@@ -72,8 +108,146 @@ class Shell(Tool):
 		except(Exception) as e:
 			print(f"{Icons.err}An error occurred: {e}")
 
-	def _command(self, args: list[str]) -> None:
-		shell(" ".join(args))
+	def __option(self, args: list[str], name: str, cast: type = float) -> float | int | None:
+		""" Private method reading a positive number option of the arguments, e.g. `--timeout <s>` """
+
+		if(name not in args):
+			return(None)
+
+		try:
+			__value = cast(args[args.index(name)+1])
+
+		except(IndexError, ValueError):
+			raise(ValueError(f"{name} needs a number"))
+
+		if(__value <= 0):
+			raise(ValueError(f"{name} needs a positive number"))
+
+		return(__value)
+
+	def __report(self, runner: Executor | AsyncExecutor, result: dict, timeout: float | None) -> dict:
+		""" Private method warning about a failed command """
+
+		if(result["expired"]):
+			runner.write(f"{Icons.warn}Command killed after {timeout:g} s: {result['command']}")
+
+		elif(result["code"]):
+			runner.write(f"{Icons.warn}Command exited with code {result['code']} after {result['duration']:.3f} s: {result['command']}")
+
+		if(failed(result)):
+			self.__fail()
+
+		return(result)
+
+	def __fail(self) -> None:
+		""" Private method setting the failed status, shared by the runs of the scheduler threads """
+
+		with self.__lock:
+			self.status = bool(False)
+
+	def __begin(self, task: dict, context: dict) -> dict | None:
+		""" Private method writing the start line of a command of a schedule, or returning its result when up to date """
+
+		if((not context["force"]) and context["stamps"].fresh(task)):
+			context["runner"].write(f" [{task['id']}]: {Colors.cyan}[ UP TO DATE ]{Colors.end} {task['cmd']}")
+			return(dict({ "command": task["cmd"], "shell": False, "code": 0, "duration": float(0), "expired": False, "stdout": [], "stderr": [], "uptodate": True }))
+
+		context["runner"].write(f" [{task['id']}]: {task['cmd']}")
+		return(None)
+
+	def __arguments(self, task: dict, context: dict) -> tuple[str, float | None, str, Callable | None, str]:
+		""" Private method giving the arguments of the run of a command: its line, timeout, prefix, sink and directory, the one of the tool without files """
+
+		__log = context["log"]
+
+		return(
+			task["cmd"],
+			task["timeout"] or context["timeout"],
+			f"[{task['id']}] " if(context["jobs"] > 1) else "",
+			(lambda _, line:__log.write(task["id"], line)) if(__log) else None,
+			context["dir"] if(task["inputs"] or task["outputs"]) else None
+		)
+
+	def __end(self, task: dict, result: dict, context: dict) -> dict:
+		""" Private method stamping a command of a schedule when it succeeded, and writing its state line """
+
+		__result = self.__report(context["runner"], result, task["timeout"] or context["timeout"])
+
+		if(context["log"]):
+			context["log"].end(task["id"])
+
+		if(not failed(__result)):
+			context["stamps"].update(task)
+
+		__state = f"{Colors.red}[ FAILED ]{Colors.end}" if(failed(__result)) else f"{Colors.green}[ DONE ]{Colors.end}"
+		context["runner"].write(f" [{task['id']}]: {__state} {__result['duration']:.3f} s (exit {__result['code']})")
+
+		return(__result)
+
+	def __runCommand(self, task: dict, context: dict) -> dict:
+		""" Private method running a command of a schedule between its start and state lines, unless up to date
+
+			The context of the run holds the "runner", the default "timeout", the number of
+			"jobs", the "stamps" of the schedule, whether to "force" the up-to-date commands,
+			the output "log", None to write the output on the terminal, the "dir" of the
+			schedule, where the commands declaring files run, and the results "done" so far
+			by id, kept when the run is interrupted.
+
+		"""
+
+		__start		= datetime.now().isoformat(timespec="milliseconds")
+		__result	= self.__begin(task, context) or self.__end(task, context["runner"].run(*self.__arguments(task, context)), context)
+
+		context["done"][task["id"]] = dict(__result, start=__start)
+		return(context["done"][task["id"]])
+
+	async def __runCommandAsync(self, task: dict, context: dict) -> dict:
+		""" Private coroutine running a command of a schedule on the event loop, see `__runCommand` """
+
+		__start		= datetime.now().isoformat(timespec="milliseconds")
+		__result	= self.__begin(task, context) or self.__end(task, await context["runner"].run(*self.__arguments(task, context)), context)
+
+		context["done"][task["id"]] = dict(__result, start=__start)
+		return(context["done"][task["id"]])
+
+	def __logRun(self, scheduleName: str, tasks: list[dict], results: list[dict], date: str, duration: float) -> None:
+		""" Private method appending a run with the state of each of its commands to the log of its schedule """
+
+		__results	= dict[str, dict]({ r["id"]: r for r in results })
+		__commands	= list[dict]([])
+
+		for task in tasks:
+			__result = __results.get(task["id"], dict({ "code": None, "duration": float(0), "expired": False, "skipped": True }))
+			__status = "skipped" if(__result.get("skipped")) else "uptodate" if(__result.get("uptodate")) else "expired" if(__result["expired"]) else "failed" if(failed(__result)) else "done"
+
+			__commands.append(dict({
+				"id": task["id"],
+				"cmd": task["cmd"],
+				"start": __result.get("start"),
+				"duration": round(__result["duration"], 6),
+				"code": __result["code"],
+				"status": __status
+			}))
+
+		RunLog(abspath(f"{self.__logsPath}/{scheduleName}.jsonl")).append(dict({ "start": date, "duration": round(duration, 6), "commands": __commands }))
+
+	def _command(self, args: list[str], timeout: float = None) -> dict:
+		""" Run a command line and warn when it fails
+
+			Args:
+				args (list[str]): the words of the command, optionally preceded by `--timeout <s>`
+				timeout (float, optional): the timeout in seconds, when not given in the arguments. Defaults to None.
+
+			Returns:
+				dict: the result of the `Executor`, with the exit code and the duration of the command
+
+		"""
+
+		if(args[0:1] == [ "--timeout" ]):
+			timeout	= self.__option(args, "--timeout")
+			args	= args[2:len(args)]
+
+		return(self.__report(self.__executor, self.__executor.run(" ".join(args), timeout), timeout))
 
 	def _deleteSchedule(self, args: list[str]) -> None:
 		try:
@@ -84,10 +258,17 @@ class Shell(Tool):
 
 			if(("-f" in args) or self.ask(f"Confirm the deletion of {args[0]} ?")):
 				remove(abspath(f"{self.__schedulesPath}/{__scheduleName}.json"))
+
+				for path in (f"{self.__statesPath}/{__scheduleName}.json", f"{self.__logsPath}/{__scheduleName}.jsonl"):
+					if(isfile(abspath(path))):
+						remove(abspath(path))
+
+				rmtree(abspath(f"{self.__logsPath}/{__scheduleName}"), ignore_errors=True)
 				print(f'{Icons.info}"{__scheduleName}" was deleted from {self.__path}')
 
 		except(FileNotFoundError) as e:
 			print(f"{Icons.warn}{e}")
+			self.status = bool(False)
 
 	def _listSchedule(self) -> None:
 		__schedules = listdir(self.__schedulesPath)
@@ -122,9 +303,7 @@ class Shell(Tool):
 
 			if(len(__schedules)):
 				print(f'Saving schedules in "{args[0]}"')
-				with open(abspath(f"{self.__schedulesPath}/{__scheduleName}.json"), "w", encoding=self.__cfg.getEncoding()) as json:
-					_ = dict({ "schedules" : __schedules })
-					dump(dict(_), json, sort_keys=True, indent=2)
+				self.__saveSchedule(__scheduleName, { "schedules" : __schedules })
 
 			print(f'"{args[0]}" schedule was created in {self.__schedulesPath}')
 
@@ -134,20 +313,297 @@ class Shell(Tool):
 		except(FileExistsError) as e:
 			print(f"{Icons.warn}{e}")
 
-	def _runSchedule(self, args: list[str]) -> None:
-		__scheduleName = re.sub(SCHEDULENAME_REGEX, "-", args[0])
+	def _nextRuns(self, args: list[str]) -> None:
+		try:
+			__scheduleName = re.sub(SCHEDULENAME_REGEX, "-", args[0])
+
+			if(self.__checkExistSchedule(__scheduleName)):
+				__triggers	= list[str](self.__loadSchedule(__scheduleName).get("triggers", []))
+				__runs		= list[tuple[datetime, str]]([])
+				__n			= int(args[1] if(len(args) > 1) else 5)
+
+				if(not __triggers):
+					print(f'{Icons.warn}"{args[0]}" has no trigger')
+					return
+
+				for trigger in __triggers:
+					__runs += [ (date, trigger) for date in Cron(trigger).nexts(datetime.now(), __n) ]
+
+				print(f'\n Next runs of "{args[0]}":')
+				for i, (date, trigger) in enumerate(sorted(__runs)[0:__n], start=1):
+					print(f" {' '*(2-len(str(i)))}{Colors.green}{i}{Colors.end}. {Colors.purple}{date.strftime('%Y-%m-%d %H:%M %a')}{Colors.end} ({trigger})")
+
+		except(IndexError):
+			print(f"{Icons.warn}No schedule name was specified !")
+
+		except(ValidationError, ValueError) as e:
+			print(f"{Icons.warn}{e}")
+
+	def _output(self, args: list[str]) -> None:
+		try:
+			__scheduleName = re.sub(SCHEDULENAME_REGEX, "-", args[0])
+
+			if(self.__checkExistSchedule(__scheduleName)):
+				__indexes = sorted(glob(abspath(f"{self.__logsPath}/{__scheduleName}/*.index.jsonl")))
+
+				if(not __indexes):
+					print(f'{Icons.warn}"{args[0]}" has no logged run, run it with "-r {args[0]} --log"')
+					return
+
+				if(len(args) > 1):
+					for line in OutputLog.read(__indexes[-1], args[1]):
+						print(line)
+
+					return
+
+				__commands = dict[str, list[int]]({})
+				for entry in OutputLog.entries(__indexes[-1]):
+					__command		= __commands.setdefault(entry["key"], [ 0, 0, 0 ])
+					__command[0]	+= entry["lines"]
+					__command[1]	+= entry["bytes"]
+					__command[2]	+= entry["size"]
+
+				print(f'\n Output of the last logged run of "{args[0]}" ({basename(__indexes[-1]).split(".")[0]}):')
+				print(f" Id{' '*14}{'Lines':>10}{'Bytes':>14}{'Compressed':>14}")
+				for key, (lines, size, compressed) in __commands.items():
+					print(f" {Colors.cyan}{key[0:15]}{Colors.end}{' '*(16-len(key[0:15]))}{lines:>10}{size:>14}{compressed:>14}")
+
+		except(IndexError):
+			print(f"{Icons.warn}No schedule name was specified !")
+
+	def _runSchedule(self, args: list[str]) -> list[dict] | None:
+		""" Run the commands of a schedule
+
+			The commands of a schedule are strings, or objects `{ "cmd": <cmd>, "timeout": <s> }`
+			for a timeout of their own, the "timeout" of the schedule or the `--timeout <s>`
+			option applying to the others. A schedule whose commands declare the ids they
+			`needs` is run as a graph, by `-j <n>` or its "jobs" commands at once, the others
+			run their commands one after another, or as a graph without dependencies with
+			more than one job. With `--session` or its "session" set, the commands run one
+			at a time in a single shell, keeping its directory and variables.
+			A command declaring its `inputs` and `outputs` globs is skipped while up to date,
+			see `core.stamps`, unless `--force`. Its globs are resolved, and it runs, in the
+			"dir" of the schedule, relative to the schedule file and its directory by default,
+			the other commands run in the working directory of the tool. With `--async` or its
+			"async" set, the commands are coroutines of an event loop, see `core.aioprocess`.
+			With `--log` or its "log" set, their output is written in compressed logs instead
+			of the terminal, see `core.outputs`.
+
+			Args:
+				args (list[str]): the schedule name, then `-p` to pause between the commands,
+					`-e` to stop on the first failure, `-j <n>`, `--session`, `--async`, `--log`, `--force` and `--timeout <s>`
+
+			Returns:
+				list[dict] | None: the results of the commands, the commands not run being
+					skipped, None when the schedule can't be run
+
+		"""
+
+		__scheduleName	= re.sub(SCHEDULENAME_REGEX, "-", args[0])
+		__results		= list[dict]([])
 
 		if(self.__checkExistSchedule(__scheduleName)):
-			print(f"{Icons.play}Running {args[0]} ...")
+			__schedule	= self.__loadSchedule(__scheduleName)
+			__timeout	= self.__option(args, "--timeout") or __schedule.get("timeout")
 
-			with open(abspath(f"{self.__schedulesPath}/{__scheduleName}.json"), "r", encoding=self.__cfg.getEncoding()) as json:
-				_ = dict[str, list[str]](load(json))
-				__schedules	= _["schedules"]
+			__dir = abspath(join(self.__schedulesPath, __schedule.get("dir", ".")))
 
-			if(len(__schedules)):
-				for i, schedule in enumerate(__schedules):
-					print(f" [{i}]: {schedule}")
-					self._command([ schedule ])
+			if(not isdir(__dir)):
+				print(f"{Icons.warn}{args[0]}: the directory {__dir} of the schedule doesn't exist")
+				self.__fail()
+				return(None)
+
+			try:
+				__tasks = planGraph(__schedule["schedules"])
+
+			except(ValidationError) as e:
+				print(f"{Icons.warn}{args[0]}: {e}")
+				self.__fail()
+				return(None)
+
+			__graph		= any([ isinstance(entry, dict) and (("id" in entry) or ("needs" in entry)) for entry in __schedule["schedules"] ])
+			__jobs		= int(self.__option(args, "-j", int) or __schedule.get("jobs", 1))
+			__session	= bool(("--session" in args) or __schedule.get("session"))
+			__async		= bool((("--async" in args) or __schedule.get("async")) and not __session)
+			__runner	= Session(encoding=self.__cfg.getEncoding()) if(__session) else AsyncExecutor(__jobs, encoding=self.__cfg.getEncoding()) if(__async) else Executor(encoding=self.__cfg.getEncoding())
+			__now		= datetime.now()
+			__log		= OutputLog(abspath(f"{self.__logsPath}/{__scheduleName}/{__now.strftime('%Y%m%d-%H%M%S-%f')}")) if(("--log" in args) or __schedule.get("log")) else None
+			__start		= perf_counter()
+
+			if(isinstance(__runner, Session) and (__jobs > 1)):
+				print(f"{Icons.warn}A session runs one command at a time, {__jobs} jobs ignored")
+				__jobs = 1
+
+			if(("-p" in args) and (__jobs > 1) and not (__graph or __async)):
+				print(f"{Icons.warn}Pausing runs one command at a time, {__jobs} jobs ignored")
+				__jobs = 1
+
+			__context = dict({
+				"runner": __runner,
+				"timeout": __timeout,
+				"jobs": __jobs,
+				"stamps": Stamps(abspath(f"{self.__statesPath}/{__scheduleName}.json"), __dir),
+				"force": "--force" in args,
+				"log": __log,
+				"dir": __dir,
+				"done": dict[str, dict]({})
+			})
+
+			print(f"{Icons.play}Running {args[0]}{f' with {__jobs} jobs' if(__jobs > 1) else ''}{' in a session' if(__session) else ' on asyncio' if(__async) else ''} ...")
+
+			if(__log):
+				print(f"{Icons.info}Output logged in {dirname(__log.index)}, read it with \"-o {args[0]} <id>\"")
+
+			try:
+				if(__async):
+					__results = asyncio.run(runGraphAsync(__tasks, lambda task:self.__runCommandAsync(task, __context), __jobs, "-e" in args))
+
+				elif(__graph or (__jobs > 1)):
+					__results = runGraph(__tasks, lambda task:self.__runCommand(task, __context), __jobs, "-e" in args, __runner.terminate)
+
+				else:
+					for i, task in enumerate(__tasks):
+						__results.append(dict(self.__runCommand(task, __context), id=task["id"], skipped=False))
+
+						if(("-e" in args) and failed(__results[-1])):
+							break
+
+						if(("-p" in args) and (i+1 < len(__tasks))):
+							input(f'Next command: "$ {__tasks[i+1]["cmd"]}"')
+
+			except(KeyboardInterrupt):
+				print(f"\n{Icons.warn}{args[0]} interrupted")
+				__results = [ dict(__context["done"][t["id"]], id=t["id"], skipped=False) for t in __tasks if(t["id"] in __context["done"]) ]
+				self.__fail()
+
+			finally:
+				__context["stamps"].save()
+
+				if(__log):
+					__log.close()
+
+				if(isinstance(__runner, Session)):
+					__runner.close()
+
+			__failed	= [ r["id"] for r in __results if(failed(r) and not r["skipped"]) ]
+			__ran		= set[str]([ r["id"] for r in __results if(not r["skipped"]) ])
+			__skipped	= [ t["id"] for t in __tasks if(t["id"] not in __ran) ]
+
+			if(__failed and ("-e" in args)):
+				print(f"{Icons.warn}Stopped on the failure of [{__failed[0]}]")
+
+			if(__skipped):
+				print(f"{Icons.warn}Not run: {', '.join([ f'[{key}]' for key in __skipped ])}")
+
+			__uptodate	= len([ r for r in __results if(r.get("uptodate")) ])
+			__duration	= perf_counter()-__start
+			print(f"{Icons.info}{len(__tasks)-len(__failed)-len(__skipped)}/{len(__tasks)} command(s) done{f' ({__uptodate} up to date)' if(__uptodate) else ''}, {len(__failed)} failed in {__duration:.3f} s")
+
+			self.__logRun(__scheduleName, __tasks, __results, __now.isoformat(timespec="seconds"), __duration)
+
+		else:
+			self.__fail()
+			return(None)
+
+		return(__results)
+
+	def __runTrigger(self, scheduleName: str) -> None:
+		""" Private method running a schedule fired by the scheduler, and reporting the status of this run """
 
-					if(("-p" in args) and (i+1 < len(__schedules))):
-						input(f'Next command: "$ {__schedules[i+1]}"')
+		__results = self._runSchedule([ scheduleName ])
+
+		if(__results is None):
+			print(f"{Icons.warn}{Colors.cyan}{scheduleName}{Colors.end} not run")
+			return
+
+		__failed = [ f"[{r['id']}]" for r in __results if(failed(r) and not r["skipped"]) ]
+
+		if(__failed):
+			print(f"{Icons.warn}{Colors.cyan}{scheduleName}{Colors.end} failed: {', '.join(__failed)}")
+
+		else:
+			print(f"{Icons.info}{Colors.cyan}{scheduleName}{Colors.end} succeeded")
+
+	def _scheduler(self) -> None:
+		__scheduler = Scheduler()
+		__triggers	= int(0)
+
+		for schedule in sorted(listdir(self.__schedulesPath)):
+			__scheduleName	= schedule.split(".")[0]
+			__schedule		= self.__loadSchedule(__scheduleName)
+
+			for trigger in __schedule.get("triggers", []):
+				try:
+					__next = __scheduler.add(
+						__scheduleName,
+						Cron(trigger),
+						lambda name=__scheduleName:self.__runTrigger(name),
+						__schedule.get("misfire", "run")
+					)
+
+					__triggers += 1
+					print(f"{Icons.info}{Colors.cyan}{__scheduleName}{Colors.end} ({trigger}) next run at {Colors.purple}{__next.strftime('%Y-%m-%d %H:%M')}{Colors.end}")
+
+				except(ValidationError) as e:
+					print(f"{Icons.warn}{__scheduleName}: {e}")
+
+		if(not __triggers):
+			print(f'{Icons.warn}No trigger found, add one with "-t <sch> <cron>"')
+			return
+
+		print(f"{Icons.play}Scheduler started with {__triggers} trigger(s), press Ctrl-C to stop")
+		__scheduler.run()
+
+	def _stats(self, args: list[str]) -> None:
+		try:
+			__scheduleName = re.sub(SCHEDULENAME_REGEX, "-", args[0])
+
+			if(self.__checkExistSchedule(__scheduleName)):
+				__log	= RunLog(abspath(f"{self.__logsPath}/{__scheduleName}.jsonl"))
+				__runs	= __log.runs()
+				__s		= lambda v:f"{v:.3f}" if(v is not None) else "-"
+
+				if(not __runs):
+					print(f'{Icons.warn}"{args[0]}" has never been run')
+					return
+
+				print(f'\n Durations of "{args[0]}" in seconds over {len(__runs)} run(s), last on {Colors.purple}{__runs[-1]["start"].replace("T", " ")}{Colors.end}:')
+				print(f" Step{' '*12}{'Runs':>6}{'Failed':>8}{'p50':>10}{'p95':>10}{'Last':>10}{'Median':>10}")
+				for step in __log.stats(int(args[1]) if(len(args) > 1) else HISTORY_WINDOW):
+					__flag = f" {Colors.red}slower x{step['last']/step['median']:.1f}{Colors.end}" if(step["regression"]) else ""
+					print("".join([
+						f" {Colors.cyan}{step['id'][0:15]}{Colors.end}{' '*(16-len(step['id'][0:15]))}",
+						f"{step['runs']:>6}{step['failed']:>8}",
+						f"{__s(step['p50']):>10}{__s(step['p95']):>10}{__s(step['last']):>10}{__s(step['median']):>10}{__flag}"
+					]))
+
+		except(IndexError):
+			print(f"{Icons.warn}No schedule name was specified !")
+
+		except(ValueError) as e:
+			print(f"{Icons.warn}{e}")
+
+	def _trigger(self, args: list[str]) -> None:
+		try:
+			__scheduleName = re.sub(SCHEDULENAME_REGEX, "-", args[0])
+
+			if(self.__checkExistSchedule(__scheduleName)):
+				__schedule	= self.__loadSchedule(__scheduleName)
+				__triggers	= list[str](__schedule.get("triggers", []))
+				__cron		= " ".join(args[1:len(args)]).strip("\"'")
+
+				if(__cron):
+					Cron(__cron).next(datetime.now())
+					__schedule["triggers"] = __triggers + [ __cron ]
+					self.__saveSchedule(__scheduleName, __schedule)
+					print(f'{Icons.info}Trigger "{__cron}" added on "{args[0]}"')
+
+				else:
+					for i, trigger in enumerate(__triggers, start=1):
+						print(f" {' '*(2-len(str(i)))}{Colors.green}{i}{Colors.end}. {Colors.cyan}{trigger}{Colors.end}")
+
+		except(IndexError):
+			print(f"{Icons.warn}No schedule name was specified !")
+
+		except(ValidationError) as e:
+			print(f"{Icons.warn}{e}")
@@ -208,6 +208,7 @@ class Translator(Tool):
 
 		except(Exception, RequestError) as e:
 			print(f"{Icons.err}{e}")
+			self.status = bool(False)
 			self._delete(args)
 
 	def _translate(self, args: list[str]) -> None:
@@ -241,6 +242,7 @@ class Translator(Tool):
 
 					except(Exception) as e:
 						print(f'{Icons.warn}PROCESSING "{field}" [ {Colors.red}FAILED{Colors.end} ] (ERR: {e})')
+						self.status = bool(False)
 
 			print(f"{Icons.play}Writing new regions json files ...")
 
@@ -258,8 +260,10 @@ class Translator(Tool):
 
 				except(Exception) as e:
 						print(f'{Icons.warn}WRITTING "{__regionPath}" [ {Colors.red}FAILED{Colors.end} ] (ERR: {e})')
+						self.status = bool(False)
 
 			print(f"{Icons.info}Translations created with success !")
 
 		except(FileNotFoundError) as e:
 			print(f"{Icons.warn}{e}")
+			self.status = bool(False)